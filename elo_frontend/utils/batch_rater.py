@@ -0,0 +1,322 @@
+"""@package batch_rater
+Batch rater
+
+This script rates many independent matches at once with NumPy.
+
+@file batch_rater.py
+
+@author Tyler Shake
+
+@par Notifications:
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The below copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+@copyright Copyright 2019 Tyler Shake
+"""
+
+import math
+import numpy
+import trueskill
+
+# largest difference from trueskill.rate seen over randomized 1v1, 2v2 and
+# free-for-all matches; both sides run the same message schedule and the
+# same erfc approximation, so only float summation order differs
+TOLERANCE = 1e-9
+
+# trueskill's iteration cap for the team difference chain
+MAX_ITERATIONS = 10
+
+def _erfc(x):
+    # same Chebyshev fit as trueskill.backends.erfc
+    z = numpy.abs(x)
+    t = 1. / (1. + z / 2.)
+    r = t * numpy.exp(-z * z - 1.26551223 + t * (1.00002368 + t * (
+        0.37409196 + t * (0.09678418 + t * (-0.18628806 + t * (
+            0.27886807 + t * (-1.13520398 + t * (1.48851587 + t * (
+                -0.82215223 + t * 0.17087277)))))))))
+    return numpy.where(x < 0, 2. - r, r)
+
+def _cdf(x):
+
+    return 0.5 * _erfc(-x / math.sqrt(2))
+
+def _pdf(x):
+
+    return numpy.exp(-x ** 2 / 2) / math.sqrt(2 * math.pi)
+
+def _mean(pi, tau):
+
+    return numpy.where(pi != 0, tau / numpy.where(pi != 0, pi, 1.), 0.)
+
+def _variance(pi):
+
+    return numpy.where(pi != 0, 1. / numpy.where(pi != 0, pi, 1.), numpy.inf)
+
+def _precision(variance):
+
+    return numpy.where(numpy.isinf(variance), 0., 1. / variance)
+
+class BatchRater(object):
+    """Rates arrays of independent matches with the TrueSkill factor graph.
+
+    Matches are given as mu and sigma arrays shaped (matches, teams,
+    team_size) with teams in finishing order, so every match in a call has
+    the same number of teams and players per team. Draws are not
+    supported. The message schedule, iteration cap and convergence test
+    mirror trueskill.TrueSkill.rate for each match, and results agree with
+    it to within TOLERANCE.
+
+    Args:
+        env (obj):  trueskill environment, the global one by default
+
+    Raises:
+        ValueError: environment uses a dynamic draw probability
+
+    """
+
+    def __init__(self, env=None):
+        """Initializes batch rater class."""
+
+        self._env = env or trueskill.global_env()
+        if callable(self._env.draw_probability):
+            raise ValueError("Dynamic draw probability is not supported")
+
+    def rate(self, mu, sigma, min_delta=trueskill.DELTA):
+        """Method to rate a batch of matches
+
+        Args:
+            mu (array):         player means, (matches, teams, team_size)
+            sigma (array):      player deviations, same shape as mu
+            min_delta (float):  convergence threshold of the difference chain
+
+        Returns:
+            tuple of new (mu, sigma) arrays shaped like the input
+
+        """
+
+        env = self._env
+        mu = numpy.asarray(mu, dtype=float)
+        sigma = numpy.asarray(sigma, dtype=float)
+        matches, teams, team_size = mu.shape
+        diffs = teams - 1
+        beta_squared = env.beta ** 2
+        draw_margin = trueskill.calc_draw_margin(env.draw_probability, 2 * team_size, env)
+
+        # prior with dynamics, then each player's performance
+        prior_pi = 1. / (sigma ** 2 + env.tau ** 2)
+        prior_tau = prior_pi * mu
+        scale = 1. / (1. + beta_squared * prior_pi)
+        perf_mean = _mean(scale * prior_pi, scale * prior_tau)
+        perf_variance = _variance(scale * prior_pi)
+
+        # team performance marginals start from the sum of their players
+        team_pi = _precision(perf_variance.sum(axis=2))
+        team_tau = team_pi * perf_mean.sum(axis=2)
+        state = {
+            'team_pi': team_pi.copy(), 'team_tau': team_tau.copy(),
+            'left_pi': numpy.zeros((matches, diffs)), 'left_tau': numpy.zeros((matches, diffs)),
+            'right_pi': numpy.zeros((matches, diffs)), 'right_tau': numpy.zeros((matches, diffs)),
+            'diff_pi': numpy.zeros((matches, diffs)), 'diff_tau': numpy.zeros((matches, diffs)),
+            'trunc_pi': numpy.zeros((matches, diffs)), 'trunc_tau': numpy.zeros((matches, diffs)),
+        }
+        active = numpy.ones(matches, dtype=bool)
+
+        for _ in range(MAX_ITERATIONS):
+            if diffs == 1:
+                self._down(state, 0, active)
+                delta = self._truncate(state, 0, draw_margin, active)
+            else:
+                delta = numpy.zeros(matches)
+                for index in range(diffs - 1):
+                    self._down(state, index, active)
+                    delta = numpy.maximum(delta, self._truncate(state, index, draw_margin,
+                                                                active))
+                    self._up_right(state, index, active)
+                for index in range(diffs - 1, 0, -1):
+                    self._down(state, index, active)
+                    delta = numpy.maximum(delta, self._truncate(state, index, draw_margin,
+                                                                active))
+                    self._up_left(state, index, active)
+            active &= delta > min_delta
+            if not active.any():
+                break
+
+        active = numpy.ones(matches, dtype=bool)
+        self._up_left(state, 0, active)
+        self._up_right(state, diffs - 1, active)
+
+        # messages from the difference chain back down to each player
+        chain_pi = state['team_pi'] - team_pi
+        chain_tau = state['team_tau'] - team_tau
+        message_mean = _mean(chain_pi, chain_tau)[:, :, None] - \
+            (perf_mean.sum(axis=2)[:, :, None] - perf_mean)
+        message_pi = _precision(_variance(chain_pi)[:, :, None] +
+                                (perf_variance.sum(axis=2)[:, :, None] - perf_variance))
+        scale = 1. / (1. + beta_squared * message_pi)
+        posterior_pi = prior_pi + scale * message_pi
+        posterior_tau = prior_tau + scale * message_pi * message_mean
+        return posterior_tau / posterior_pi, numpy.sqrt(1. / posterior_pi)
+
+    @staticmethod
+    def _update(state, name, index, pi, tau, active):
+
+        state[name + '_pi'][:, index] = numpy.where(active, pi, state[name + '_pi'][:, index])
+        state[name + '_tau'][:, index] = numpy.where(active, tau,
+                                                     state[name + '_tau'][:, index])
+
+    def _down(self, state, index, active):
+
+        left_pi = state['team_pi'][:, index] - state['left_pi'][:, index]
+        left_tau = state['team_tau'][:, index] - state['left_tau'][:, index]
+        right_pi = state['team_pi'][:, index + 1] - state['right_pi'][:, index]
+        right_tau = state['team_tau'][:, index + 1] - state['right_tau'][:, index]
+        pi = _precision(_variance(left_pi) + _variance(right_pi))
+        tau = pi * (_mean(left_pi, left_tau) - _mean(right_pi, right_tau))
+        self._update(state, 'diff', index, pi, tau, active)
+
+    def _truncate(self, state, index, draw_margin, active):
+
+        # the cavity of a difference is the message from its sum factor
+        div_pi = state['diff_pi'][:, index]
+        div_tau = state['diff_tau'][:, index]
+        sqrt_pi = numpy.sqrt(div_pi)
+        x = div_tau / sqrt_pi - draw_margin * sqrt_pi
+        denom = _cdf(x)
+        v = numpy.where(denom != 0, _pdf(x) / numpy.where(denom != 0, denom, 1.), -x)
+        w = v * (v + x)
+        pi = div_pi / (1. - w)
+        tau = (div_tau + sqrt_pi * v) / (1. - w)
+
+        old_pi = div_pi + state['trunc_pi'][:, index]
+        old_tau = div_tau + state['trunc_tau'][:, index]
+        delta = numpy.maximum(numpy.abs(tau - old_tau), numpy.sqrt(numpy.abs(pi - old_pi)))
+        self._update(state, 'trunc', index, pi - div_pi, tau - div_tau, active)
+        return delta
+
+    def _up_left(self, state, index, active):
+
+        diff_pi = state['trunc_pi'][:, index]
+        diff_tau = state['trunc_tau'][:, index]
+        right_pi = state['team_pi'][:, index + 1] - state['right_pi'][:, index]
+        right_tau = state['team_tau'][:, index + 1] - state['right_tau'][:, index]
+        pi = _precision(_variance(diff_pi) + _variance(right_pi))
+        tau = pi * (_mean(diff_pi, diff_tau) + _mean(right_pi, right_tau))
+        self._send_to_team(state, 'left', index, index, pi, tau, active)
+
+    def _up_right(self, state, index, active):
+
+        left_pi = state['team_pi'][:, index] - state['left_pi'][:, index]
+        left_tau = state['team_tau'][:, index] - state['left_tau'][:, index]
+        diff_pi = state['trunc_pi'][:, index]
+        diff_tau = state['trunc_tau'][:, index]
+        pi = _precision(_variance(left_pi) + _variance(diff_pi))
+        tau = pi * (_mean(left_pi, left_tau) - _mean(diff_pi, diff_tau))
+        self._send_to_team(state, 'right', index, index + 1, pi, tau, active)
+
+    def _send_to_team(self, state, name, index, team, pi, tau, active):
+
+        old_pi = state[name + '_pi'][:, index]
+        old_tau = state[name + '_tau'][:, index]
+        state['team_pi'][:, team] += numpy.where(active, pi - old_pi, 0.)
+        state['team_tau'][:, team] += numpy.where(active, tau - old_tau, 0.)
+        self._update(state, name, index, pi, tau, active)
+
+class RatingTable(object):
+    """Compact mu and sigma arrays of one game, indexed by player_id.
+
+    Args:
+        size (int): initial number of slots
+        env (obj):  trueskill environment, the global one by default
+
+    Attributes:
+        mu (array):     mean of every slot
+        sigma (array):  deviation of every slot
+
+    """
+
+    def __init__(self, size=0, env=None):
+        """Initializes rating table class."""
+
+        self._env = env or trueskill.global_env()
+        self.mu = numpy.full(size, self._env.mu)
+        self.sigma = numpy.full(size, self._env.sigma)
+
+    def reserve(self, player_id):
+        """Method to grow the table so player_id has a slot
+
+        Args:
+            player_id (int):    largest id that must fit
+
+        """
+
+        size = len(self.mu)
+        if player_id < size:
+            return
+        grown = max(player_id + 1, 2 * size)
+        self.mu = numpy.concatenate([self.mu, numpy.full(grown - size, self._env.mu)])
+        self.sigma = numpy.concatenate([self.sigma, numpy.full(grown - size, self._env.sigma)])
+
+    def rate(self, rater, player_ids, decimals=None):
+        """Method to rate independent matches and store the new ratings
+
+        Args:
+            rater (obj):        BatchRater to rate with
+            player_ids (array): ids shaped (matches, teams, team_size), no id
+                                may appear twice
+            decimals (int):     precision to round stored ratings to
+
+        Returns:
+            tuple of new (mu, sigma) arrays shaped like player_ids
+
+        """
+
+        player_ids = numpy.asarray(player_ids, dtype=int)
+        mu, sigma = rater.rate(self.mu[player_ids], self.sigma[player_ids])
+        if decimals is not None:
+            mu, sigma = numpy.round(mu, decimals), numpy.round(sigma, decimals)
+        self.mu[player_ids] = mu
+        self.sigma[player_ids] = sigma
+        return mu, sigma
+
+def schedule(matches):
+    """Groups time ordered matches into batches that can be rated together
+
+    A match's level is one past the highest level of any earlier match
+    sharing a player with it. Matches on the same level are independent,
+    and rating the levels in order gives every player its matches in the
+    original order.
+
+    Args:
+        matches (list): matches as sequences of teams of player keys
+
+    Returns:
+        list of match index lists, one per (level, shape), in level order
+
+    """
+
+    last_level = {}
+    batches = {}
+    for position, teams in enumerate(matches):
+        players = [player for team in teams for player in team]
+        level = 1 + max([last_level.get(player, -1) for player in players])
+        for player in players:
+            last_level[player] = level
+        shape = (len(teams), len(teams[0]))
+        batches.setdefault((level, shape), []).append(position)
+    return [batches[key] for key in sorted(batches)]
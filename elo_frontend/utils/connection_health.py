@@ -0,0 +1,186 @@
+"""@package connection_health
+Database connection health
+
+This script provides database connections that track their own health.
+
+@file connection_health.py
+
+@author Tyler Shake
+
+@par Notifications:
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The below copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+@copyright Copyright 2019 Tyler Shake
+"""
+
+import re
+import time
+import MySQLdb
+import MySQLdb.connections
+import MySQLdb.cursors
+
+# client errors raised when the server connection has gone away
+RECONNECT_ERRORS = (2006, 2013)
+
+# SELECTs that take row locks, which belong to the transaction like a write
+LOCKING_READ = re.compile(r"\bFOR\s+(UPDATE|SHARE)\b|\bLOCK\s+IN\s+SHARE\s+MODE\b",
+                          re.IGNORECASE)
+
+class Connection(MySQLdb.connections.Connection):
+    """A MySQL connection that records when it was last known to be alive.
+
+    Every successful statement refreshes last_verified, so callers can skip
+    liveness checks on connections that were used recently.
+
+    Once a dropped connection has been replaced, its cursors, commits and
+    rollbacks go to the replacement, so callers still holding it follow.
+
+    Attributes:
+        last_verified (float):  time the connection last talked to the server
+        in_transaction (bool):  statements have run since the last commit
+        replace (func):         swaps this connection for a fresh one and
+                                returns it, None when it cannot be replaced
+        replaced_by (obj):      connection that replaced this one, if any
+
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Initializes connection class."""
+
+        kwargs.setdefault('cursorclass', Cursor)
+        super(Connection, self).__init__(*args, **kwargs)
+        self.last_verified = time.time()
+        self.in_transaction = False
+        self.replace = None
+        self.replaced_by = None
+        self._auto_increment_increment = None
+
+    def cursor(self, cursorclass=None):
+        """Opens a cursor on this connection or on its replacement"""
+
+        if self.replaced_by is not None:
+            return self.replaced_by.cursor(cursorclass)
+        return super(Connection, self).cursor(cursorclass)
+
+    def commit(self):
+        """Commits the current transaction"""
+
+        if self.replaced_by is not None:
+            return self.replaced_by.commit()
+        super(Connection, self).commit()
+        self.in_transaction = False
+
+    def rollback(self):
+        """Rolls back the current transaction"""
+
+        if self.replaced_by is not None:
+            return self.replaced_by.rollback()
+        super(Connection, self).rollback()
+        self.in_transaction = False
+
+    def inserted_ids(self, first_id, count):
+        """Method to list the ids generated by a multi-row INSERT
+
+        InnoDB gives a single INSERT of a known number of rows one block of
+        auto-increment values, spaced by the session's
+        auto_increment_increment, which is above 1 on servers that share
+        key ranges with other primaries.
+
+        Args:
+            first_id (int): the insert's lastrowid
+            count (int):    number of rows inserted
+
+        Returns:
+            list of generated ids in row order
+
+        """
+
+        if self._auto_increment_increment is None:
+            cursor = self.cursor()
+            cursor.execute("SELECT @@auto_increment_increment")
+            self._auto_increment_increment = int(cursor.fetchone()[0])
+        return [first_id + index * self._auto_increment_increment for index in range(count)]
+
+    def is_alive(self):
+        """Method to check the connection with a server ping
+
+        Returns:
+            True if the server answered, False otherwise
+
+        """
+
+        try:
+            # never reconnect in place, a dead connection is replaced instead
+            self.ping(False)
+        except MySQLdb.OperationalError:
+            return False
+        else:
+            self.last_verified = time.time()
+            return True
+
+class _TrackingCursorMixin(object):
+    """Retries a statement once on a fresh connection when the server dropped.
+
+    The dead connection is never reconnected in place. When it holds no
+    uncommitted statements it is swapped for a fresh pooled connection
+    through Connection.replace, the cursor moves over and the statement
+    runs again. Inside a transaction the error is raised, since the
+    transaction is lost; the connection is marked unverified so the next
+    check_if_db_connected replaces it.
+
+    """
+
+    def execute(self, query, args=None):
+        """Executes a statement, retrying once on a dropped connection"""
+
+        connection = self._get_db()
+        while connection.replaced_by is not None:
+            # opened before the connection was replaced, follow it
+            connection = self._rebind(connection.replaced_by)
+        try:
+            result = super(_TrackingCursorMixin, self).execute(query, args)
+        except MySQLdb.OperationalError as error:
+            if error.args[0] not in RECONNECT_ERRORS:
+                raise
+            connection.last_verified = 0
+            if connection.in_transaction or connection.replace is None:
+                raise
+            connection = self._rebind(connection.replace())
+            result = super(_TrackingCursorMixin, self).execute(query, args)
+
+        connection.last_verified = time.time()
+        if query.lstrip()[:6].upper() != 'SELECT' or LOCKING_READ.search(query):
+            connection.in_transaction = True
+        return result
+
+    def _rebind(self, connection):
+
+        # reinitialize the cursor on the other connection, as MySQLdb keeps
+        # the connection in version dependent form
+        self.__init__(connection)
+        return connection
+
+class Cursor(_TrackingCursorMixin, MySQLdb.cursors.Cursor):
+    """Default buffered cursor tracking connection health"""
+    pass
+
+class SSCursor(_TrackingCursorMixin, MySQLdb.cursors.SSCursor):
+    """Server side streaming cursor tracking connection health"""
+    pass
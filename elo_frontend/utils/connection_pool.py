@@ -0,0 +1,164 @@
+"""@package connection_pool
+Database connection pool
+
+This script manages a pool of reusable database connections.
+
+@file connection_pool.py
+
+@author Tyler Shake
+
+@par Notifications:
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The below copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+@copyright Copyright 2019 Tyler Shake
+
+"""
+
+import threading
+import Queue
+import MySQLdb
+
+import elo_frontend.utils.exceptions as exceptions
+
+class ConnectionPool(object):
+    """A bounded pool of database connections.
+
+    Connections are created lazily up to max_size and handed out one per
+    borrower. Once the pool is exhausted, acquire blocks until another
+    borrower releases a connection or the checkout timeout expires.
+
+    Args:
+        connect (callable): function returning a new database connection
+        min_size (int):     connections opened up front
+        max_size (int):     upper bound on open connections
+        timeout (float):    seconds to wait for a free connection
+
+    Raises:
+        ConfigError:        invalid pool size
+
+    """
+
+    def __init__(self, connect, min_size, max_size, timeout):
+        """Initializes connection pool class."""
+
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise exceptions.ConfigError("Invalid database pool size in config file")
+
+        self._connect = connect
+        self._max_size = max_size
+        self._timeout = timeout
+        self._lock = threading.Lock()
+        self._idle = Queue.LifoQueue()
+        self._size = 0
+
+        for _ in range(min_size):
+            self._size += 1
+            self._idle.put(self._open())
+
+    @property
+    def size(self):
+        """Number of connections currently open"""
+
+        return self._size
+
+    def acquire(self):
+        """Method to borrow a connection from the pool
+
+        Returns:
+            database connection
+
+        Raises:
+            DBConnectionError:  no connection freed up before the timeout
+
+        """
+
+        try:
+            return self._idle.get_nowait()
+        except Queue.Empty:
+            pass
+
+        with self._lock:
+            can_open = self._size < self._max_size
+            if can_open:
+                self._size += 1
+
+        if can_open:
+            return self._open()
+
+        try:
+            return self._idle.get(timeout=self._timeout)
+        except Queue.Empty:
+            raise exceptions.DBConnectionError(
+                "Timed out waiting for a database connection")
+
+    def release(self, connection):
+        """Method to return a borrowed connection to the pool
+
+        Any uncommitted work is rolled back so the next borrower starts
+        from a clean transaction. Connections that fail the rollback are
+        closed instead of being reused.
+
+        Args:
+            connection (obj):   connection obtained from acquire
+
+        """
+
+        try:
+            connection.rollback()
+        except MySQLdb.Error:
+            self.discard(connection)
+        else:
+            self._idle.put(connection)
+
+    def discard(self, connection):
+        """Method to drop a broken connection from the pool
+
+        Args:
+            connection (obj):   connection obtained from acquire
+
+        """
+
+        with self._lock:
+            self._size -= 1
+
+        try:
+            connection.close()
+        except MySQLdb.Error:
+            pass
+
+    def close(self):
+        """Method to close all idle connections"""
+
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except Queue.Empty:
+                break
+            self.discard(connection)
+
+    def _open(self):
+        # the caller has already reserved a slot in self._size
+
+        try:
+            return self._connect()
+        except:
+            with self._lock:
+                self._size -= 1
+            raise
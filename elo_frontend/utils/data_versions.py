@@ -0,0 +1,68 @@
+"""@package data_versions
+Data Versions
+
+This script reads and bumps the per-game data versions stored in the database.
+
+@file data_versions.py
+
+@author Tyler Shake
+
+@par Notifications:
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The below copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+@copyright Copyright 2019 Tyler Shake
+"""
+
+import datetime
+
+# data version rows, 'player' covers player data shown by every game
+GAMES = ('player', 'pp', 'fb', 'mk', 'ss')
+
+def bump(cursor, games):
+    """Marks the data of games as changed in the cursor's transaction
+
+    Every transaction writing data shown on a page bumps the versions of its
+    games before committing, so the versions change exactly when the data
+    becomes visible to other connections, whichever process wrote it.
+
+    Args:
+        cursor (Cursor):    cursor of the writing transaction
+        games (tup):        games whose data changed
+
+    """
+
+    cursor.execute("UPDATE data_version SET version = version + 1, \
+time = CURRENT_TIMESTAMP WHERE game IN ({0})".format(
+    ", ".join(["%s"] * len(games))), tuple(games))
+
+def read(cursor):
+    """Reads the data versions of every game
+
+    Args:
+        cursor (Cursor):    cursor to read with
+
+    Returns:
+        dict of game to (version, last modified UTC datetime)
+
+    """
+
+    cursor.execute("SELECT game, version, UNIX_TIMESTAMP(time) FROM data_version")
+    return dict((game, (version, datetime.datetime.utcfromtimestamp(int(modified))))
+                for game, version, modified in cursor.fetchall())
@@ -31,18 +31,224 @@ SOFTWARE.
 
 """
 
+import functools
 import logging
 import logging.config
+import math
 import os
 import traceback
 import ConfigParser
 import time
+import threading
 import MySQLdb
 import pkg_resources
 import appdirs
 import trueskill
 
 import elo_frontend.utils.exceptions as exceptions
+import elo_frontend.utils.connection_pool as connection_pool
+import elo_frontend.utils.connection_health as connection_health
+import elo_frontend.utils.data_versions as data_versions
+import elo_frontend.utils.migrations as migrations
+import elo_frontend.utils.rating_replay as rating_replay
+import elo_frontend.utils.rating_queue as rating_queue
+import elo_frontend.utils.result_import as result_import
+import elo_frontend.utils.result_export as result_export
+import elo_frontend.utils.statements as statements
+
+# [options] that older user config files may not define yet
+OPTION_DEFAULTS = {
+    'pool_min_size': '1',
+    'pool_max_size': '10',
+    'pool_timeout': '30',
+    'db_verify_interval': '5',
+    'db_ready_timeout': '60',
+    'db_ready_backoff': '0.1',
+    'db_connect_timeout': '10',
+    'auto_migrate': 'true',
+    'replay_batch_size': '1000',
+    'import_batch_size': '500',
+    'export_chunk_rows': '1000',
+    'results_page_size': '50',
+    'rating_queue_poll_interval': '5',
+}
+
+# longest pause between database readiness probes, in seconds
+DB_READY_MAX_BACKOFF = 5.0
+
+# MySQL errors no amount of waiting fixes: access denied, unknown database
+DB_FATAL_ERRORS = (1045, 1049)
+
+# finishing places in result column order
+PLACES = ('first', 'second', 'third', 'fourth', 'fifth', 'sixth', 'seventh', 'eighth')
+
+# finishing places recorded by the result table of each free-for-all game
+PLACEMENT_PLACES = {
+    'mk': PLACES[:4],
+    'ss': PLACES,
+}
+
+# games whose rating updates are queued, in the order the worker applies them
+RATING_JOB_GAMES = ('pp', 'fb', 'mk', 'ss')
+
+# standing counters of the top finishing places
+PLACEMENT_COUNTERS = ('first_place', 'second_place', 'third_place')
+
+# player rating column each standing game is materialized from
+STANDING_RATING_COLUMNS = {
+    'pp': 'pp_ind_rating',
+    'fb_offense': 'fb_offense_rating',
+    'fb_defense': 'fb_defense_rating',
+    'mk': 'mk_ind_rating',
+    'ss': 'ss_ind_rating',
+}
+
+# result listing of each game without its ORDER BY, result_id first and time last
+RESULT_LISTINGS = {
+    'pp': "SELECT pp_result.result_id, winner.first_name, winner.last_name, \
+winner.nickname, loser.first_name, loser.last_name, loser.nickname, pp_result.time \
+FROM pp_result \
+JOIN player AS winner ON winner.player_id = pp_result.pp_winner \
+JOIN player AS loser ON loser.player_id = pp_result.pp_loser",
+    'fb': "SELECT fb_result.result_id, offense_winner.first_name, \
+offense_winner.last_name, offense_winner.nickname, defense_winner.first_name, \
+defense_winner.last_name, defense_winner.nickname, offense_loser.first_name, \
+offense_loser.last_name, offense_loser.nickname, defense_loser.first_name, \
+defense_loser.last_name, defense_loser.nickname, fb_result.time \
+FROM fb_result \
+JOIN player AS offense_winner ON offense_winner.player_id = fb_result.offense_winner \
+JOIN player AS defense_winner ON defense_winner.player_id = fb_result.defense_winner \
+JOIN player AS offense_loser ON offense_loser.player_id = fb_result.offense_loser \
+JOIN player AS defense_loser ON defense_loser.player_id = fb_result.defense_loser",
+    'mk': "SELECT mk_ind_result.result_id, first_player.first_name, \
+first_player.last_name, first_player.nickname, second_player.first_name, \
+second_player.last_name, second_player.nickname, \
+IFNULL(third_player.first_name, ''), IFNULL(third_player.last_name, ''), \
+IFNULL(third_player.nickname, ''), \
+IFNULL(fourth_player.first_name, ''), IFNULL(fourth_player.last_name, ''), \
+IFNULL(fourth_player.nickname, ''), \
+mk_ind_result.course, mk_ind_result.time \
+FROM mk_ind_result \
+JOIN player AS first_player ON first_player.player_id = mk_ind_result.mk_ind_first \
+JOIN player AS second_player ON second_player.player_id = mk_ind_result.mk_ind_second \
+LEFT JOIN player AS third_player ON third_player.player_id = mk_ind_result.mk_ind_third \
+LEFT JOIN player AS fourth_player ON fourth_player.player_id = mk_ind_result.mk_ind_fourth",
+    'ss': "SELECT ss_ind_result.result_id, first_player.first_name, \
+first_player.last_name, first_player.nickname, ss_first_char, \
+second_player.first_name, second_player.last_name, second_player.nickname, ss_second_char, \
+IFNULL(third_player.first_name, ''), IFNULL(third_player.last_name, ''), \
+IFNULL(third_player.nickname, ''), IFNULL(ss_third_char, ''), \
+IFNULL(fourth_player.first_name, ''), IFNULL(fourth_player.last_name, ''), \
+IFNULL(fourth_player.nickname, ''), IFNULL(ss_fourth_char, ''), \
+IFNULL(fifth_player.first_name, ''), IFNULL(fifth_player.last_name, ''), \
+IFNULL(fifth_player.nickname, ''), IFNULL(ss_fifth_char, ''), \
+IFNULL(sixth_player.first_name, ''), IFNULL(sixth_player.last_name, ''), \
+IFNULL(sixth_player.nickname, ''), IFNULL(ss_sixth_char, ''), \
+IFNULL(seventh_player.first_name, ''), IFNULL(seventh_player.last_name, ''), \
+IFNULL(seventh_player.nickname, ''), IFNULL(ss_seventh_char, ''), \
+IFNULL(eighth_player.first_name, ''), IFNULL(eighth_player.last_name, ''), \
+IFNULL(eighth_player.nickname, ''), IFNULL(ss_eighth_char, ''), \
+ss_ind_result.time \
+FROM ss_ind_result \
+JOIN player AS first_player ON first_player.player_id = ss_ind_result.ss_ind_first \
+JOIN player AS second_player ON second_player.player_id = ss_ind_result.ss_ind_second \
+LEFT JOIN player AS third_player ON third_player.player_id = ss_ind_result.ss_ind_third \
+LEFT JOIN player AS fourth_player ON fourth_player.player_id = ss_ind_result.ss_ind_fourth \
+LEFT JOIN player AS fifth_player ON fifth_player.player_id = ss_ind_result.ss_ind_fifth \
+LEFT JOIN player AS sixth_player ON sixth_player.player_id = ss_ind_result.ss_ind_sixth \
+LEFT JOIN player AS seventh_player ON seventh_player.player_id = ss_ind_result.ss_ind_seventh \
+LEFT JOIN player AS eighth_player ON eighth_player.player_id = ss_ind_result.ss_ind_eighth",
+}
+
+def _is_player(player):
+    """Tells whether a value identifies a player
+
+    Players are given by integer player_id, or by a (first_name, last_name,
+    nickname) tuple for callers that only know names.
+
+    Args:
+        player (obj):   value to check
+
+    Returns:
+        True/False if value is a player id or complete name tuple
+
+    """
+
+    if isinstance(player, bool):
+        return False
+    if isinstance(player, (int, long)):
+        return True
+    return isinstance(player, (tuple, list)) and len(player) == 3
+
+def _player_filter(players):
+    """Builds a condition matching players given by id or by name
+
+    Name tuples are matched on the unique player name index.
+
+    Args:
+        players (list): player ids or name tuples
+
+    Returns:
+        condition on the player table and its parameters
+
+    """
+
+    player_ids = [player for player in players if isinstance(player, (int, long))]
+    names = [player for player in players if not isinstance(player, (int, long))]
+    conditions = []
+    params = list(player_ids)
+    if player_ids:
+        conditions.append("player.player_id IN ({0})".format(", ".join(["%s"] * len(player_ids))))
+    if names:
+        conditions.append("(player.first_name, player.last_name, player.nickname) IN ({0})".format(
+            ", ".join(["(%s, %s, %s)"] * len(names))))
+        params.extend(name for player in names for name in player)
+    return " OR ".join(conditions), params
+
+def _match_players(players, rows):
+    """Orders player rows like the players they were looked up for
+
+    Args:
+        players (list): player ids or name tuples
+        rows (list):    rows starting with player_id, first_name, last_name
+                        and nickname
+
+    Returns:
+        list of rows in the order of players
+
+    Raises:
+        DBValueError:   player not found
+
+    """
+
+    by_id = {}
+    by_name = {}
+    for row in rows:
+        by_id[row[0]] = row
+        # names compare case insensitively in MySQL, so key them the same way
+        by_name[tuple((name or "").lower() for name in row[1:4])] = row
+
+    try:
+        return [by_id[player] if isinstance(player, (int, long)) else
+                by_name[tuple((name or "").lower() for name in player)] for player in players]
+    except KeyError:
+        raise exceptions.DBValueError("Player does not exist")
+
+def _cached_leaderboard(game, kind):
+    """Caches a leaderboard query result per game until the game is written
+
+    Args:
+        game (str):     game the leaderboard belongs to
+        kind (str):     leaderboard type within the game
+
+    """
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self):
+            return self._get_leaderboard(game, kind, lambda: method(self))
+        return wrapper
+    return decorator
 
 class DBManager(object):
     """A database manager class.
@@ -69,654 +275,75 @@ class DBManager(object):
         # setup logger, config, and utility directory
         self._configure()
 
-        time.sleep(10)
         self._logger.info("Connecting to database")
         self._db_user = db_user
         self._db_pass = db_pass
         self._db_name = self._config.get('options', 'db_name')
         self._db_host = self._config.get('options', 'db_host')
         self._db_port = self._config.get('options', 'db_port')
-        self._db_conn = MySQLdb.connect(user=self._db_user, passwd=self._db_pass,
-                                        host=self._db_host, db=self._db_name)
-        cursor = self._db_conn.cursor()
-        self._logger.info("Creating tables")
-
-        cursor.execute("CREATE TABLE IF NOT EXISTS rating (\
-rating_id INT NOT NULL AUTO_INCREMENT,\
-mu DECIMAL(6,4) NOT NULL,\
-sigma DECIMAL(6,4) NOT NULL,\
-time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\
-PRIMARY KEY (rating_id),\
-UNIQUE INDEX rating_id_UNIQUE (rating_id ASC))")
-
-        cursor.execute("CREATE TABLE IF NOT EXISTS player (\
-player_id INT NOT NULL AUTO_INCREMENT,\
-first_name VARCHAR(45) NOT NULL,\
-last_name VARCHAR(45) NOT NULL,\
-nickname VARCHAR(45) NULL,\
-time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\
-fb_offense_rating INT NOT NULL,\
-fb_defense_rating INT NOT NULL,\
-mk_ind_rating INT NOT NULL,\
-mp_ind_rating INT NOT NULL,\
-ss_ind_rating INT NOT NULL,\
-pp_ind_rating INT NOT NULL,\
-PRIMARY KEY (player_id),\
-UNIQUE INDEX player_id_UNIQUE (player_id ASC),\
-INDEX fb_offense_rating_idx (fb_offense_rating ASC),\
-INDEX fb_defense_rating_idx (fb_defense_rating ASC),\
-INDEX mk_rating_ind_idx (mk_ind_rating ASC),\
-INDEX mp_rating_ind_idx (mp_ind_rating ASC),\
-INDEX ss_rating_ind_idx (ss_ind_rating ASC),\
-INDEX pp_rating_ind_idx (pp_ind_rating ASC),\
-CONSTRAINT fb_offense_rating \
-FOREIGN KEY (fb_offense_rating) \
-REFERENCES rating (rating_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION,\
-CONSTRAINT fb_defense_rating \
-FOREIGN KEY (fb_defense_rating) \
-REFERENCES rating (rating_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION,\
-CONSTRAINT mk_ind_rating \
-FOREIGN KEY (mk_ind_rating) \
-REFERENCES rating (rating_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION,\
-CONSTRAINT mp_ind_rating \
-FOREIGN KEY (mp_ind_rating) \
-REFERENCES rating (rating_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION,\
-CONSTRAINT ss_ind_rating \
-FOREIGN KEY (ss_ind_rating) \
-REFERENCES rating (rating_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION,\
-CONSTRAINT pp_ind_rating \
-FOREIGN KEY (pp_ind_rating) \
-REFERENCES rating (rating_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION)")
-
-        cursor.execute("CREATE TABLE IF NOT EXISTS team (\
-team_id INT NOT NULL AUTO_INCREMENT,\
-team_name VARCHAR(75) NOT NULL,\
-time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\
-fb_team_rating INT NOT NULL,\
-mk_team_rating INT NOT NULL,\
-mp_team_rating INT NOT NULL,\
-ss_team_rating INT NOT NULL,\
-PRIMARY KEY (team_id),\
-UNIQUE INDEX team_id_UNIQUE (team_id ASC),\
-UNIQUE INDEX team_name_UNIQUE (team_name ASC),\
-INDEX fb_team_rating_idx (fb_team_rating ASC),\
-INDEX mk_team_rating_idx (mk_team_rating ASC),\
-INDEX mp_team_rating_idx (mp_team_rating ASC),\
-INDEX ss_team_rating_idx (ss_team_rating ASC),\
-CONSTRAINT fb_team_rating \
-FOREIGN KEY (fb_team_rating) \
-REFERENCES rating (rating_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION, \
-CONSTRAINT mk_team_rating \
-FOREIGN KEY (mk_team_rating) \
-REFERENCES rating (rating_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION, \
-CONSTRAINT mp_team_rating \
-FOREIGN KEY (mp_team_rating) \
-REFERENCES rating (rating_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION, \
-CONSTRAINT ss_team_rating \
-FOREIGN KEY (ss_team_rating) \
-REFERENCES rating (rating_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION)")
-
-        cursor.execute("CREATE TABLE IF NOT EXISTS player_team_xref (\
-player INT NOT NULL,\
-team INT NOT NULL,\
-INDEX player_idx (player ASC),\
-INDEX team_idx (team ASC),\
-CONSTRAINT player \
-FOREIGN KEY (player) \
-REFERENCES player (player_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION,\
-CONSTRAINT team \
-FOREIGN KEY (team) \
-REFERENCES team (team_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION)")
-
-        cursor.execute("CREATE TABLE IF NOT EXISTS fb_result (\
-result_id INT NOT NULL AUTO_INCREMENT,\
-offense_winner INT NOT NULL,\
-defense_winner INT NOT NULL,\
-offense_loser INT NOT NULL,\
-defense_loser INT NOT NULL,\
-time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\
-PRIMARY KEY (result_id),\
-UNIQUE INDEX result_id_UNIQUE (result_id ASC),\
-INDEX offense_winner_idx (offense_winner ASC),\
-INDEX defense_winner_idx (defense_winner ASC),\
-INDEX offense_loser_idx (offense_loser ASC),\
-INDEX defense_loser_idx (defense_loser ASC),\
-CONSTRAINT offense_winner \
-FOREIGN KEY (offense_winner) \
-REFERENCES player (player_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION,\
-CONSTRAINT defense_winner \
-FOREIGN KEY (defense_winner) \
-REFERENCES player (player_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION,\
-CONSTRAINT offense_loser \
-FOREIGN KEY (offense_loser) \
-REFERENCES player (player_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION,\
-CONSTRAINT defense_loser \
-FOREIGN KEY (defense_loser) \
-REFERENCES player (player_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION)")
-
-        cursor.execute("CREATE TABLE IF NOT EXISTS mk_ind_result (\
-result_id INT NOT NULL AUTO_INCREMENT,\
-mk_ind_first INT NOT NULL,\
-mk_ind_second INT NOT NULL,\
-mk_ind_third INT NULL,\
-mk_ind_fourth INT NULL,\
-course VARCHAR(75) NOT NULL,\
-time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\
-PRIMARY KEY (result_id),\
-UNIQUE INDEX result_id_UNIQUE (result_id ASC),\
-INDEX mk_ind_first_idx (mk_ind_first ASC),\
-INDEX mk_ind_second_idx (mk_ind_second ASC),\
-INDEX mk_ind_third_idx (mk_ind_third ASC),\
-INDEX mk_ind_fourth_idx (mk_ind_fourth ASC),\
-CONSTRAINT mk_ind_first \
-FOREIGN KEY (mk_ind_first) \
-REFERENCES player (player_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION,\
-CONSTRAINT mk_ind_second \
-FOREIGN KEY (mk_ind_second) \
-REFERENCES player (player_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION,\
-CONSTRAINT mk_ind_third \
-FOREIGN KEY (mk_ind_third) \
-REFERENCES player (player_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION,\
-CONSTRAINT mk_ind_fourth \
-FOREIGN KEY (mk_ind_fourth) \
-REFERENCES player (player_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION)")
-
-        cursor.execute("CREATE TABLE IF NOT EXISTS mk_team_result (\
-result_id INT NOT NULL AUTO_INCREMENT,\
-mk_team_first INT NOT NULL,\
-mk_team_second INT NOT NULL,\
-time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\
-PRIMARY KEY (result_id),\
-UNIQUE INDEX result_id_UNIQUE (result_id ASC),\
-INDEX mk_team_first_idx (mk_team_first ASC),\
-INDEX mk_team_second_idx (mk_team_second ASC),\
-CONSTRAINT mk_team_first \
-FOREIGN KEY (mk_team_first) \
-REFERENCES team (team_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION,\
-CONSTRAINT mk_team_second \
-FOREIGN KEY (mk_team_second) \
-REFERENCES team (team_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION)")
-
-        cursor.execute("CREATE TABLE IF NOT EXISTS mp_ind_result (\
-result_id INT NOT NULL AUTO_INCREMENT,\
-mp_ind_first INT NOT NULL,\
-mp_first_char VARCHAR(75) NOT NULL,\
-mp_ind_second INT NOT NULL,\
-mp_second_char VARCHAR(75) NOT NULL,\
-mp_ind_third INT NULL,\
-mp_third_char VARCHAR(75) NOT NULL,\
-mp_ind_fourth INT NULL,\
-mp_fourth_char VARCHAR(75) NOT NULL,\
-board VARCHAR(75) NOT NULL,\
-time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\
-PRIMARY KEY (result_id),\
-UNIQUE INDEX result_id_UNIQUE (result_id ASC),\
-INDEX mp_ind_first_idx (mp_ind_first ASC),\
-INDEX mp_ind_second_idx (mp_ind_second ASC),\
-INDEX mp_ind_third_idx (mp_ind_third ASC),\
-INDEX mp_ind_fourth_idx (mp_ind_fourth ASC),\
-CONSTRAINT mp_ind_first \
-FOREIGN KEY (mp_ind_first) \
-REFERENCES player (player_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION,\
-CONSTRAINT mp_ind_second \
-FOREIGN KEY (mp_ind_second) \
-REFERENCES player (player_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION,\
-CONSTRAINT mp_ind_third \
-FOREIGN KEY (mp_ind_third) \
-REFERENCES player (player_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION,\
-CONSTRAINT mp_ind_fourth \
-FOREIGN KEY (mp_ind_fourth) \
-REFERENCES player (player_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION)")
-
-        cursor.execute("CREATE TABLE IF NOT EXISTS mp_team_result (\
-result_id INT NOT NULL AUTO_INCREMENT,\
-mp_team_first INT NOT NULL,\
-mp_team_second INT NOT NULL,\
-time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\
-PRIMARY KEY (result_id),\
-UNIQUE INDEX result_id_UNIQUE (result_id ASC),\
-INDEX mp_team_first_idx (mp_team_first ASC),\
-INDEX mp_team_second_idx (mp_team_second ASC),\
-CONSTRAINT mp_team_first \
-FOREIGN KEY (mp_team_first) \
-REFERENCES team (team_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION,\
-CONSTRAINT mp_team_second \
-FOREIGN KEY (mp_team_second) \
-REFERENCES team (team_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION)")
-
-        cursor.execute("CREATE TABLE IF NOT EXISTS ss_ind_result (\
-result_id INT NOT NULL AUTO_INCREMENT,\
-ss_ind_first INT NOT NULL,\
-ss_first_char VARCHAR(75) NOT NULL,\
-ss_ind_second INT NOT NULL,\
-ss_second_char VARCHAR(75) NOT NULL,\
-ss_ind_third INT NULL,\
-ss_third_char VARCHAR(75) NULL,\
-ss_ind_fourth INT NULL,\
-ss_fourth_char VARCHAR(75) NULL,\
-ss_ind_fifth INT NULL,\
-ss_fifth_char VARCHAR(75) NULL,\
-ss_ind_sixth INT NULL,\
-ss_sixth_char VARCHAR(75) NULL,\
-ss_ind_seventh INT NULL,\
-ss_seventh_char VARCHAR(75) NULL,\
-ss_ind_eighth INT NULL,\
-ss_eighth_char VARCHAR(75) NULL,\
-time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\
-PRIMARY KEY (result_id),\
-UNIQUE INDEX result_id_UNIQUE (result_id ASC),\
-INDEX ss_ind_first_idx (ss_ind_first ASC),\
-INDEX ss_ind_second_idx (ss_ind_second ASC),\
-INDEX ss_ind_third_idx (ss_ind_third ASC),\
-INDEX ss_ind_fourth_idx (ss_ind_fourth ASC),\
-INDEX ss_ind_fifth_idx (ss_ind_fifth ASC),\
-INDEX ss_ind_sixth_idx (ss_ind_sixth ASC),\
-INDEX ss_ind_seventh_idx (ss_ind_seventh ASC),\
-INDEX ss_ind_eighth_idx (ss_ind_eighth ASC),\
-CONSTRAINT ss_ind_first \
-FOREIGN KEY (ss_ind_first) \
-REFERENCES player (player_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION,\
-CONSTRAINT ss_ind_second \
-FOREIGN KEY (ss_ind_second) \
-REFERENCES player (player_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION,\
-CONSTRAINT ss_ind_third \
-FOREIGN KEY (ss_ind_third) \
-REFERENCES player (player_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION,\
-CONSTRAINT ss_ind_fourth \
-FOREIGN KEY (ss_ind_fourth) \
-REFERENCES player (player_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION, \
-CONSTRAINT ss_ind_fifth \
-FOREIGN KEY (ss_ind_fifth) \
-REFERENCES player (player_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION,\
-CONSTRAINT ss_ind_sixth \
-FOREIGN KEY (ss_ind_sixth) \
-REFERENCES player (player_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION,\
-CONSTRAINT ss_ind_seventh \
-FOREIGN KEY (ss_ind_seventh) \
-REFERENCES player (player_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION,\
-CONSTRAINT ss_ind_eighth \
-FOREIGN KEY (ss_ind_eighth) \
-REFERENCES player (player_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION)")
-
-        cursor.execute("CREATE TABLE IF NOT EXISTS ss_team_result (\
-result_id INT NOT NULL AUTO_INCREMENT,\
-ss_team_first INT NOT NULL,\
-ss_team_second INT NOT NULL,\
-ss_team_third INT NULL,\
-ss_team_fourth INT NULL,\
-time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\
-PRIMARY KEY (result_id),\
-UNIQUE INDEX result_id_UNIQUE (result_id ASC),\
-INDEX ss_team_first_idx (ss_team_first ASC),\
-INDEX ss_team_second_idx (ss_team_second ASC),\
-INDEX ss_team_third_idx (ss_team_third ASC),\
-INDEX ss_team_fourth_idx (ss_team_fourth ASC),\
-CONSTRAINT ss_team_first \
-FOREIGN KEY (ss_team_first) \
-REFERENCES team (team_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION,\
-CONSTRAINT ss_team_second \
-FOREIGN KEY (ss_team_second) \
-REFERENCES team (team_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION,\
-CONSTRAINT ss_team_third \
-FOREIGN KEY (ss_team_third) \
-REFERENCES team (team_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION,\
-CONSTRAINT ss_team_fourth \
-FOREIGN KEY (ss_team_fourth) \
-REFERENCES team (team_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION)")
-
-        cursor.execute("CREATE TABLE IF NOT EXISTS pp_result (\
-result_id INT NOT NULL AUTO_INCREMENT,\
-pp_winner INT NOT NULL,\
-pp_loser INT NOT NULL,\
-time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\
-PRIMARY KEY (result_id),\
-UNIQUE INDEX result_id_UNIQUE (result_id ASC),\
-INDEX pp_winner_idx (pp_winner ASC),\
-INDEX pp_loser_idx (pp_loser ASC),\
-CONSTRAINT pp_winner \
-FOREIGN KEY (pp_winner) \
-REFERENCES player (player_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION,\
-CONSTRAINT pp_loser \
-FOREIGN KEY (pp_loser) \
-REFERENCES player (player_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION)")
-
-        cursor.execute("CREATE TABLE IF NOT EXISTS fb_offense_rating_hist (\
-rating INT NOT NULL,\
-player INT NOT NULL,\
-time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\
-INDEX rating_idx (rating ASC),\
-INDEX player_idx (player ASC),\
-CONSTRAINT fb_offense_rating_hist \
-FOREIGN KEY (rating) \
-REFERENCES rating (rating_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION,\
-CONSTRAINT fb_offense_player_hist \
-FOREIGN KEY (player) \
-REFERENCES player (player_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION)")
-
-        cursor.execute("CREATE TABLE IF NOT EXISTS fb_defense_rating_hist (\
-rating INT NOT NULL,\
-player INT NOT NULL,\
-time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\
-INDEX rating_idx (rating ASC),\
-INDEX player_idx (player ASC),\
-CONSTRAINT fb_defense_rating_hist \
-FOREIGN KEY (rating) \
-REFERENCES rating (rating_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION,\
-CONSTRAINT fb_defense_player_hist \
-FOREIGN KEY (player) \
-REFERENCES player (player_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION)")
-
-        cursor.execute("CREATE TABLE IF NOT EXISTS fb_team_rating_hist (\
-rating INT NOT NULL,\
-team INT NOT NULL,\
-time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\
-INDEX rating_idx (rating ASC),\
-INDEX team_idx (team ASC),\
-CONSTRAINT fb_team_rating_hist \
-FOREIGN KEY (rating) \
-REFERENCES rating (rating_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION,\
-CONSTRAINT fb_team_player_hist \
-FOREIGN KEY (team) \
-REFERENCES team (team_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION)")
-
-        cursor.execute("CREATE TABLE IF NOT EXISTS mk_team_rating_hist (\
-rating INT NOT NULL,\
-team INT NOT NULL,\
-time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\
-INDEX rating_idx (rating ASC),\
-INDEX team_idx (team ASC),\
-CONSTRAINT mk_team_rating_hist \
-FOREIGN KEY (rating) \
-REFERENCES rating (rating_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION,\
-CONSTRAINT mk_team_player_hist \
-FOREIGN KEY (team) \
-REFERENCES team (team_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION)")
-
-        cursor.execute("CREATE TABLE IF NOT EXISTS mk_ind_rating_hist (\
-rating INT NOT NULL,\
-player INT NOT NULL,\
-time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\
-INDEX rating_idx (rating ASC),\
-INDEX player_idx (player ASC),\
-CONSTRAINT mk_ind_rating_hist \
-FOREIGN KEY (rating) \
-REFERENCES rating (rating_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION,\
-CONSTRAINT mk_ind_player_hist \
-FOREIGN KEY (player) \
-REFERENCES player (player_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION)")
-
-        cursor.execute("CREATE TABLE IF NOT EXISTS mp_team_rating_hist (\
-rating INT NOT NULL,\
-team INT NOT NULL,\
-time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\
-INDEX rating_idx (rating ASC),\
-INDEX team_idx (team ASC),\
-CONSTRAINT mp_team_rating_hist \
-FOREIGN KEY (rating) \
-REFERENCES rating (rating_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION,\
-CONSTRAINT mp_team_player_hist \
-FOREIGN KEY (team) \
-REFERENCES team (team_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION)")
-
-        cursor.execute("CREATE TABLE IF NOT EXISTS mp_ind_rating_hist (\
-rating INT NOT NULL,\
-player INT NOT NULL,\
-time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\
-INDEX rating_idx (rating ASC),\
-INDEX player_idx (player ASC),\
-CONSTRAINT mp_ind_rating_hist \
-FOREIGN KEY (rating) \
-REFERENCES rating (rating_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION,\
-CONSTRAINT mp_ind_player_hist \
-FOREIGN KEY (player) \
-REFERENCES player (player_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION)")
-
-        cursor.execute("CREATE TABLE IF NOT EXISTS ss_team_rating_hist (\
-rating INT NOT NULL,\
-team INT NOT NULL,\
-time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\
-INDEX rating_idx (rating ASC),\
-INDEX team_idx (team ASC),\
-CONSTRAINT ss_team_rating_hist \
-FOREIGN KEY (rating) \
-REFERENCES rating (rating_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION,\
-CONSTRAINT ss_team_player_hist \
-FOREIGN KEY (team) \
-REFERENCES team (team_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION)")
-
-        cursor.execute("CREATE TABLE IF NOT EXISTS ss_ind_rating_hist (\
-rating INT NOT NULL,\
-player INT NOT NULL,\
-time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\
-INDEX rating_idx (rating ASC),\
-INDEX player_idx (player ASC),\
-CONSTRAINT ss_ind_rating_hist \
-FOREIGN KEY (rating) \
-REFERENCES rating (rating_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION,\
-CONSTRAINT ss_ind_player_hist \
-FOREIGN KEY (player) \
-REFERENCES player (player_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION)")
-
-        cursor.execute("CREATE TABLE IF NOT EXISTS pp_ind_rating_hist (\
-rating INT NOT NULL,\
-player INT NOT NULL,\
-time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\
-INDEX rating_idx (rating ASC),\
-INDEX player_idx (player ASC),\
-CONSTRAINT pp_ind_rating_hist \
-FOREIGN KEY (rating) \
-REFERENCES rating (rating_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION,\
-CONSTRAINT pp_ind_player_hist \
-FOREIGN KEY (player) \
-REFERENCES player (player_id) \
-ON DELETE NO ACTION \
-ON UPDATE NO ACTION)")
-
-    def add_player(self, first_name, last_name, nickname):
-        """Example method description.
-
-        Args:
-            first_name (str):   players first name
-            last_name (str):    players last name
-            nickname (str):     player's nickname
-
-        Raises:
-            DBValueError:       invalid db entry
-            DBConnectionError:  database connection issues
-            DBSyntaxError:      invalid database programming statement
-
-        Returns:
-            self.attr1
+        self._wait_for_database()
+        self._verify_interval = self._config.getfloat('options', 'db_verify_interval')
+        self._local = threading.local()
+        self._leaderboard_lock = threading.Lock()
+        self._leaderboards = {}
+        self._pool = connection_pool.ConnectionPool(
+            self._connect,
+            min_size=self._config.getint('options', 'pool_min_size'),
+            max_size=self._config.getint('options', 'pool_max_size'),
+            timeout=self._config.getfloat('options', 'pool_timeout'))
+        self._rating_worker = rating_queue.RatingWorker(
+            self._apply_queued_ratings,
+            self._config.getfloat('options', 'rating_queue_poll_interval'),
+            self._logger)
+        self._check_schema()
+
+    @property
+    def _db_conn(self):
+        """Connection checked out by the current thread
+
+        A connection is borrowed from the pool on first use and kept until
+        release_connection is called, typically at the end of a request.
 
         """
 
-        if len(first_name) is 0:
-            self._logger.error("First name must be at least one character")
-            raise exceptions.DBValueError("First name must be at least one character")
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._pool.acquire()
+            self._local.connection = connection
+        return connection
 
-        if len(last_name) is 0:
-            self._logger.error("Last name must be at least one character")
-            raise exceptions.DBValueError("Last name must be at least one character")
+    def release_connection(self):
+        """Method to return the current thread's connection to the pool"""
 
-        try:
-            if not self.check_if_player_exists(first_name=first_name, last_name=last_name,
-                                               nickname=nickname):
-                raise exceptions.DBValueError("Name already exists in database")
+        self._forget_data_versions()
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            self._local.connection = None
+            self._pool.release(connection)
 
-            fb_offense_rating_id = self.create_new_default_rating()
-            fb_defense_rating_id = self.create_new_default_rating()
-            mk_ind_rating_id = self.create_new_default_rating()
-            mp_ind_rating_id = self.create_new_default_rating()
-            ss_ind_rating_id = self.create_new_default_rating()
-            pp_ind_rating_id = self.create_new_default_rating()
+    def start_rating_worker(self):
+        """Method to start applying queued rating updates in the background
 
-            self.check_if_db_connected()
-            cursor = self._db_conn.cursor()
-            self._logger.info("Adding new player to database")
-            cursor.execute("INSERT INTO player (first_name, last_name, \
-nickname, fb_offense_rating, fb_defense_rating, mk_ind_rating, mp_ind_rating, \
-ss_ind_rating, pp_ind_rating) VALUES ('{0}', '{1}', '{2}', \
-{3}, {4}, {5}, {6}, {7}, {8})".format(first_name, last_name, nickname, fb_offense_rating_id,
-                                      fb_defense_rating_id, mk_ind_rating_id, mp_ind_rating_id,
-                                      ss_ind_rating_id, pp_ind_rating_id))
-            player_id = cursor.lastrowid
-            cursor.execute("INSERT INTO pp_ind_rating_hist (rating, player) VALUES ({0}, {1}\
-)".format(pp_ind_rating_id, player_id))
-            cursor.execute("INSERT INTO ss_ind_rating_hist (rating, player) VALUES ({0}, {1}\
-)".format(ss_ind_rating_id, player_id))
-            cursor.execute("INSERT INTO mp_ind_rating_hist (rating, player) VALUES ({0}, {1}\
-)".format(mp_ind_rating_id, player_id))
-            cursor.execute("INSERT INTO mk_ind_rating_hist (rating, player) VALUES ({0}, {1}\
-)".format(mk_ind_rating_id, player_id))
-            cursor.execute("INSERT INTO fb_defense_rating_hist (rating, player) VALUES ({0}, {1}\
-)".format(fb_defense_rating_id, player_id))
-            cursor.execute("INSERT INTO fb_offense_rating_hist (rating, player) VALUES ({0}, {1}\
-)".format(fb_offense_rating_id, player_id))
-            self._db_conn.commit()
+        Until it is started, queued updates are only applied by
+        apply_rating_jobs and by the replays that cover them.
 
-        except MySQLdb.OperationalError:
-            self._logger.error("MySQL operational error occured")
-            traceback.print_exc()
-            raise exceptions.DBConnectionError("Cannot connect to MySQL server")
+        """
 
-        except MySQLdb.ProgrammingError:
-            self._logger.error("MySQL programming error")
-            traceback.print_exc()
-            raise exceptions.DBSyntaxError("MySQL syntax error")
+        self._rating_worker.start()
 
-        else:
-            pass
+    def apply_rating_jobs(self, game=None):
+        """Method to apply queued rating updates in submission order
 
-    def check_if_team_exists(self, team_name):
-        """Method to check if team currently exists in database
+        Each update is applied and removed from the queue in one
+        transaction. The next job of a game is read with a locking read, so
+        concurrent workers take turns and a job still being submitted is
+        waited for rather than overtaken.
 
         Args:
-            team_name (str):    team name
+            game (str):     game to apply, all games by default
 
         Returns:
-            True/False if team exists
+            number of rating updates applied
 
         Raises:
             DBConnectionError:  database connection issues
@@ -724,16 +351,27 @@ ss_ind_rating, pp_ind_rating) VALUES ('{0}', '{1}', '{2}', \
 
         """
 
+        applied = 0
         try:
-            self._logger.debug("Checking if team already exists")
             self.check_if_db_connected()
-            cursor = self._db_conn.cursor()
-            cursor.execute("SELECT team_name FROM team")
-            teams = cursor.fetchall()
-
-            for existing_team in teams:
-                if team_name == existing_team[0]:
-                    return True
+            for job_game in [game] if game else RATING_JOB_GAMES:
+                while True:
+                    cursor = self._db_conn.cursor()
+                    statements.execute(cursor, 'next_rating_job', (job_game,))
+                    job = cursor.fetchone()
+                    if job is None:
+                        self._db_conn.commit()
+                        break
+
+                    job_id, result_id = job
+                    self._logger.debug("Applying %s ratings of result %s", job_game, result_id)
+                    if not self._rate_result(cursor, job_game, result_id):
+                        self._logger.warning("Dropping rating job of missing %s result %s",
+                                             job_game, result_id)
+                    statements.execute(cursor, 'delete_rating_job', (job_id,))
+                    self._bump_data_versions(cursor, job_game)
+                    self._db_conn.commit()
+                    applied += 1
 
         except MySQLdb.OperationalError:
             self._logger.error("MySQL operational error occured")
@@ -746,17 +384,16 @@ ss_ind_rating, pp_ind_rating) VALUES ('{0}', '{1}', '{2}', \
             raise exceptions.DBSyntaxError("MySQL syntax error")
 
         else:
-            return False
+            return applied
 
-    def check_if_two_players_on_team(self, member_one, member_two):
-        """Method to check if two players are already on a team
+    def get_pending_ratings(self, game):
+        """Method to count the results of a game waiting for their ratings
 
         Args:
-            player_one (tup):    player one
-            player_two (tup):    player two
+            game (str):     game of the results
 
         Returns:
-            Team if exists
+            number of queued rating updates
 
         Raises:
             DBConnectionError:  database connection issues
@@ -765,32 +402,10 @@ ss_ind_rating, pp_ind_rating) VALUES ('{0}', '{1}', '{2}', \
         """
 
         try:
-            self._logger.debug("Checking if players are already on team together")
             self.check_if_db_connected()
             cursor = self._db_conn.cursor()
-
-            cursor.execute("SELECT player_id FROM player WHERE \
-first_name = '{0}' AND last_name = '{1}' AND nickname = '{2}'".format(
-                member_one[0], member_one[1], member_one[2]))
-            player_one_id = cursor.fetchone()[0]
-
-            cursor.execute("SELECT player_id FROM player WHERE \
-first_name = '{0}' AND last_name = '{1}' AND nickname = '{2}'".format(
-                member_two[0], member_two[1], member_two[2]))
-            player_two_id = cursor.fetchone()[0]
-
-            cursor.execute("SELECT team FROM player_team_xref WHERE \
-player = {0}".format(player_one_id))
-            teams = cursor.fetchall()
-
-            #TODO will give false positive if members are on a team of three
-            for team in teams:
-                cursor.execute("SELECT player FROM player_team_xref WHERE \
-team = {0}".format(team[0]))
-                players = cursor.fetchall()
-                for player in players:
-                    if player[0] == player_two_id:
-                        return team[0]
+            statements.execute(cursor, 'rating_job_count', (game,))
+            pending = cursor.fetchone()[0]
 
         except MySQLdb.OperationalError:
             self._logger.error("MySQL operational error occured")
@@ -803,18 +418,17 @@ team = {0}".format(team[0]))
             raise exceptions.DBSyntaxError("MySQL syntax error")
 
         else:
-            return False
+            return pending
 
-    def check_if_player_exists(self, first_name, last_name, nickname):
-        """Method to check if player currently exists in database
+    def get_data_versions(self):
+        """Method to get the data version of every game
 
-        Args:
-            first_name (str):   player first name
-            last_name(str):     player last name
-            nickname (str):     player nickname
+        The versions are read once per connection checkout and kept until
+        the connection is released or the thread writes, so everything
+        rendered for a request is validated against the same versions.
 
         Returns:
-            True/False if player exists
+            dict of game to (version, last modified UTC datetime)
 
         Raises:
             DBConnectionError:  database connection issues
@@ -822,17 +436,14 @@ team = {0}".format(team[0]))
 
         """
 
+        versions = getattr(self._local, 'data_versions', None)
+        if versions is not None:
+            return versions
+
         try:
-            self._logger.debug("Checking if player already exists")
             self.check_if_db_connected()
             cursor = self._db_conn.cursor()
-            cursor.execute("SELECT first_name, last_name, nickname FROM player")
-            players = cursor.fetchall()
-
-            for existing_first_name, existing_last_name, existing_nickname in players:
-                if (first_name == existing_first_name) and (last_name ==
-                    existing_last_name) and (nickname == existing_nickname):
-                    return False
+            versions = data_versions.read(cursor)
 
         except MySQLdb.OperationalError:
             self._logger.error("MySQL operational error occured")
@@ -845,30 +456,14 @@ team = {0}".format(team[0]))
             raise exceptions.DBSyntaxError("MySQL syntax error")
 
         else:
-            return True
-
-    def check_if_db_connected(self):
-        """Method to check if still connected to database"""
-
-        self._logger.debug("Checking if database is still connected")
-        try:
-            cursor = self._db_conn.cursor()
-            cursor.execute("SELECT * FROM player")
-
-        except MySQLdb.OperationalError:
-            self._logger.info("Database connection dropped, reconnecting...")
-            traceback.print_exc()
-            self._db_conn = MySQLdb.connect(user=self._db_user, passwd=self._db_pass,
-                                            host=self._db_host, db=self._db_name)
-
-        else:
-            pass
+            self._local.data_versions = versions
+            return versions
 
-    def create_new_default_rating(self):
-        """Creates a new rating at the default level
+    def get_schema_version(self):
+        """Method to get the schema version of the database
 
         Returns:
-            rating_id for rating just created
+            latest migration version applied, 0 for an unversioned database
 
         Raises:
             DBConnectionError:  database connection issues
@@ -877,13 +472,8 @@ team = {0}".format(team[0]))
         """
 
         try:
-            self._logger.debug("Creating new default rating")
-            new_rating = trueskill.Rating()
             self.check_if_db_connected()
-            cursor = self._db_conn.cursor()
-            cursor.execute("INSERT INTO rating (mu, sigma) VALUES ({0}, {1})".format(
-                new_rating.mu, new_rating.sigma))
-            rating_id = cursor.lastrowid
+            version = migrations.get_schema_version(self._db_conn)
 
         except MySQLdb.OperationalError:
             self._logger.error("MySQL operational error occured")
@@ -896,28 +486,33 @@ team = {0}".format(team[0]))
             raise exceptions.DBSyntaxError("MySQL syntax error")
 
         else:
-            return rating_id
+            return version
 
-    def get_all_players(self):
-        """Method to get all players from database
+    def migrate(self):
+        """Method to apply all pending schema migrations
 
         Returns:
-            tuple of player tuples
+            list of migration versions applied
 
         Raises:
+            DBValueError:       existing rows conflict with a migration
             DBConnectionError:  database connection issues
             DBSyntaxError:      invalid database programming statement
 
         """
 
-        self._logger.debug("Getting player list")
+        self._logger.info("Migrating database schema")
 
         try:
             self.check_if_db_connected()
-            cursor = self._db_conn.cursor()
-            cursor.execute("SELECT first_name, last_name, nickname, time FROM player \
-    ORDER BY time DESC")
-            players = cursor.fetchall()
+            applied = migrations.apply_migrations(self._db_conn, self._logger)
+
+        except MySQLdb.IntegrityError as error:
+            # e.g. a unique index over rows that are not unique, the message
+            # names the duplicate entry
+            self._logger.error("Migration conflicts with existing rows: %s", error.args[-1])
+            raise exceptions.DBValueError("Migration conflicts with existing rows: {0}".format(
+                error.args[-1]))
 
         except MySQLdb.OperationalError:
             self._logger.error("MySQL operational error occured")
@@ -930,13 +525,25 @@ team = {0}".format(team[0]))
             raise exceptions.DBSyntaxError("MySQL syntax error")
 
         else:
-            return players
+            if applied:
+                self._forget_data_versions()
+            self._logger.info("Database schema at version %d", self.get_schema_version())
+            return applied
 
-    def get_total_players(self):
-        """Method to get player count from database
+    def replay_ratings(self, games=None):
+        """Method to rebuild ratings by replaying the result history
+
+        Each game is replayed in memory from default ratings and its
+        ratings, rating history and standings are rewritten in one
+        transaction. Queued rating updates of the game are dropped, as the
+        replay rates their results. Writes to a game should be paused while
+        it replays.
+
+        Args:
+            games (list):   games to replay, all rated games by default
 
         Returns:
-            count of players
+            dict of game to number of results replayed
 
         Raises:
             DBConnectionError:  database connection issues
@@ -944,12 +551,18 @@ team = {0}".format(team[0]))
 
         """
 
-        self._logger.debug("Getting total player count")
+        replayed = {}
+        batch_size = self._config.getint('options', 'replay_batch_size')
+
         try:
             self.check_if_db_connected()
-            cursor = self._db_conn.cursor()
-            cursor.execute("SELECT COUNT(player_id) FROM player")
-            count = cursor.fetchone()[0]
+            for game in games or sorted(rating_replay.REPLAY_GAMES):
+                self._logger.info("Replaying %s ratings", game)
+                replay = rating_replay.RatingReplay(self._db_conn, game, self._logger,
+                                                    batch_size)
+                replayed[game] = replay.run()
+                self._db_conn.commit()
+                self._forget_data_versions()
 
         except MySQLdb.OperationalError:
             self._logger.error("MySQL operational error occured")
@@ -962,85 +575,52 @@ team = {0}".format(team[0]))
             raise exceptions.DBSyntaxError("MySQL syntax error")
 
         else:
-            return count
+            return replayed
 
-    def add_ppresult(self, winner, loser):
-        """Method to add a ping pong result to database
+    def import_results(self, game, stream, file_format):
+        """Method to import results in bulk and rebuild the game's ratings
+
+        The file is parsed as it streams in, rows are committed in batches
+        of import_batch_size, then the game is replayed so ratings follow
+        the imported times. Queued rating updates of the game are dropped
+        by the replay, which rates their results. Missing fb teams are
+        created as add_fbresult would. See result_import.IMPORT_FIELDS for
+        the expected fields.
 
         Args:
-            winner(tup):    match winner
-            loser (tup):    match loser
+            game (str):         game of the results, 'pp', 'fb', 'mk' or 'ss'
+            stream (obj):       file object to read
+            file_format (str):  'csv' or 'jsonl'
+
+        Returns:
+            number of results imported
 
         Raises:
-            DBValueError:       invalid db entry
+            DBValueError:       invalid row, earlier batches stay imported
             DBConnectionError:  database connection issues
             DBSyntaxError:      invalid database programming statement
 
         """
 
-        if len(winner) != 3:
-            raise exceptions.DBValueError("Winner must be complete")
-
-        if len(winner) != 3:
-            raise exceptions.DBValueError("Winner must be complete")
+        if game not in result_import.IMPORT_FIELDS:
+            raise exceptions.DBValueError("Unknown game")
 
-        if winner == loser:
-            raise exceptions.DBValueError("Winner and loser cannot be same person")
+        if file_format not in result_import.FORMATS:
+            raise exceptions.DBValueError("Unknown import format")
 
-        self._logger.debug("Adding pp result to database")
+        self._logger.info("Importing %s results", game)
         try:
             self.check_if_db_connected()
-            cursor = self._db_conn.cursor()
-            cursor.execute("INSERT INTO pp_result (pp_winner, pp_loser) VALUES ((SELECT \
-player_id FROM player WHERE first_name = '{0}' AND last_name \
-= '{1}' AND nickname = '{2}'), (SELECT player_id FROM player WHERE first_name \
-= '{3}' AND last_name = '{4}' AND nickname = '{5}'))".format(
-    winner[0], winner[1], winner[2], loser[0],
-    loser[1], loser[2]))
-
-            self._logger.debug("Updating pp ratings")
-            cursor.execute("SELECT player_id, pp_ind_rating FROM player \
-WHERE first_name = '{0}' AND last_name = '{1}' AND nickname = '{2}'".format(
-                winner[0], winner[1], winner[2]))
-            winner_player_id, rating = cursor.fetchall()[0]
-
-            cursor.execute("SELECT mu, sigma FROM rating WHERE rating_id \
-= {0}".format(rating))
-            mu, sigma = cursor.fetchall()[0]
-            winner_rating = trueskill.Rating(mu=float(mu),
-                                             sigma=float(sigma))
-
-            cursor.execute("SELECT player_id, pp_ind_rating FROM player \
-WHERE first_name = '{0}' AND last_name = '{1}' AND nickname = '{2}'".format(
-                loser[0], loser[1], loser[2]))
-            loser_player_id, rating = cursor.fetchall()[0]
-
-            cursor.execute("SELECT mu, sigma FROM rating WHERE rating_id \
-= {0}".format(rating))
-            mu, sigma = cursor.fetchall()[0]
-            loser_rating = trueskill.Rating(mu=float(mu),
-                                            sigma=float(sigma))
-
-            new_winner_rating, new_loser_rating = \
-            trueskill.rate_1vs1(winner_rating, loser_rating)
-
-            cursor.execute("INSERT INTO rating (mu, sigma) VALUES ({0}, {1}\
-)".format(new_winner_rating.mu, new_winner_rating.sigma))
-            new_rating_id = cursor.lastrowid
-            cursor.execute("UPDATE player set pp_ind_rating = {0} where \
-player_id = {1}".format(new_rating_id, winner_player_id))
-            cursor.execute("INSERT INTO pp_ind_rating_hist (rating, player) VALUES ({0}, {1}\
-)".format(new_rating_id, winner_player_id))
-
-            cursor.execute("INSERT INTO rating (mu, sigma) VALUES ({0}, {1}\
-)".format(new_loser_rating.mu, new_loser_rating.sigma))
-            new_rating_id = cursor.lastrowid
-            cursor.execute("UPDATE player set pp_ind_rating = {0} where \
-player_id = {1}".format(new_rating_id, loser_player_id))
-            cursor.execute("INSERT INTO pp_ind_rating_hist (rating, player) VALUES ({0}, {1}\
-)".format(new_rating_id, loser_player_id))
-
-            self._db_conn.commit()
+            importer = result_import.ResultImport(
+                self._db_conn, game, self._logger,
+                self._config.getint('options', 'import_batch_size'),
+                create_team=lambda member_one, member_two: self.add_fb_team(
+                    team_name="{0} & {1}".format(member_one[0], member_two[0]),
+                    member_one=member_one, member_two=member_two))
+            try:
+                imported = importer.run(result_import.read_rows(stream, file_format))
+            finally:
+                self._forget_data_versions()
 
         except MySQLdb.OperationalError:
             self._logger.error("MySQL operational error occured")
@@ -1053,213 +633,103 @@ player_id = {1}".format(new_rating_id, loser_player_id))
             raise exceptions.DBSyntaxError("MySQL syntax error")
 
         else:
-            pass
+            return imported
 
-    def add_fbresult(self, offense_winner, defense_winner, offense_loser,
-        defense_loser):
-        """Method to add a foosball result to database
+    def export(self, dataset, file_format):
+        """Method to stream a dataset as CSV, JSON lines or columnar chunks
+
+        Rows come from a server side cursor export_chunk_rows at a time, so
+        memory use stays flat. The connection is busy until the returned
+        generator is exhausted or closed.
 
         Args:
-            offense_winner(tup):    offense_winner
-            defense_winner (tup):   defense_winner
-            offense_loser (tup):    offense_loser
-            defense_loser (tup):    defense_loser
+            dataset (str):      players, teams, <game>_results or a rating
+                                history table, see result_export.DATASETS
+            file_format (str):  'csv', 'jsonl' or 'columnar'
+
+        Returns:
+            generator of byte strings making up the file
 
         Raises:
-            DBValueError:       invalid db entry
+            DBValueError:       unknown dataset or format
             DBConnectionError:  database connection issues
             DBSyntaxError:      invalid database programming statement
 
         """
 
-        if len(offense_winner) != 3:
-            raise exceptions.DBValueError("Offense winner must\
- be complete")
+        if dataset not in result_export.DATASETS:
+            raise exceptions.DBValueError("Unknown export dataset")
 
-        if len(defense_winner) != 3:
-            raise exceptions.DBValueError("Defense winner must\
- be complete")
+        if file_format not in result_export.FORMATS:
+            raise exceptions.DBValueError("Unknown export format")
 
-        if len(offense_loser) != 3:
-            raise exceptions.DBValueError("Offense loser must\
- be complete")
+        self._logger.debug("Exporting %s as %s", dataset, file_format)
+        return self._iter_export(dataset, file_format)
 
-        if len(defense_loser) != 3:
-            raise exceptions.DBValueError("Defense loser must\
- be complete")
+    def add_player(self, first_name, last_name, nickname):
+        """Example method description.
 
-        if offense_winner == defense_winner or offense_winner == offense_loser or offense_winner == defense_loser:
-            raise exceptions.DBValueError("Duplicate players in result")
+        Args:
+            first_name (str):   players first name
+            last_name (str):    players last name
+            nickname (str):     player's nickname
 
-        if defense_winner == offense_loser or defense_winner == defense_loser:
-            raise exceptions.DBValueError("Duplicate players in result")
+        Raises:
+            DBValueError:       invalid db entry
+            DBConnectionError:  database connection issues
+            DBSyntaxError:      invalid database programming statement
 
-        if offense_loser == defense_loser:
-            raise exceptions.DBValueError("Duplicate players in result")
+        Returns:
+            self.attr1
 
-        self._logger.debug("Adding fb result to database")
-        try:
-            self.check_if_db_connected()
-            cursor = self._db_conn.cursor()
-            cursor.execute("INSERT INTO fb_result (offense_winner, \
-defense_winner, offense_loser, defense_loser) VALUES ((SELECT \
-player_id FROM player WHERE first_name = '{0}' AND last_name \
-= '{1}' AND nickname = '{2}'), (SELECT player_id FROM player WHERE first_name \
-= '{3}' AND last_name = '{4}' AND nickname = '{5}'), (SELECT player_id FROM \
-player WHERE first_name = '{6}' AND last_name = '{7}' AND nickname = '{8}'), \
-(SELECT player_id FROM player WHERE first_name = '{9}' AND last_name = '{10}' \
-AND nickname = '{11}'))".format(offense_winner[0],
-                offense_winner[1], offense_winner[2], defense_winner[0],
-                defense_winner[1], defense_winner[2], offense_loser[0],
-                offense_loser[1], offense_loser[2], defense_loser[0],
-                defense_loser[1], defense_loser[2]))
-
-            self._logger.debug("Updating fb ratings")
-            cursor.execute("SELECT player_id, fb_offense_rating FROM player \
-WHERE first_name = '{0}' AND last_name = '{1}' AND nickname = '{2}'".format(
-                offense_winner[0], offense_winner[1], offense_winner[2]))
-            offense_winner_player_id, rating = cursor.fetchall()[0]
-
-            cursor.execute("SELECT mu, sigma FROM rating WHERE rating_id \
-= {0}".format(rating))
-            mu, sigma = cursor.fetchall()[0]
-            offense_winner_rating = trueskill.Rating(mu=float(mu),
-                sigma=float(sigma))
-
-            cursor.execute("SELECT player_id, fb_defense_rating FROM player \
-WHERE first_name = '{0}' AND last_name = '{1}' AND nickname = '{2}'".format(
-                defense_winner[0], defense_winner[1], defense_winner[2]))
-            defense_winner_player_id, rating = cursor.fetchall()[0]
-
-            cursor.execute("SELECT mu, sigma FROM rating WHERE rating_id \
-= {0}".format(rating))
-            mu, sigma = cursor.fetchall()[0]
-            defense_winner_rating = trueskill.Rating(mu=float(mu),
-                sigma=float(sigma))
-
-            cursor.execute("SELECT player_id, fb_offense_rating FROM player \
-WHERE first_name = '{0}' AND last_name = '{1}' AND nickname = '{2}'".format(
-                offense_loser[0], offense_loser[1], offense_loser[2]))
-            offense_loser_player_id, rating = cursor.fetchall()[0]
-
-            cursor.execute("SELECT mu, sigma FROM rating WHERE rating_id \
-= {0}".format(rating))
-            mu, sigma = cursor.fetchall()[0]
-            offense_loser_rating = trueskill.Rating(mu=float(mu),
-                sigma=float(sigma))
-
-            cursor.execute("SELECT player_id, fb_defense_rating FROM player \
-WHERE first_name = '{0}' AND last_name = '{1}' AND nickname = '{2}'".format(
-                defense_loser[0], defense_loser[1], defense_loser[2]))
-            defense_loser_player_id, rating = cursor.fetchall()[0]
-
-            cursor.execute("SELECT mu, sigma FROM rating WHERE rating_id \
-= {0}".format(rating))
-            mu, sigma = cursor.fetchall()[0]
-            defense_loser_rating = trueskill.Rating(mu=float(mu),
-                sigma=float(sigma))
-
-            (new_offense_winner_rating, new_defense_winner_rating), \
-            (new_offense_loser_rating, new_defense_loser_rating) = \
-            trueskill.rate([(offense_winner_rating, defense_winner_rating),
-                (offense_loser_rating, defense_loser_rating)], ranks=[0, 1])
-
-            cursor.execute("INSERT INTO rating (mu, sigma) VALUES ({0}, {1}\
-)".format(new_offense_winner_rating.mu, new_offense_winner_rating.sigma))
-            new_rating_id = cursor.lastrowid
-            cursor.execute("UPDATE player set fb_offense_rating = {0} where \
-player_id = {1}".format(new_rating_id, offense_winner_player_id))
-            cursor.execute("INSERT INTO fb_offense_rating_hist (rating, player) VALUES ({0}, {1}\
-)".format(new_rating_id, offense_winner_player_id))
-
-            cursor.execute("INSERT INTO rating (mu, sigma) VALUES ({0}, {1}\
-)".format(new_defense_winner_rating.mu, new_defense_winner_rating.sigma))
-            new_rating_id = cursor.lastrowid
-            cursor.execute("UPDATE player set fb_defense_rating = {0} where \
-player_id = {1}".format(new_rating_id, defense_winner_player_id))
-            cursor.execute("INSERT INTO fb_defense_rating_hist (rating, player) VALUES ({0}, {1}\
-)".format(new_rating_id, defense_winner_player_id))
-
-            cursor.execute("INSERT INTO rating (mu, sigma) VALUES ({0}, {1}\
-)".format(new_offense_loser_rating.mu, new_offense_loser_rating.sigma))
-            new_rating_id = cursor.lastrowid
-            cursor.execute("UPDATE player set fb_offense_rating = {0} where \
-player_id = {1}".format(new_rating_id, offense_loser_player_id))
-            cursor.execute("INSERT INTO fb_offense_rating_hist (rating, player) VALUES ({0}, {1}\
-)".format(new_rating_id, offense_loser_player_id))
-
-            cursor.execute("INSERT INTO rating (mu, sigma) VALUES ({0}, {1}\
-)".format(new_defense_loser_rating.mu, new_defense_loser_rating.sigma))
-            new_rating_id = cursor.lastrowid
-            cursor.execute("UPDATE player set fb_defense_rating = {0} where \
-player_id = {1}".format(new_rating_id, defense_loser_player_id))
-            cursor.execute("INSERT INTO fb_defense_rating_hist (rating, player) VALUES ({0}, {1}\
-)".format(new_rating_id, defense_loser_player_id))
-
-            self._logger.debug("Update foosball team ratings")
-            # check if winners are on a team together
-            winning_team = self.check_if_two_players_on_team(
-                offense_winner, defense_winner)
+        """
 
-            if not winning_team:
-                # create a new team
-                winning_team = self.add_fb_team(team_name="{0} & {1}\
-".format(offense_winner[0], defense_winner[0]), member_one=offense_winner,
-                    member_two=defense_winner)
+        if len(first_name) is 0:
+            self._logger.error("First name must be at least one character")
+            raise exceptions.DBValueError("First name must be at least one character")
 
-            # check if losers are on a team together
-            losing_team = self.check_if_two_players_on_team(
-                offense_loser, defense_loser)
+        if len(last_name) is 0:
+            self._logger.error("Last name must be at least one character")
+            raise exceptions.DBValueError("Last name must be at least one character")
 
-            if not losing_team:
-                # create a new team
-                losing_team = self.add_fb_team(team_name="{0} & {1}\
-".format(offense_loser[0], defense_loser[0]), member_one=offense_loser,
-                    member_two=defense_loser)
-                # avoid timestamp issues in database
-                time.sleep(1)
-
-            # get ratings
-            cursor.execute("SELECT fb_team_rating from team WHERE team_id \
-= {0}".format(winning_team))
-            winning_team_rating_id = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT fb_team_rating from team WHERE team_id \
-= {0}".format(losing_team))
-            losing_team_rating_id = cursor.fetchone()[0]
-
-            cursor.execute("SELECT mu, sigma FROM rating WHERE rating_id \
-= {0}".format(winning_team_rating_id))
-            mu, sigma = cursor.fetchall()[0]
-            winning_team_rating = trueskill.Rating(mu=float(mu),
-                sigma=float(sigma))
-
-            cursor.execute("SELECT mu, sigma FROM rating WHERE rating_id \
-= {0}".format(losing_team_rating_id))
-            mu, sigma = cursor.fetchall()[0]
-            losing_team_rating = trueskill.Rating(mu=float(mu),
-                sigma=float(sigma))
-
-            new_winning_team_rating, new_losing_team_rating = \
-            trueskill.rate_1vs1(winning_team_rating, losing_team_rating)
-
-            cursor.execute("INSERT INTO rating (mu, sigma) VALUES ({0}, {1}\
-)".format(new_winning_team_rating.mu, new_winning_team_rating.sigma))
-            new_rating_id = cursor.lastrowid
-            cursor.execute("UPDATE team SET fb_team_rating = {0} where \
-team_id = {1}".format(new_rating_id, winning_team))
-            cursor.execute("INSERT INTO fb_team_rating_hist (rating, team) VALUES ({0}, {1}\
-)".format(new_rating_id, winning_team))
-
-            cursor.execute("INSERT INTO rating (mu, sigma) VALUES ({0}, {1}\
-)".format(new_losing_team_rating.mu, new_losing_team_rating.sigma))
-            new_rating_id = cursor.lastrowid
-            cursor.execute("UPDATE team SET fb_team_rating = {0} where \
-team_id = {1}".format(new_rating_id, losing_team))
-            cursor.execute("INSERT INTO fb_team_rating_hist (rating, team) VALUES ({0}, {1}\
-)".format(new_rating_id, losing_team))
+        try:
+            if not self.check_if_player_exists(first_name=first_name, last_name=last_name,
+                                               nickname=nickname):
+                raise exceptions.DBValueError("Name already exists in database")
+
+            fb_offense_rating_id = self.create_new_default_rating()
+            fb_defense_rating_id = self.create_new_default_rating()
+            mk_ind_rating_id = self.create_new_default_rating()
+            mp_ind_rating_id = self.create_new_default_rating()
+            ss_ind_rating_id = self.create_new_default_rating()
+            pp_ind_rating_id = self.create_new_default_rating()
+
+            self.check_if_db_connected()
+            cursor = self._db_conn.cursor()
+            self._logger.info("Adding new player to database")
+            statements.execute(cursor, 'insert_player', (
+                first_name, last_name, nickname, fb_offense_rating_id, fb_defense_rating_id,
+                mk_ind_rating_id, mp_ind_rating_id, ss_ind_rating_id, pp_ind_rating_id))
+            player_id = cursor.lastrowid
+            statements.execute(cursor, 'insert_pp_ind_rating_hist', (pp_ind_rating_id, player_id))
+            statements.execute(cursor, 'insert_ss_ind_rating_hist', (ss_ind_rating_id, player_id))
+            statements.execute(cursor, 'insert_mp_ind_rating_hist', (mp_ind_rating_id, player_id))
+            statements.execute(cursor, 'insert_mk_ind_rating_hist', (mk_ind_rating_id, player_id))
+            statements.execute(cursor, 'insert_fb_defense_rating_hist',
+                               (fb_defense_rating_id, player_id))
+            statements.execute(cursor, 'insert_fb_offense_rating_hist',
+                               (fb_offense_rating_id, player_id))
+            for game in STANDING_RATING_COLUMNS:
+                self._refresh_standing(cursor, player_id, game)
+            self._bump_data_versions(cursor)
             self._db_conn.commit()
 
+        except MySQLdb.IntegrityError:
+            # a concurrent add_player took the name after the check above, the
+            # unique name index turned the race into this error
+            self._db_conn.rollback()
+            raise exceptions.DBValueError("Name already exists in database")
+
         except MySQLdb.OperationalError:
             self._logger.error("MySQL operational error occured")
             traceback.print_exc()
@@ -1273,31 +743,426 @@ team_id = {1}".format(new_rating_id, losing_team))
         else:
             pass
 
-    def add_mkresult(self, first, second, third,
-        fourth, course):
-        """Method to add a mk result to database
+    def check_if_team_exists(self, team_name):
+        """Method to check if team currently exists in database
 
         Args:
-            first (tup):    first place
-            second (tup):   second place
-            third (tup):    third place
-            fourth (tup):   fourth place
-            course (str):   course
+            team_name (str):    team name
+
+        Returns:
+            True/False if team exists
 
         Raises:
-            DBValueError:       invalid db entry
             DBConnectionError:  database connection issues
             DBSyntaxError:      invalid database programming statement
 
         """
 
-        if len(first) != 3:
-            raise exceptions.DBValueError("1st must\
- be complete")
+        try:
+            self._logger.debug("Checking if team already exists")
+            self.check_if_db_connected()
+            cursor = self._db_conn.cursor()
+            statements.execute(cursor, 'team_name_exists', (team_name,))
+            exists = cursor.fetchone()[0]
 
-        if len(second) != 3:
-            raise exceptions.DBValueError("2nd must\
- be complete")
+        except MySQLdb.OperationalError:
+            self._logger.error("MySQL operational error occured")
+            traceback.print_exc()
+            raise exceptions.DBConnectionError("Cannot connect to MySQL server")
+
+        except MySQLdb.ProgrammingError:
+            self._logger.error("MySQL programming error")
+            traceback.print_exc()
+            raise exceptions.DBSyntaxError("MySQL syntax error")
+
+        else:
+            return bool(exists)
+
+    def check_if_two_players_on_team(self, member_one, member_two):
+        """Method to check if two players are already on a team
+
+        Args:
+            member_one (int):   player one player_id, or name tuple
+            member_two (int):   player two player_id, or name tuple
+
+        Returns:
+            Team if exists
+
+        Raises:
+            DBValueError:       player not found
+            DBConnectionError:  database connection issues
+            DBSyntaxError:      invalid database programming statement
+
+        """
+
+        try:
+            self._logger.debug("Checking if players are already on team together")
+            self.check_if_db_connected()
+            cursor = self._db_conn.cursor()
+
+            members = (member_one, member_two)
+            if not all(isinstance(member, (int, long)) for member in members):
+                members = self._get_player_ids(cursor, members)
+
+            statements.execute(cursor, 'team_of_pair', (min(members), max(members)))
+            team = cursor.fetchone()
+            if team is not None:
+                return team[0]
+
+        except MySQLdb.OperationalError:
+            self._logger.error("MySQL operational error occured")
+            traceback.print_exc()
+            raise exceptions.DBConnectionError("Cannot connect to MySQL server")
+
+        except MySQLdb.ProgrammingError:
+            self._logger.error("MySQL programming error")
+            traceback.print_exc()
+            raise exceptions.DBSyntaxError("MySQL syntax error")
+
+        else:
+            return False
+
+    def check_if_player_exists(self, first_name, last_name, nickname):
+        """Method to check if player currently exists in database
+
+        Args:
+            first_name (str):   player first name
+            last_name(str):     player last name
+            nickname (str):     player nickname
+
+        Returns:
+            True if the name is free, False if a player already has it
+
+        Raises:
+            DBConnectionError:  database connection issues
+            DBSyntaxError:      invalid database programming statement
+
+        """
+
+        try:
+            self._logger.debug("Checking if player already exists")
+            self.check_if_db_connected()
+            cursor = self._db_conn.cursor()
+            statements.execute(cursor, 'player_name_exists', (first_name, last_name, nickname))
+            exists = cursor.fetchone()[0]
+
+        except MySQLdb.OperationalError:
+            self._logger.error("MySQL operational error occured")
+            traceback.print_exc()
+            raise exceptions.DBConnectionError("Cannot connect to MySQL server")
+
+        except MySQLdb.ProgrammingError:
+            self._logger.error("MySQL programming error")
+            traceback.print_exc()
+            raise exceptions.DBSyntaxError("MySQL syntax error")
+
+        else:
+            return not exists
+
+    def check_if_db_connected(self):
+        """Method to check if still connected to database
+
+        The check is a server ping, and is skipped entirely when the
+        connection completed a statement within the configured
+        db_verify_interval. A dead connection is dropped from the pool and
+        replaced with a fresh one. A statement that lost the connection
+        outside a transaction is retried on a fresh one by the cursor;
+        inside one it marks the connection unverified, so the next check
+        always pings it.
+
+        """
+
+        connection = self._db_conn
+        if time.time() - connection.last_verified < self._verify_interval:
+            return
+
+        self._logger.debug("Checking if database is still connected")
+        if not connection.is_alive():
+            self._replace_connection(connection)
+
+    def create_new_default_rating(self):
+        """Creates a new rating at the default level
+
+        Returns:
+            rating_id for rating just created
+
+        Raises:
+            DBConnectionError:  database connection issues
+            DBSyntaxError:      invalid database programming statement
+
+        """
+
+        try:
+            self._logger.debug("Creating new default rating")
+            new_rating = trueskill.Rating()
+            self.check_if_db_connected()
+            cursor = self._db_conn.cursor()
+            statements.execute(cursor, 'insert_rating', (new_rating.mu, new_rating.sigma))
+            rating_id = cursor.lastrowid
+
+        except MySQLdb.OperationalError:
+            self._logger.error("MySQL operational error occured")
+            traceback.print_exc()
+            raise exceptions.DBConnectionError("Cannot connect to MySQL server")
+
+        except MySQLdb.ProgrammingError:
+            self._logger.error("MySQL programming error")
+            traceback.print_exc()
+            raise exceptions.DBSyntaxError("MySQL syntax error")
+
+        else:
+            return rating_id
+
+    def get_all_players(self):
+        """Method to get all players from database
+
+        Returns:
+            tuple of (player_id, first_name, last_name, nickname, time) tuples
+
+        Raises:
+            DBConnectionError:  database connection issues
+            DBSyntaxError:      invalid database programming statement
+
+        """
+
+        self._logger.debug("Getting player list")
+
+        try:
+            self.check_if_db_connected()
+            cursor = self._db_conn.cursor()
+            cursor.execute("SELECT player_id, first_name, last_name, nickname, time FROM player \
+    ORDER BY time DESC")
+            players = cursor.fetchall()
+
+        except MySQLdb.OperationalError:
+            self._logger.error("MySQL operational error occured")
+            traceback.print_exc()
+            raise exceptions.DBConnectionError("Cannot connect to MySQL server")
+
+        except MySQLdb.ProgrammingError:
+            self._logger.error("MySQL programming error")
+            traceback.print_exc()
+            raise exceptions.DBSyntaxError("MySQL syntax error")
+
+        else:
+            return players
+
+    @_cached_leaderboard('player', 'total')
+    def get_total_players(self):
+        """Method to get player count from database
+
+        Returns:
+            count of players
+
+        Raises:
+            DBConnectionError:  database connection issues
+            DBSyntaxError:      invalid database programming statement
+
+        """
+
+        self._logger.debug("Getting total player count")
+        try:
+            self.check_if_db_connected()
+            cursor = self._db_conn.cursor()
+            cursor.execute("SELECT COUNT(player_id) FROM player")
+            count = cursor.fetchone()[0]
+
+        except MySQLdb.OperationalError:
+            self._logger.error("MySQL operational error occured")
+            traceback.print_exc()
+            raise exceptions.DBConnectionError("Cannot connect to MySQL server")
+
+        except MySQLdb.ProgrammingError:
+            self._logger.error("MySQL programming error")
+            traceback.print_exc()
+            raise exceptions.DBSyntaxError("MySQL syntax error")
+
+        else:
+            return count
+
+    def add_ppresult(self, winner, loser):
+        """Method to add a ping pong result to database
+
+        The result is stored and its rating update queued for the rating
+        worker, see apply_rating_jobs.
+
+        Args:
+            winner (int):   match winner player_id, or name tuple
+            loser (int):    match loser player_id, or name tuple
+
+        Raises:
+            DBValueError:       invalid db entry
+            DBConnectionError:  database connection issues
+            DBSyntaxError:      invalid database programming statement
+
+        """
+
+        if not _is_player(winner):
+            raise exceptions.DBValueError("Winner must be complete")
+
+        if not _is_player(loser):
+            raise exceptions.DBValueError("Loser must be complete")
+
+        if winner == loser:
+            raise exceptions.DBValueError("Winner and loser cannot be same person")
+
+        self._logger.debug("Adding pp result to database")
+        try:
+            self.check_if_db_connected()
+            cursor = self._db_conn.cursor()
+            winner_player_id, loser_player_id = self._get_player_ids(cursor, [winner, loser])
+            if winner_player_id == loser_player_id:
+                raise exceptions.DBValueError("Winner and loser cannot be same person")
+
+            statements.execute(cursor, 'insert_pp_result',
+                               (winner_player_id, loser_player_id))
+            self._queue_rating(cursor, 'pp', cursor.lastrowid)
+
+            self._bump_data_versions(cursor, 'pp')
+            self._db_conn.commit()
+            self._rating_worker.notify()
+
+        except MySQLdb.OperationalError:
+            self._logger.error("MySQL operational error occured")
+            traceback.print_exc()
+            raise exceptions.DBConnectionError("Cannot connect to MySQL server")
+
+        except MySQLdb.ProgrammingError:
+            self._logger.error("MySQL programming error")
+            traceback.print_exc()
+            raise exceptions.DBSyntaxError("MySQL syntax error")
+
+        else:
+            pass
+
+    def add_fbresult(self, offense_winner, defense_winner, offense_loser,
+        defense_loser):
+        """Method to add a foosball result to database
+
+        Missing teams are created right away. The result is stored and its
+        rating update queued for the rating worker, see apply_rating_jobs.
+
+        Args:
+            offense_winner (int):   offense_winner player_id, or name tuple
+            defense_winner (int):   defense_winner player_id, or name tuple
+            offense_loser (int):    offense_loser player_id, or name tuple
+            defense_loser (int):    defense_loser player_id, or name tuple
+
+        Raises:
+            DBValueError:       invalid db entry
+            DBConnectionError:  database connection issues
+            DBSyntaxError:      invalid database programming statement
+
+        """
+
+        if not _is_player(offense_winner):
+            raise exceptions.DBValueError("Offense winner must\
+ be complete")
+
+        if not _is_player(defense_winner):
+            raise exceptions.DBValueError("Defense winner must\
+ be complete")
+
+        if not _is_player(offense_loser):
+            raise exceptions.DBValueError("Offense loser must\
+ be complete")
+
+        if not _is_player(defense_loser):
+            raise exceptions.DBValueError("Defense loser must\
+ be complete")
+
+        if offense_winner == defense_winner or offense_winner == offense_loser or offense_winner == defense_loser:
+            raise exceptions.DBValueError("Duplicate players in result")
+
+        if defense_winner == offense_loser or defense_winner == defense_loser:
+            raise exceptions.DBValueError("Duplicate players in result")
+
+        if offense_loser == defense_loser:
+            raise exceptions.DBValueError("Duplicate players in result")
+
+        self._logger.debug("Adding fb result to database")
+        try:
+            self.check_if_db_connected()
+            cursor = self._db_conn.cursor()
+            offense_winner_player_id, defense_winner_player_id, offense_loser_player_id, \
+            defense_loser_player_id = self._get_player_ids(
+                cursor, [offense_winner, defense_winner, offense_loser, defense_loser])
+            if len(set((offense_winner_player_id, defense_winner_player_id,
+                        offense_loser_player_id, defense_loser_player_id))) != 4:
+                raise exceptions.DBValueError("Duplicate players in result")
+
+            # teams are created before queueing, as add_fb_team commits and
+            # the rating worker must apply an update in one transaction
+            # check if winners are on a team together
+            winning_team = self.check_if_two_players_on_team(
+                offense_winner_player_id, defense_winner_player_id)
+
+            if not winning_team:
+                # create a new team
+                winning_team = self.add_fb_team(team_name=None,
+                    member_one=offense_winner_player_id,
+                    member_two=defense_winner_player_id)
+
+            # check if losers are on a team together
+            losing_team = self.check_if_two_players_on_team(
+                offense_loser_player_id, defense_loser_player_id)
+
+            if not losing_team:
+                # create a new team
+                losing_team = self.add_fb_team(team_name=None,
+                    member_one=offense_loser_player_id,
+                    member_two=defense_loser_player_id)
+
+            statements.execute(cursor, 'insert_fb_result', (
+                offense_winner_player_id, defense_winner_player_id,
+                offense_loser_player_id, defense_loser_player_id))
+            self._queue_rating(cursor, 'fb', cursor.lastrowid)
+
+            self._bump_data_versions(cursor, 'fb')
+            self._db_conn.commit()
+            self._rating_worker.notify()
+
+        except MySQLdb.OperationalError:
+            self._logger.error("MySQL operational error occured")
+            traceback.print_exc()
+            raise exceptions.DBConnectionError("Cannot connect to MySQL server")
+
+        except MySQLdb.ProgrammingError:
+            self._logger.error("MySQL programming error")
+            traceback.print_exc()
+            raise exceptions.DBSyntaxError("MySQL syntax error")
+
+        else:
+            pass
+
+    def add_mkresult(self, first, second, third,
+        fourth, course):
+        """Method to add a mk result to database
+
+        The result is stored and its rating update queued for the rating
+        worker, see apply_rating_jobs.
+
+        Args:
+            first (int):    first place player_id, or name tuple
+            second (int):   second place player_id, or name tuple
+            third (int):    third place player_id, or name tuple
+            fourth (int):   fourth place player_id, or name tuple
+            course (str):   course
+
+        Raises:
+            DBValueError:       invalid db entry
+            DBConnectionError:  database connection issues
+            DBSyntaxError:      invalid database programming statement
+
+        """
+
+        if not _is_player(first):
+            raise exceptions.DBValueError("1st must\
+ be complete")
+
+        if not _is_player(second):
+            raise exceptions.DBValueError("2nd must\
+ be complete")
 
         if not third:
             if fourth:
@@ -1318,139 +1183,13 @@ team_id = {1}".format(new_rating_id, losing_team))
         try:
             self.check_if_db_connected()
             cursor = self._db_conn.cursor()
-
-            if not fourth:
-                if not third:
-                    cursor.execute("INSERT INTO mk_ind_result (mk_ind_first, \
-            mk_ind_second, mk_ind_third, mk_ind_fourth, course) VALUES ((SELECT \
-            player_id FROM player WHERE first_name = '{0}' AND last_name \
-            = '{1}' AND nickname = '{2}'), (SELECT player_id FROM player WHERE first_name \
-            = '{3}' AND last_name = '{4}' AND nickname = '{5}'), NULL, \
-            NULL, '{6}')".format(first[0],
-                            first[1], first[2], second[0],
-                            second[1], second[2], course))
-                else:
-                    cursor.execute("INSERT INTO mk_ind_result (mk_ind_first, \
-        mk_ind_second, mk_ind_third, mk_ind_fourth, course) VALUES ((SELECT \
-        player_id FROM player WHERE first_name = '{0}' AND last_name \
-        = '{1}' AND nickname = '{2}'), (SELECT player_id FROM player WHERE first_name \
-        = '{3}' AND last_name = '{4}' AND nickname = '{5}'), (SELECT player_id FROM \
-        player WHERE first_name = '{6}' AND last_name = '{7}' AND nickname = '{8}'), \
-        NULL, '{9}')".format(first[0],
-                        first[1], first[2], second[0],
-                        second[1], second[2], third[0],
-                        third[1], third[2], course))
-            else:
-                cursor.execute("INSERT INTO mk_ind_result (mk_ind_first, \
-    mk_ind_second, mk_ind_third, mk_ind_fourth, course) VALUES ((SELECT \
-    player_id FROM player WHERE first_name = '{0}' AND last_name \
-    = '{1}' AND nickname = '{2}'), (SELECT player_id FROM player WHERE first_name \
-    = '{3}' AND last_name = '{4}' AND nickname = '{5}'), (SELECT player_id FROM \
-    player WHERE first_name = '{6}' AND last_name = '{7}' AND nickname = '{8}'), \
-    (SELECT player_id FROM player WHERE first_name = '{9}' AND last_name = '{10}' \
-    AND nickname = '{11}'), '{12}')".format(first[0],
-                    first[1], first[2], second[0],
-                    second[1], second[2], third[0],
-                    third[1], third[2], fourth[0],
-                    fourth[1], fourth[2], course))
-
-            self._logger.debug("Updating mk ratings")
-            cursor.execute("SELECT player_id, mk_ind_rating FROM player \
-WHERE first_name = '{0}' AND last_name = '{1}' AND nickname = '{2}'".format(
-                first[0], first[1], first[2]))
-            first_player_id, rating = cursor.fetchall()[0]
-
-            cursor.execute("SELECT mu, sigma FROM rating WHERE rating_id \
-= {0}".format(rating))
-            mu, sigma = cursor.fetchall()[0]
-            first_rating = trueskill.Rating(mu=float(mu),
-                sigma=float(sigma))
-
-            cursor.execute("SELECT player_id, mk_ind_rating FROM player \
-WHERE first_name = '{0}' AND last_name = '{1}' AND nickname = '{2}'".format(
-                second[0], second[1], second[2]))
-            second_player_id, rating = cursor.fetchall()[0]
-
-            cursor.execute("SELECT mu, sigma FROM rating WHERE rating_id \
-= {0}".format(rating))
-            mu, sigma = cursor.fetchall()[0]
-            second_rating = trueskill.Rating(mu=float(mu),
-                sigma=float(sigma))
-
-            if third:
-                cursor.execute("SELECT player_id, mk_ind_rating FROM player \
-WHERE first_name = '{0}' AND last_name = '{1}' AND nickname = '{2}'".format(
-                    third[0], third[1], third[2]))
-                third_player_id, rating = cursor.fetchall()[0]
-
-                cursor.execute("SELECT mu, sigma FROM rating WHERE rating_id \
-= {0}".format(rating))
-                mu, sigma = cursor.fetchall()[0]
-                third_rating = trueskill.Rating(mu=float(mu),
-                    sigma=float(sigma))
-
-            if fourth:
-                cursor.execute("SELECT player_id, mk_ind_rating FROM player \
-WHERE first_name = '{0}' AND last_name = '{1}' AND nickname = '{2}'".format(
-                    fourth[0], fourth[1], fourth[2]))
-                fourth_player_id, rating = cursor.fetchall()[0]
-
-                cursor.execute("SELECT mu, sigma FROM rating WHERE rating_id \
-= {0}".format(rating))
-                mu, sigma = cursor.fetchall()[0]
-                fourth_rating = trueskill.Rating(mu=float(mu),
-                    sigma=float(sigma))
-
-            if not fourth:
-                if not third:
-                    (new_first_rating,), (new_second_rating,) = \
-                    trueskill.rate([(first_rating,), (second_rating,)], ranks=[0, 1])
-                else:
-                    (new_first_rating,), (new_second_rating,), \
-                    (new_third_rating,) = \
-                    trueskill.rate([(first_rating,), (second_rating,),
-                        (third_rating,)], ranks=[0, 1, 2])
-            else:
-                (new_first_rating,), (new_second_rating,), \
-                (new_third_rating,), (new_fourth_rating,) = \
-                trueskill.rate([(first_rating,), (second_rating,),
-                    (third_rating,), (fourth_rating,)], ranks=[0, 1, 2, 3])
-
-            cursor.execute("INSERT INTO rating (mu, sigma) VALUES ({0}, {1}\
-)".format(new_first_rating.mu, new_first_rating.sigma))
-            new_rating_id = cursor.lastrowid
-            cursor.execute("UPDATE player set mk_ind_rating = {0} where \
-player_id = {1}".format(new_rating_id, first_player_id))
-            cursor.execute("INSERT INTO mk_ind_rating_hist (rating, player) VALUES ({0}, {1}\
-)".format(new_rating_id, first_player_id))
-
-            cursor.execute("INSERT INTO rating (mu, sigma) VALUES ({0}, {1}\
-)".format(new_second_rating.mu, new_second_rating.sigma))
-            new_rating_id = cursor.lastrowid
-            cursor.execute("UPDATE player set mk_ind_rating = {0} where \
-player_id = {1}".format(new_rating_id, second_player_id))
-            cursor.execute("INSERT INTO mk_ind_rating_hist (rating, player) VALUES ({0}, {1}\
-)".format(new_rating_id, second_player_id))
-
-            if third:
-                cursor.execute("INSERT INTO rating (mu, sigma) VALUES ({0}, {1}\
-)".format(new_third_rating.mu, new_third_rating.sigma))
-                new_rating_id = cursor.lastrowid
-                cursor.execute("UPDATE player set mk_ind_rating = {0} where \
-player_id = {1}".format(new_rating_id, third_player_id))
-                cursor.execute("INSERT INTO mk_ind_rating_hist (rating, player) VALUES ({0}, {1}\
-)".format(new_rating_id, third_player_id))
-
-            if fourth:
-                cursor.execute("INSERT INTO rating (mu, sigma) VALUES ({0}, {1}\
-)".format(new_fourth_rating.mu, new_fourth_rating.sigma))
-                new_rating_id = cursor.lastrowid
-                cursor.execute("UPDATE player set mk_ind_rating = {0} where \
-player_id = {1}".format(new_rating_id, fourth_player_id))
-                cursor.execute("INSERT INTO mk_ind_rating_hist (rating, player) VALUES ({0}, {1}\
-)".format(new_rating_id, fourth_player_id))
-
+            players = [player for player in (first, second, third, fourth) if player]
+            result_values = {'course': course}
+            result_id = self._add_placement_result(cursor, 'mk', players, result_values)
+            self._queue_rating(cursor, 'mk', result_id)
+            self._bump_data_versions(cursor, 'mk')
             self._db_conn.commit()
+            self._rating_worker.notify()
 
         except MySQLdb.OperationalError:
             self._logger.error("MySQL operational error occured")
@@ -1470,22 +1209,25 @@ player_id = {1}".format(new_rating_id, fourth_player_id))
                 eighth, char_eighth):
         """Method to add a ss result to database
 
+        The result is stored and its rating update queued for the rating
+        worker, see apply_rating_jobs.
+
         Args:
-            first (tup):        first place
+            first (int):        first place player_id, or name tuple
             char_first (str):   first place character
-            second (tup):       second place
+            second (int):       second place player_id, or name tuple
             char_second (str):  second place character
-            third (tup):        third place
+            third (int):        third place player_id, or name tuple
             char_third (str):   third place character
-            fourth (tup):       fourth place
+            fourth (int):       fourth place player_id, or name tuple
             char_fourth (str):  fourth place character
-            fifth (tup):        fifth place
+            fifth (int):        fifth place player_id, or name tuple
             char_fifth (str):   fifth place character
-            sixth (tup):        sixth place
+            sixth (int):        sixth place player_id, or name tuple
             char_sixth (str):   sixth place character
-            seventh (tup):      seventh place
+            seventh (int):      seventh place player_id, or name tuple
             char_seventh (str): seventh place character
-            eighth (tup):       eighth place
+            eighth (int):       eighth place player_id, or name tuple
             char_eighth (str):  eighth place character
 
         Raises:
@@ -1495,11 +1237,11 @@ player_id = {1}".format(new_rating_id, fourth_player_id))
 
         """
 
-        if len(first) != 3:
+        if not _is_player(first):
             raise exceptions.DBValueError("1st must\
  be complete")
 
-        if len(second) != 3:
+        if not _is_player(second):
             raise exceptions.DBValueError("2nd must\
  be complete")
 
@@ -1575,351 +1317,338 @@ player_id = {1}".format(new_rating_id, fourth_player_id))
                     if third == fourth:
                         raise exceptions.DBValueError("Duplicate players in result")
 
-        if not char_first:
-            raise exceptions.DBValueError("Character required first place")
+        if not char_first:
+            raise exceptions.DBValueError("Character required first place")
+
+        if not char_second:
+            raise exceptions.DBValueError("Character required second place")
+
+        if third:
+            if not char_third:
+                raise exceptions.DBValueError("Character required third place")
+
+        if fourth:
+            if not char_fourth:
+                raise exceptions.DBValueError("Character required fourth place")
+
+        if fifth:
+            if not char_fifth:
+                raise exceptions.DBValueError("Character required fifth place")
+
+        if sixth:
+            if not char_sixth:
+                raise exceptions.DBValueError("Character required sixth place")
+
+        if seventh:
+            if not char_seventh:
+                raise exceptions.DBValueError("Character required seventh place")
+
+        if eighth:
+            if not char_eighth:
+                raise exceptions.DBValueError("Character required eighth place")
+
+        self._logger.debug("Adding ss result to database")
+        try:
+            self.check_if_db_connected()
+            cursor = self._db_conn.cursor()
+            players = [player for player in (first, second, third, fourth, fifth, sixth,
+                                             seventh, eighth) if player]
+            characters = (char_first, char_second, char_third, char_fourth, char_fifth,
+                          char_sixth, char_seventh, char_eighth)
+            result_values = dict(('ss_{0}_char'.format(place), character) for place, character
+                                 in zip(PLACES, characters[:len(players)]))
+            result_id = self._add_placement_result(cursor, 'ss', players, result_values)
+            self._queue_rating(cursor, 'ss', result_id)
+            self._bump_data_versions(cursor, 'ss')
+            self._db_conn.commit()
+            self._rating_worker.notify()
+
+        except MySQLdb.OperationalError:
+            self._logger.error("MySQL operational error occured")
+            traceback.print_exc()
+            raise exceptions.DBConnectionError("Cannot connect to MySQL server")
+
+        except MySQLdb.ProgrammingError:
+            self._logger.error("MySQL programming error")
+            traceback.print_exc()
+            raise exceptions.DBSyntaxError("MySQL syntax error")
+
+        else:
+            pass
+
+    def delete_result(self, game, result_id):
+        """Method to delete any result and re-rate the results depending on it
+
+        Only the players and teams of the result, and of later results
+        involving them, are re-rated.
+
+        Args:
+            game (str):         game of the result, 'pp', 'fb', 'mk' or 'ss'
+            result_id (int):    result to delete
+
+        Raises:
+            DBValueError:       invalid db entry
+            DBConnectionError:  database connection issues
+            DBSyntaxError:      invalid database programming statement
+
+        """
+
+        if game not in rating_replay.REPLAY_GAMES:
+            raise exceptions.DBValueError("Unknown game")
+
+        self._logger.debug("Deleting %s result %s from database", game, result_id)
+        self._change_result(game, result_id)
+
+    def amend_result(self, game, result_id, players, result_values=None):
+        """Method to amend the players of any result and re-rate its dependents
+
+        Args:
+            game (str):             game of the result, 'pp', 'fb', 'mk' or 'ss'
+            result_id (int):        result to amend
+            players (list):         player ids or name tuples in result column
+                                    order, winner first or finishing order
+            result_values (dict):   other result columns to change, such as course,
+                                    see result_import.IMPORT_FIELDS
+
+        Raises:
+            DBValueError:       invalid db entry
+            DBConnectionError:  database connection issues
+            DBSyntaxError:      invalid database programming statement
+
+        """
+
+        if game not in rating_replay.REPLAY_GAMES:
+            raise exceptions.DBValueError("Unknown game")
+
+        player_columns = rating_replay.REPLAY_GAMES[game][2]
+        if len(players) < 2 or len(players) > len(player_columns) or \
+                (game in ('pp', 'fb') and len(players) != len(player_columns)):
+            raise exceptions.DBValueError("Invalid result")
+
+        for player in players:
+            if not _is_player(player):
+                raise exceptions.DBValueError("Players must be complete")
+
+        # keys become column names in the amending UPDATE
+        value_columns = [column for _, column, _ in result_import.IMPORT_FIELDS[game][1]]
+        for column in result_values or {}:
+            if column not in value_columns:
+                raise exceptions.DBValueError("Unknown result column {0}".format(column))
+
+        self._logger.debug("Amending %s result %s", game, result_id)
+        self._change_result(game, result_id, players, result_values)
+
+    def delete_last_ppresult(self,):
+        """Method to delete last ping pong result from database
+
+        Raises:
+            DBValueError:       invalid db entry
+            DBConnectionError:  database connection issues
+            DBSyntaxError:      invalid database programming statement
+
+        """
+
+        self._logger.debug("Deleting last pp result from database")
+        self._change_result('pp', None)
+
+    def delete_last_fbresult(self,):
+        """Method to delete last foosball result from database
+
+        Raises:
+            DBValueError:       invalid db entry
+            DBConnectionError:  database connection issues
+            DBSyntaxError:      invalid database programming statement
+
+        """
+
+        self._logger.debug("Deleting last fb result from database")
+        self._change_result('fb', None)
+
+    def delete_last_mkresult(self,):
+        """Method to delete last mk result from database
+
+        Raises:
+            DBValueError:       invalid db entry
+            DBConnectionError:  database connection issues
+            DBSyntaxError:      invalid database programming statement
+
+        """
+
+        self._logger.debug("Deleting last mk result from database")
+        self._change_result('mk', None)
+
+    def delete_last_ssresult(self,):
+        """Method to delete last ss result from database
+
+        Raises:
+            DBValueError:       invalid db entry
+            DBConnectionError:  database connection issues
+            DBSyntaxError:      invalid database programming statement
+
+        """
+
+        self._logger.debug("Deleting last ss result from database")
+        self._change_result('ss', None)
+
+    def iter_ppresults(self):
+        """Generator to stream all pp results from database
+
+        Rows are read from a server side cursor and yielded as they arrive,
+        so the full result history is never held in memory.
+
+        Yields:
+            pp result tuples, newest first
+
+        Raises:
+            DBConnectionError:  database connection issues
+            DBSyntaxError:      invalid database programming statement
+
+        """
+
+        self._logger.debug("Streaming all ping pong results")
+
+        try:
+            for result in self._iter_result_rows(RESULT_LISTINGS['pp'] + " ORDER BY \
+pp_result.time DESC, pp_result.result_id DESC"):
+                yield result
+
+        except MySQLdb.OperationalError:
+            self._logger.error("MySQL operational error occured")
+            traceback.print_exc()
+            raise exceptions.DBConnectionError("Cannot connect to MySQL server")
+
+        except MySQLdb.ProgrammingError:
+            self._logger.error("MySQL programming error")
+            traceback.print_exc()
+            raise exceptions.DBSyntaxError("MySQL syntax error")
+
+    def get_all_ppresults(self):
+        """Method to get all pp results from database
+
+        Returns:
+            all pp results
+
+        Raises:
+            DBConnectionError:  database connection issues
+            DBSyntaxError:      invalid database programming statement
+
+        """
+
+        return tuple(self.iter_ppresults())
+
+    def iter_fbresults(self):
+        """Generator to stream all fb results from database
+
+        Rows are read from a server side cursor and yielded as they arrive,
+        so the full result history is never held in memory.
+
+        Yields:
+            fb result tuples, newest first
+
+        Raises:
+            DBConnectionError:  database connection issues
+            DBSyntaxError:      invalid database programming statement
+
+        """
+
+        self._logger.debug("Streaming all foosball results")
+
+        try:
+            for result in self._iter_result_rows(RESULT_LISTINGS['fb'] + " ORDER BY \
+fb_result.time DESC, fb_result.result_id DESC"):
+                yield result
+
+        except MySQLdb.OperationalError:
+            self._logger.error("MySQL operational error occured")
+            traceback.print_exc()
+            raise exceptions.DBConnectionError("Cannot connect to MySQL server")
+
+        except MySQLdb.ProgrammingError:
+            self._logger.error("MySQL programming error")
+            traceback.print_exc()
+            raise exceptions.DBSyntaxError("MySQL syntax error")
+
+    def get_all_fbresults(self):
+        """Method to get all fb results from database
+
+        Returns:
+            all fb results
+
+        Raises:
+            DBConnectionError:  database connection issues
+            DBSyntaxError:      invalid database programming statement
+
+        """
 
-        if not char_second:
-            raise exceptions.DBValueError("Character required second place")
+        return tuple(self.iter_fbresults())
 
-        if third:
-            if not char_third:
-                raise exceptions.DBValueError("Character required third place")
+    def iter_mkresults(self):
+        """Generator to stream all mk results from database
 
-        if fourth:
-            if not char_fourth:
-                raise exceptions.DBValueError("Character required fourth place")
+        Rows are read from a server side cursor and yielded as they arrive,
+        so the full result history is never held in memory.
 
-        if fifth:
-            if not char_fifth:
-                raise exceptions.DBValueError("Character required fifth place")
+        Yields:
+            mk result tuples, newest first
 
-        if sixth:
-            if not char_sixth:
-                raise exceptions.DBValueError("Character required sixth place")
+        Raises:
+            DBConnectionError:  database connection issues
+            DBSyntaxError:      invalid database programming statement
 
-        if seventh:
-            if not char_seventh:
-                raise exceptions.DBValueError("Character required seventh place")
+        """
 
-        if eighth:
-            if not char_eighth:
-                raise exceptions.DBValueError("Character required eighth place")
+        self._logger.debug("Streaming all mk results")
 
-        self._logger.debug("Adding ss result to database")
         try:
-            self.check_if_db_connected()
-            cursor = self._db_conn.cursor()
+            for result in self._iter_result_rows(RESULT_LISTINGS['mk'] + " ORDER BY \
+mk_ind_result.time DESC, mk_ind_result.result_id DESC"):
+                yield result
 
-            if not eighth:
-                if not seventh:
-                    if not sixth:
-                        if not fifth:
-                            if not fourth:
-                                if not third:
-                                    cursor.execute("INSERT INTO ss_ind_result (ss_ind_first, ss_first_char, \
-ss_ind_second, ss_second_char, ss_ind_third, ss_third_char, ss_ind_fourth, ss_fourth_char, ss_ind_fifth, ss_fifth_char, \
-ss_ind_sixth, ss_sixth_char, ss_ind_seventh, ss_seventh_char, ss_ind_eighth, ss_eighth_char) VALUES ((SELECT \
-player_id FROM player WHERE first_name = '{0}' AND last_name \
-= '{1}' AND nickname = '{2}'), '{3}', (SELECT player_id FROM player WHERE first_name \
-= '{4}' AND last_name = '{5}' AND nickname = '{6}'), '{7}', \
-NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL)".format(first[0], first[1], first[2], char_first, second[0],
-                            second[1], second[2], char_second))
-                                else:
-                                    cursor.execute("INSERT INTO ss_ind_result (ss_ind_first, ss_first_char, \
-ss_ind_second, ss_second_char, ss_ind_third, ss_third_char, ss_ind_fourth, ss_fourth_char, ss_ind_fifth, ss_fifth_char, \
-ss_ind_sixth, ss_sixth_char, ss_ind_seventh, ss_seventh_char, ss_ind_eighth, ss_eighth_char) VALUES ((SELECT \
-player_id FROM player WHERE first_name = '{0}' AND last_name \
-= '{1}' AND nickname = '{2}'), '{3}', (SELECT player_id FROM player WHERE first_name \
-= '{4}' AND last_name = '{5}' AND nickname = '{6}'), '{7}', \
-(SELECT player_id FROM player WHERE first_name \
-= '{8}' AND last_name = '{9}' AND nickname = '{10}'), '{11}', NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL)".format(first[0], first[1], first[2], char_first, second[0],
-                            second[1], second[2], char_second, third[0], third[1], third[2], char_third))
-                            else:
-                                cursor.execute("INSERT INTO ss_ind_result (ss_ind_first, ss_first_char, \
-ss_ind_second, ss_second_char, ss_ind_third, ss_third_char, ss_ind_fourth, ss_fourth_char, ss_ind_fifth, ss_fifth_char, \
-ss_ind_sixth, ss_sixth_char, ss_ind_seventh, ss_seventh_char, ss_ind_eighth, ss_eighth_char) VALUES ((SELECT \
-player_id FROM player WHERE first_name = '{0}' AND last_name \
-= '{1}' AND nickname = '{2}'), '{3}', (SELECT player_id FROM player WHERE first_name \
-= '{4}' AND last_name = '{5}' AND nickname = '{6}'), '{7}', \
-(SELECT player_id FROM player WHERE first_name \
-= '{8}' AND last_name = '{9}' AND nickname = '{10}'), '{11}', (SELECT player_id FROM player WHERE first_name \
-= '{12}' AND last_name = '{13}' AND nickname = '{14}'), '{15}', NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL)".format(first[0], first[1], first[2], char_first, second[0],
-                            second[1], second[2], char_second, third[0], third[1], third[2], char_third,
-                            fourth[0], fourth[1], fourth[2], char_fourth))
-                        else:
-                            cursor.execute("INSERT INTO ss_ind_result (ss_ind_first, ss_first_char, \
-ss_ind_second, ss_second_char, ss_ind_third, ss_third_char, ss_ind_fourth, ss_fourth_char, ss_ind_fifth, ss_fifth_char, \
-ss_ind_sixth, ss_sixth_char, ss_ind_seventh, ss_seventh_char, ss_ind_eighth, ss_eighth_char) VALUES ((SELECT \
-player_id FROM player WHERE first_name = '{0}' AND last_name \
-= '{1}' AND nickname = '{2}'), '{3}', (SELECT player_id FROM player WHERE first_name \
-= '{4}' AND last_name = '{5}' AND nickname = '{6}'), '{7}', \
-(SELECT player_id FROM player WHERE first_name \
-= '{8}' AND last_name = '{9}' AND nickname = '{10}'), '{11}', (SELECT player_id FROM player WHERE first_name \
-= '{12}' AND last_name = '{13}' AND nickname = '{14}'), '{15}', (SELECT player_id FROM player WHERE first_name \
-= '{16}' AND last_name = '{17}' AND nickname = '{18}'), '{19}', NULL, NULL, NULL, NULL, NULL, NULL)".format(first[0], first[1], first[2], char_first, second[0],
-                            second[1], second[2], char_second, third[0], third[1], third[2], char_third,
-                            fourth[0], fourth[1], fourth[2], char_fourth, fifth[0], fifth[1], fifth[2], char_fifth))
-                    else:
-                        cursor.execute("INSERT INTO ss_ind_result (ss_ind_first, ss_first_char, \
-ss_ind_second, ss_second_char, ss_ind_third, ss_third_char, ss_ind_fourth, ss_fourth_char, ss_ind_fifth, ss_fifth_char, \
-ss_ind_sixth, ss_sixth_char, ss_ind_seventh, ss_seventh_char, ss_ind_eighth, ss_eighth_char) VALUES ((SELECT \
-player_id FROM player WHERE first_name = '{0}' AND last_name \
-= '{1}' AND nickname = '{2}'), '{3}', (SELECT player_id FROM player WHERE first_name \
-= '{4}' AND last_name = '{5}' AND nickname = '{6}'), '{7}', \
-(SELECT player_id FROM player WHERE first_name \
-= '{8}' AND last_name = '{9}' AND nickname = '{10}'), '{11}', (SELECT player_id FROM player WHERE first_name \
-= '{12}' AND last_name = '{13}' AND nickname = '{14}'), '{15}', (SELECT player_id FROM player WHERE first_name \
-= '{16}' AND last_name = '{17}' AND nickname = '{18}'), '{19}', (SELECT player_id FROM player WHERE first_name \
-= '{20}' AND last_name = '{21}' AND nickname = '{22}'), '{23}', NULL, NULL, NULL, NULL)".format(first[0], first[1], first[2], char_first, second[0],
-                            second[1], second[2], char_second, third[0], third[1], third[2], char_third,
-                            fourth[0], fourth[1], fourth[2], char_fourth, fifth[0], fifth[1], fifth[2], char_fifth,
-                            sixth[0], sixth[1], sixth[2], char_sixth))
-                else:
-                    cursor.execute("INSERT INTO ss_ind_result (ss_ind_first, ss_first_char, \
-ss_ind_second, ss_second_char, ss_ind_third, ss_third_char, ss_ind_fourth, ss_fourth_char, ss_ind_fifth, ss_fifth_char, \
-ss_ind_sixth, ss_sixth_char, ss_ind_seventh, ss_seventh_char, ss_ind_eighth, ss_eighth_char) VALUES ((SELECT \
-player_id FROM player WHERE first_name = '{0}' AND last_name \
-= '{1}' AND nickname = '{2}'), '{3}', (SELECT player_id FROM player WHERE first_name \
-= '{4}' AND last_name = '{5}' AND nickname = '{6}'), '{7}', \
-(SELECT player_id FROM player WHERE first_name \
-= '{8}' AND last_name = '{9}' AND nickname = '{10}'), '{11}', (SELECT player_id FROM player WHERE first_name \
-= '{12}' AND last_name = '{13}' AND nickname = '{14}'), '{15}', (SELECT player_id FROM player WHERE first_name \
-= '{16}' AND last_name = '{17}' AND nickname = '{18}'), '{19}', (SELECT player_id FROM player WHERE first_name \
-= '{20}' AND last_name = '{21}' AND nickname = '{22}'), '{23}', (SELECT player_id FROM player WHERE first_name \
-= '{24}' AND last_name = '{25}' AND nickname = '{26}'), '{27}', NULL, NULL)".format(first[0], first[1], first[2], char_first, second[0],
-                            second[1], second[2], char_second, third[0], third[1], third[2], char_third,
-                            fourth[0], fourth[1], fourth[2], char_fourth, fifth[0], fifth[1], fifth[2], char_fifth,
-                            sixth[0], sixth[1], sixth[2], char_sixth, seventh[0], seventh[1], seventh[2], char_seventh))
-            else:
-                    cursor.execute("INSERT INTO ss_ind_result (ss_ind_first, ss_first_char, \
-ss_ind_second, ss_second_char, ss_ind_third, ss_third_char, ss_ind_fourth, ss_fourth_char, ss_ind_fifth, ss_fifth_char, \
-ss_ind_sixth, ss_sixth_char, ss_ind_seventh, ss_seventh_char, ss_ind_eighth, ss_eighth_char) VALUES ((SELECT \
-player_id FROM player WHERE first_name = '{0}' AND last_name \
-= '{1}' AND nickname = '{2}'), '{3}', (SELECT player_id FROM player WHERE first_name \
-= '{4}' AND last_name = '{5}' AND nickname = '{6}'), '{7}', \
-(SELECT player_id FROM player WHERE first_name \
-= '{8}' AND last_name = '{9}' AND nickname = '{10}'), '{11}', (SELECT player_id FROM player WHERE first_name \
-= '{12}' AND last_name = '{13}' AND nickname = '{14}'), '{15}', (SELECT player_id FROM player WHERE first_name \
-= '{16}' AND last_name = '{17}' AND nickname = '{18}'), '{19}', (SELECT player_id FROM player WHERE first_name \
-= '{20}' AND last_name = '{21}' AND nickname = '{22}'), '{23}', (SELECT player_id FROM player WHERE first_name \
-= '{24}' AND last_name = '{25}' AND nickname = '{26}'), '{27}', (SELECT player_id FROM player WHERE first_name \
-= '{28}' AND last_name = '{29}' AND nickname = '{30}'), '{31}')".format(first[0], first[1], first[2], char_first, second[0],
-                            second[1], second[2], char_second, third[0], third[1], third[2], char_third,
-                            fourth[0], fourth[1], fourth[2], char_fourth, fifth[0], fifth[1], fifth[2], char_fifth,
-                            sixth[0], sixth[1], sixth[2], char_sixth, seventh[0], seventh[1], seventh[2], char_seventh,
-                            eighth[0], eighth[1], eighth[2], char_eighth))
-
-            self._logger.debug("Updating ss ratings")
-            cursor.execute("SELECT player_id, ss_ind_rating FROM player \
-WHERE first_name = '{0}' AND last_name = '{1}' AND nickname = '{2}'".format(
-                first[0], first[1], first[2]))
-            first_player_id, rating = cursor.fetchall()[0]
-
-            cursor.execute("SELECT mu, sigma FROM rating WHERE rating_id \
-= {0}".format(rating))
-            mu, sigma = cursor.fetchall()[0]
-            first_rating = trueskill.Rating(mu=float(mu),
-                sigma=float(sigma))
-
-            cursor.execute("SELECT player_id, ss_ind_rating FROM player \
-WHERE first_name = '{0}' AND last_name = '{1}' AND nickname = '{2}'".format(
-                second[0], second[1], second[2]))
-            second_player_id, rating = cursor.fetchall()[0]
-
-            cursor.execute("SELECT mu, sigma FROM rating WHERE rating_id \
-= {0}".format(rating))
-            mu, sigma = cursor.fetchall()[0]
-            second_rating = trueskill.Rating(mu=float(mu),
-                sigma=float(sigma))
-
-            if third:
-                cursor.execute("SELECT player_id, ss_ind_rating FROM player \
-WHERE first_name = '{0}' AND last_name = '{1}' AND nickname = '{2}'".format(
-                    third[0], third[1], third[2]))
-                third_player_id, rating = cursor.fetchall()[0]
-
-                cursor.execute("SELECT mu, sigma FROM rating WHERE rating_id \
-= {0}".format(rating))
-                mu, sigma = cursor.fetchall()[0]
-                third_rating = trueskill.Rating(mu=float(mu),
-                    sigma=float(sigma))
+        except MySQLdb.OperationalError:
+            self._logger.error("MySQL operational error occured")
+            traceback.print_exc()
+            raise exceptions.DBConnectionError("Cannot connect to MySQL server")
 
-            if fourth:
-                cursor.execute("SELECT player_id, ss_ind_rating FROM player \
-WHERE first_name = '{0}' AND last_name = '{1}' AND nickname = '{2}'".format(
-                    fourth[0], fourth[1], fourth[2]))
-                fourth_player_id, rating = cursor.fetchall()[0]
-
-                cursor.execute("SELECT mu, sigma FROM rating WHERE rating_id \
-= {0}".format(rating))
-                mu, sigma = cursor.fetchall()[0]
-                fourth_rating = trueskill.Rating(mu=float(mu),
-                    sigma=float(sigma))
-
-            if fifth:
-                cursor.execute("SELECT player_id, ss_ind_rating FROM player \
-WHERE first_name = '{0}' AND last_name = '{1}' AND nickname = '{2}'".format(
-                    fifth[0], fifth[1], fifth[2]))
-                fifth_player_id, rating = cursor.fetchall()[0]
-
-                cursor.execute("SELECT mu, sigma FROM rating WHERE rating_id \
-= {0}".format(rating))
-                mu, sigma = cursor.fetchall()[0]
-                fifth_rating = trueskill.Rating(mu=float(mu),
-                    sigma=float(sigma))
-
-            if sixth:
-                cursor.execute("SELECT player_id, ss_ind_rating FROM player \
-WHERE first_name = '{0}' AND last_name = '{1}' AND nickname = '{2}'".format(
-                    sixth[0], sixth[1], sixth[2]))
-                sixth_player_id, rating = cursor.fetchall()[0]
-
-                cursor.execute("SELECT mu, sigma FROM rating WHERE rating_id \
-= {0}".format(rating))
-                mu, sigma = cursor.fetchall()[0]
-                sixth_rating = trueskill.Rating(mu=float(mu),
-                    sigma=float(sigma))
-
-            if seventh:
-                cursor.execute("SELECT player_id, ss_ind_rating FROM player \
-WHERE first_name = '{0}' AND last_name = '{1}' AND nickname = '{2}'".format(
-                    seventh[0], seventh[1], seventh[2]))
-                seventh_player_id, rating = cursor.fetchall()[0]
-
-                cursor.execute("SELECT mu, sigma FROM rating WHERE rating_id \
-= {0}".format(rating))
-                mu, sigma = cursor.fetchall()[0]
-                seventh_rating = trueskill.Rating(mu=float(mu),
-                    sigma=float(sigma))
+        except MySQLdb.ProgrammingError:
+            self._logger.error("MySQL programming error")
+            traceback.print_exc()
+            raise exceptions.DBSyntaxError("MySQL syntax error")
 
-            if eighth:
-                cursor.execute("SELECT player_id, ss_ind_rating FROM player \
-WHERE first_name = '{0}' AND last_name = '{1}' AND nickname = '{2}'".format(
-                    eighth[0], eighth[1], eighth[2]))
-                eighth_player_id, rating = cursor.fetchall()[0]
-
-                cursor.execute("SELECT mu, sigma FROM rating WHERE rating_id \
-= {0}".format(rating))
-                mu, sigma = cursor.fetchall()[0]
-                eighth_rating = trueskill.Rating(mu=float(mu),
-                    sigma=float(sigma))
-
-            if not eighth:
-                if not seventh:
-                    if not sixth:
-                        if not fifth:
-                            if not fourth:
-                                if not third:
-                                    (new_first_rating,), (new_second_rating,) = \
-                                    trueskill.rate([(first_rating,), (second_rating,)], ranks=[0, 1])
-                                else:
-                                    (new_first_rating,), (new_second_rating,), \
-                                    (new_third_rating,) = \
-                                    trueskill.rate([(first_rating,), (second_rating,),
-                                        (third_rating,)], ranks=[0, 1, 2])
-                            else:
-                                (new_first_rating,), (new_second_rating,), \
-                                (new_third_rating,), (new_fourth_rating,) = \
-                                trueskill.rate([(first_rating,), (second_rating,),
-                                    (third_rating,), (fourth_rating,)], ranks=[0, 1, 2, 3])
-                        else:
-                            (new_first_rating,), (new_second_rating,), \
-                            (new_third_rating,), (new_fourth_rating,), \
-                            (new_fifth_rating,) = \
-                            trueskill.rate([(first_rating,), (second_rating,),
-                                (third_rating,), (fourth_rating,), (fifth_rating,)], ranks=[0, 1, 2, 3, 4])
-                    else:
-                        (new_first_rating,), (new_second_rating,), \
-                        (new_third_rating,), (new_fourth_rating,), \
-                        (new_fifth_rating,), (new_sixth_rating,) = \
-                        trueskill.rate([(first_rating,), (second_rating,),
-                            (third_rating,), (fourth_rating,), (fifth_rating,), (sixth_rating,)], ranks=[0, 1, 2, 3, 4, 5])
-                else:
-                    (new_first_rating,), (new_second_rating,), \
-                    (new_third_rating,), (new_fourth_rating,), \
-                    (new_fifth_rating,), (new_sixth_rating,), \
-                    (new_seventh_rating,) = \
-                    trueskill.rate([(first_rating,), (second_rating,),
-                        (third_rating,), (fourth_rating,), (fifth_rating,), (sixth_rating,), (seventh_rating,)], ranks=[0, 1, 2, 3, 4, 5, 6])
-            else:
-                (new_first_rating,), (new_second_rating,), \
-                (new_third_rating,), (new_fourth_rating,), \
-                (new_fifth_rating,), (new_sixth_rating,), \
-                (new_seventh_rating,), (new_eighth_rating,) = \
-                trueskill.rate([(first_rating,), (second_rating,),
-                    (third_rating,), (fourth_rating,), (fifth_rating,), (sixth_rating,), (seventh_rating,), (eighth_rating,)], ranks=[0, 1, 2, 3, 4, 5, 6, 7])
-
-            cursor.execute("INSERT INTO rating (mu, sigma) VALUES ({0}, {1}\
-)".format(new_first_rating.mu, new_first_rating.sigma))
-            new_rating_id = cursor.lastrowid
-            cursor.execute("UPDATE player set ss_ind_rating = {0} where \
-player_id = {1}".format(new_rating_id, first_player_id))
-            cursor.execute("INSERT INTO ss_ind_rating_hist (rating, player) VALUES ({0}, {1}\
-)".format(new_rating_id, first_player_id))
-
-            cursor.execute("INSERT INTO rating (mu, sigma) VALUES ({0}, {1}\
-)".format(new_second_rating.mu, new_second_rating.sigma))
-            new_rating_id = cursor.lastrowid
-            cursor.execute("UPDATE player set ss_ind_rating = {0} where \
-player_id = {1}".format(new_rating_id, second_player_id))
-            cursor.execute("INSERT INTO ss_ind_rating_hist (rating, player) VALUES ({0}, {1}\
-)".format(new_rating_id, second_player_id))
-
-            if third:
-                cursor.execute("INSERT INTO rating (mu, sigma) VALUES ({0}, {1}\
-)".format(new_third_rating.mu, new_third_rating.sigma))
-                new_rating_id = cursor.lastrowid
-                cursor.execute("UPDATE player set ss_ind_rating = {0} where \
-player_id = {1}".format(new_rating_id, third_player_id))
-                cursor.execute("INSERT INTO ss_ind_rating_hist (rating, player) VALUES ({0}, {1}\
-)".format(new_rating_id, third_player_id))
+    def get_all_mkresults(self):
+        """Method to get all mk results from database
 
-            if fourth:
-                cursor.execute("INSERT INTO rating (mu, sigma) VALUES ({0}, {1}\
-)".format(new_fourth_rating.mu, new_fourth_rating.sigma))
-                new_rating_id = cursor.lastrowid
-                cursor.execute("UPDATE player set ss_ind_rating = {0} where \
-player_id = {1}".format(new_rating_id, fourth_player_id))
-                cursor.execute("INSERT INTO ss_ind_rating_hist (rating, player) VALUES ({0}, {1}\
-)".format(new_rating_id, fourth_player_id))
-
-            if fifth:
-                cursor.execute("INSERT INTO rating (mu, sigma) VALUES ({0}, {1}\
-)".format(new_fifth_rating.mu, new_fifth_rating.sigma))
-                new_rating_id = cursor.lastrowid
-                cursor.execute("UPDATE player set ss_ind_rating = {0} where \
-player_id = {1}".format(new_rating_id, fifth_player_id))
-                cursor.execute("INSERT INTO ss_ind_rating_hist (rating, player) VALUES ({0}, {1}\
-)".format(new_rating_id, fifth_player_id))
-
-            if sixth:
-                cursor.execute("INSERT INTO rating (mu, sigma) VALUES ({0}, {1}\
-)".format(new_sixth_rating.mu, new_sixth_rating.sigma))
-                new_rating_id = cursor.lastrowid
-                cursor.execute("UPDATE player set ss_ind_rating = {0} where \
-player_id = {1}".format(new_rating_id, sixth_player_id))
-                cursor.execute("INSERT INTO ss_ind_rating_hist (rating, player) VALUES ({0}, {1}\
-)".format(new_rating_id, sixth_player_id))
-
-            if seventh:
-                cursor.execute("INSERT INTO rating (mu, sigma) VALUES ({0}, {1}\
-)".format(new_seventh_rating.mu, new_seventh_rating.sigma))
-                new_rating_id = cursor.lastrowid
-                cursor.execute("UPDATE player set ss_ind_rating = {0} where \
-player_id = {1}".format(new_rating_id, seventh_player_id))
-                cursor.execute("INSERT INTO ss_ind_rating_hist (rating, player) VALUES ({0}, {1}\
-)".format(new_rating_id, seventh_player_id))
+        Returns:
+            all mk results
 
-            if eighth:
-                cursor.execute("INSERT INTO rating (mu, sigma) VALUES ({0}, {1}\
-)".format(new_eighth_rating.mu, new_eighth_rating.sigma))
-                new_rating_id = cursor.lastrowid
-                cursor.execute("UPDATE player set ss_ind_rating = {0} where \
-player_id = {1}".format(new_rating_id, eighth_player_id))
-                cursor.execute("INSERT INTO ss_ind_rating_hist (rating, player) VALUES ({0}, {1}\
-)".format(new_rating_id, eighth_player_id))
+        Raises:
+            DBConnectionError:  database connection issues
+            DBSyntaxError:      invalid database programming statement
 
-            self._db_conn.commit()
+        """
+
+        return tuple(self.iter_mkresults())
+
+    def iter_ssresults(self):
+        """Generator to stream all ss results from database
+
+        Rows are read from a server side cursor and yielded as they arrive,
+        so the full result history is never held in memory.
+
+        Yields:
+            ss result tuples, newest first
+
+        Raises:
+            DBConnectionError:  database connection issues
+            DBSyntaxError:      invalid database programming statement
+
+        """
+
+        self._logger.debug("Streaming all ss results")
+
+        try:
+            for result in self._iter_result_rows(RESULT_LISTINGS['ss'] + " ORDER BY \
+ss_ind_result.time DESC, ss_ind_result.result_id DESC"):
+                yield result
 
         except MySQLdb.OperationalError:
             self._logger.error("MySQL operational error occured")
@@ -1931,49 +1660,67 @@ player_id = {1}".format(new_rating_id, eighth_player_id))
             traceback.print_exc()
             raise exceptions.DBSyntaxError("MySQL syntax error")
 
-        else:
-            pass
+    def get_all_ssresults(self):
+        """Method to get all ss results from database
 
-    def delete_last_ppresult(self,):
-        """Method to delete last ping pong result from database
+        Returns:
+            all ss results
 
         Raises:
-            DBValueError:       invalid db entry
             DBConnectionError:  database connection issues
             DBSyntaxError:      invalid database programming statement
 
         """
 
-        self._logger.debug("Deleting last pp result from database")
+        return tuple(self.iter_ssresults())
+
+    def get_results_page(self, game, before=None, after=None):
+        """Method to get one page of a game's results, newest first
+
+        Pages are found by keyset on (time, result_id), compared as a row
+        so MySQL 5.7 and later read it as a range of the result time index,
+        and every page costs the same however deep it is.
+
+        Args:
+            game (str):     game of the results, 'pp', 'fb', 'mk' or 'ss'
+            before (tup):   (time, result_id) key, page of older results
+            after (tup):    (time, result_id) key, page of newer results,
+                            the newest page when neither key is given
+
+        Returns:
+            tuple of (results, newer, older) where newer and older are the
+            keys to pass as after and before for the adjacent pages, None
+            when there is no such page
+
+        Raises:
+            DBValueError:       unknown game
+            DBConnectionError:  database connection issues
+            DBSyntaxError:      invalid database programming statement
+
+        """
+
+        if game not in RESULT_LISTINGS:
+            raise exceptions.DBValueError("Unknown game")
+
+        table = rating_replay.REPLAY_GAMES[game][1]
+        page_size = self._config.getint('options', 'results_page_size')
+        key = after or before
+        statement = RESULT_LISTINGS[game]
+        params = []
+        if key is not None:
+            statement += " WHERE ({0}.time, {0}.result_id) {1} (%s, %s)".format(
+                table, '>' if after else '<')
+            params = [key[0], key[1]]
+        statement += " ORDER BY {0}.time {1}, {0}.result_id {1} LIMIT %s".format(
+            table, 'ASC' if after else 'DESC')
+        params.append(page_size + 1)
+
+        self._logger.debug("Getting page of %s results", game)
         try:
             self.check_if_db_connected()
             cursor = self._db_conn.cursor()
-            cursor.execute("SELECT result_id, pp_winner, pp_loser FROM pp_result ORDER BY time \
-DESC LIMIT 1")
-            results = cursor.fetchall()
-            result_id = results[0][0]
-            winner_player_id = results[0][1]
-            loser_player_id = results[0][2]
-
-            # revert from pp_ind_rating_hist
-            cursor.execute("SELECT rating FROM pp_ind_rating_hist WHERE player = {0} ORDER BY time DESC LIMIT 2".format(winner_player_id))
-            results = cursor.fetchall()
-            winner_new_rating_id = results[0][0]
-            winner_previous_rating_id = results[1][0]
-            cursor.execute("SELECT rating FROM pp_ind_rating_hist WHERE player = {0} ORDER BY time DESC LIMIT 2".format(loser_player_id))
-            results = cursor.fetchall()
-            loser_new_rating_id = results[0][0]
-            loser_previous_rating_id = results[1][0]
-            # update player ratings in player
-            cursor.execute("UPDATE player SET pp_ind_rating = {0} WHERE \
-player_id = {1}".format(loser_previous_rating_id, loser_player_id))
-            cursor.execute("UPDATE player SET pp_ind_rating = {0} WHERE \
-player_id = {1}".format(winner_previous_rating_id, winner_player_id))
-            cursor.execute("DELETE FROM pp_ind_rating_hist WHERE rating = {0}".format(winner_new_rating_id))
-            cursor.execute("DELETE FROM pp_ind_rating_hist WHERE rating = {0}".format(loser_new_rating_id))
-            # delete result from pp_result
-            cursor.execute("DELETE FROM pp_result WHERE result_id = {0}".format(result_id))
-            self._db_conn.commit()
+            cursor.execute(statement, params)
+            rows = list(cursor.fetchall())
 
         except MySQLdb.OperationalError:
             self._logger.error("MySQL operational error occured")
@@ -1986,121 +1733,43 @@ player_id = {1}".format(winner_previous_rating_id, winner_player_id))
             raise exceptions.DBSyntaxError("MySQL syntax error")
 
         else:
-            pass
+            more = len(rows) > page_size
+            rows = rows[:page_size]
+            if after:
+                rows.reverse()
+                has_newer, has_older = more, True
+            else:
+                has_newer, has_older = before is not None, more
+
+            newer = older = None
+            if rows:
+                if has_newer:
+                    newer = (rows[0][-1], rows[0][0])
+                if has_older:
+                    older = (rows[-1][-1], rows[-1][0])
+            results = tuple(row[:-1] + (row[-1].strftime('%Y-%m-%d'),) for row in rows)
+            return results, newer, older
+
+    @_cached_leaderboard('pp', 'result_total')
+    def get_total_ppresults(self):
+        """Method to get pp result count from database
 
-    def delete_last_fbresult(self,):
-        """Method to delete last foosball result from database
+        Returns:
+            total number of results
 
         Raises:
-            DBValueError:       invalid db entry
             DBConnectionError:  database connection issues
             DBSyntaxError:      invalid database programming statement
 
         """
 
-        self._logger.debug("Deleting last fb result from database")
+        self._logger.debug("Getting ping pong results count")
+
         try:
             self.check_if_db_connected()
             cursor = self._db_conn.cursor()
-            cursor.execute("SELECT result_id, offense_winner, defense_winner, offense_loser, \
-defense_loser FROM fb_result ORDER BY time \
-DESC LIMIT 1")
-            results = cursor.fetchall()
-            result_id = results[0][0]
-            offense_winner_player_id = results[0][1]
-            defense_winner_player_id = results[0][2]
-            offense_loser_player_id = results[0][3]
-            defense_loser_player_id = results[0][4]
-
-            # revert from fb_ind_rating_hist
-            cursor.execute("SELECT rating FROM fb_offense_rating_hist WHERE player = {0} ORDER \
-BY time DESC LIMIT 2".format(offense_winner_player_id))
-            results = cursor.fetchall()
-            offense_winner_new_rating_id = results[0][0]
-            offense_winner_previous_rating_id = results[1][0]
-            cursor.execute("SELECT rating FROM fb_defense_rating_hist WHERE player = {0} ORDER \
-BY time DESC LIMIT 2".format(defense_winner_player_id))
-            results = cursor.fetchall()
-            defense_winner_new_rating_id = results[0][0]
-            defense_winner_previous_rating_id = results[1][0]
-            cursor.execute("SELECT rating FROM fb_offense_rating_hist WHERE player = {0} ORDER \
-BY time DESC LIMIT 2".format(offense_loser_player_id))
-            results = cursor.fetchall()
-            offense_loser_new_rating_id = results[0][0]
-            offense_loser_previous_rating_id = results[1][0]
-            cursor.execute("SELECT rating FROM fb_defense_rating_hist WHERE player = {0} ORDER \
-BY time DESC LIMIT 2".format(defense_loser_player_id))
-            results = cursor.fetchall()
-            defense_loser_new_rating_id = results[0][0]
-            defense_loser_previous_rating_id = results[1][0]
-            # update player ratings in player
-            cursor.execute("UPDATE player SET fb_offense_rating = {0} WHERE \
-player_id = {1}".format(offense_winner_previous_rating_id, offense_winner_player_id))
-            cursor.execute("UPDATE player SET fb_defense_rating = {0} WHERE \
-player_id = {1}".format(defense_winner_previous_rating_id, defense_winner_player_id))
-            cursor.execute("UPDATE player SET fb_offense_rating = {0} WHERE \
-player_id = {1}".format(offense_loser_previous_rating_id, offense_loser_player_id))
-            cursor.execute("UPDATE player SET fb_defense_rating = {0} WHERE \
-player_id = {1}".format(defense_loser_previous_rating_id, defense_loser_player_id))
-            cursor.execute("DELETE FROM fb_offense_rating_hist WHERE rating = {0}".format(offense_winner_new_rating_id))
-            cursor.execute("DELETE FROM fb_defense_rating_hist WHERE rating = {0}".format(defense_winner_new_rating_id))
-            cursor.execute("DELETE FROM fb_offense_rating_hist WHERE rating = {0}".format(offense_loser_new_rating_id))
-            cursor.execute("DELETE FROM fb_defense_rating_hist WHERE rating = {0}".format(defense_loser_new_rating_id))
-
-            # get team ids
-            cursor.execute("SELECT first_name, last_name, nickname FROM player WHERE player_id \
-= {0}".format(offense_winner_player_id))
-            results = cursor.fetchall()[0]
-            offense_winner_first_name = results[0]
-            offense_winner_last_name = results[1]
-            offense_winner_nickname = results[2]
-            cursor.execute("SELECT first_name, last_name, nickname FROM player WHERE player_id \
-= {0}".format(defense_winner_player_id))
-            results = cursor.fetchall()[0]
-            defense_winner_first_name = results[0]
-            defense_winner_last_name = results[1]
-            defense_winner_nickname = results[2]
-            winner_team_id = self.check_if_two_players_on_team(
-                (offense_winner_first_name, offense_winner_last_name, offense_winner_nickname),
-                (defense_winner_first_name, defense_winner_last_name, defense_winner_nickname))
-            cursor.execute("SELECT first_name, last_name, nickname FROM player WHERE player_id \
-= {0}".format(offense_loser_player_id))
-            results = cursor.fetchall()[0]
-            offense_loser_first_name = results[0]
-            offense_loser_last_name = results[1]
-            offense_loser_nickname = results[2]
-            cursor.execute("SELECT first_name, last_name, nickname FROM player WHERE player_id \
-= {0}".format(defense_loser_player_id))
-            results = cursor.fetchall()[0]
-            defense_loser_first_name = results[0]
-            defense_loser_last_name = results[1]
-            defense_loser_nickname = results[2]
-            loser_team_id = self.check_if_two_players_on_team(
-                (offense_loser_first_name, offense_loser_last_name, offense_loser_nickname),
-                (defense_loser_first_name, defense_loser_last_name, defense_loser_nickname))
-            #revert from fb_team_rating_hist
-            cursor.execute("SELECT rating FROM fb_team_rating_hist WHERE team = {0} ORDER \
-BY time DESC LIMIT 2".format(winner_team_id))
-            results = cursor.fetchall()
-            winner_new_rating_id = results[0][0]
-            winner_previous_rating_id = results[1][0]
-            cursor.execute("SELECT rating FROM fb_team_rating_hist WHERE team = {0} ORDER \
-BY time DESC LIMIT 2".format(loser_team_id))
-            results = cursor.fetchall()
-            loser_new_rating_id = results[0][0]
-            loser_previous_rating_id = results[1][0]
-
-            # update team ratings in team
-            cursor.execute("UPDATE team SET fb_team_rating = {0} WHERE \
-team_id = {1}".format(winner_previous_rating_id, winner_team_id))
-            cursor.execute("UPDATE team SET fb_team_rating = {0} WHERE \
-team_id = {1}".format(loser_previous_rating_id, loser_team_id))
-            cursor.execute("DELETE FROM fb_team_rating_hist WHERE rating = {0}".format(winner_new_rating_id))
-            cursor.execute("DELETE FROM fb_team_rating_hist WHERE rating = {0}".format(loser_new_rating_id))
-
-            # delete result from fb_result
-            cursor.execute("DELETE FROM fb_result WHERE result_id = {0}".format(result_id))
-            self._db_conn.commit()
+            cursor.execute("SELECT COUNT(result_id) FROM pp_result")
+            count = cursor.fetchone()[0]
 
         except MySQLdb.OperationalError:
             self._logger.error("MySQL operational error occured")
@@ -2113,75 +1782,28 @@ team_id = {1}".format(loser_previous_rating_id, loser_team_id))
             raise exceptions.DBSyntaxError("MySQL syntax error")
 
         else:
-            pass
+            return count
 
-    def delete_last_mkresult(self,):
-        """Method to delete last mk result from database
+    @_cached_leaderboard('fb', 'result_total')
+    def get_total_fbresults(self):
+        """Method to get fb result count from database
+
+        Returns:
+            total number of results
 
         Raises:
-            DBValueError:       invalid db entry
             DBConnectionError:  database connection issues
             DBSyntaxError:      invalid database programming statement
 
         """
 
-        self._logger.debug("Deleting last mk result from database")
+        self._logger.debug("Getting foosball results count")
+
         try:
             self.check_if_db_connected()
             cursor = self._db_conn.cursor()
-            cursor.execute("SELECT result_id, mk_ind_first, mk_ind_second, mk_ind_third, \
-mk_ind_fourth FROM mk_ind_result ORDER BY time \
-DESC LIMIT 1")
-            results = cursor.fetchall()
-            result_id = results[0][0]
-            first_player_id = results[0][1]
-            second_player_id = results[0][2]
-            third_player_id = results[0][3]
-            fourth_player_id = results[0][4]
-
-            # revert from mk_ind_rating_hist
-            cursor.execute("SELECT rating FROM mk_ind_rating_hist WHERE player = {0} ORDER \
-BY time DESC LIMIT 2".format(first_player_id))
-            results = cursor.fetchall()
-            first_new_rating_id = results[0][0]
-            first_previous_rating_id = results[1][0]
-            cursor.execute("SELECT rating FROM mk_ind_rating_hist WHERE player = {0} ORDER \
-BY time DESC LIMIT 2".format(second_player_id))
-            results = cursor.fetchall()
-            second_new_rating_id = results[0][0]
-            second_previous_rating_id = results[1][0]
-            if third_player_id:
-                cursor.execute("SELECT rating FROM mk_ind_rating_hist WHERE player = {0} ORDER \
-BY time DESC LIMIT 2".format(third_player_id))
-                results = cursor.fetchall()
-                third_new_rating_id = results[0][0]
-                third_previous_rating_id = results[1][0]
-            if fourth_player_id:
-                cursor.execute("SELECT rating FROM mk_ind_rating_hist WHERE player = {0} ORDER \
-BY time DESC LIMIT 2".format(fourth_player_id))
-                results = cursor.fetchall()
-                fourth_new_rating_id = results[0][0]
-                fourth_previous_rating_id = results[1][0]
-
-            # update player ratings in player
-            cursor.execute("UPDATE player SET mk_ind_rating = {0} WHERE \
-player_id = {1}".format(first_previous_rating_id, first_player_id))
-            cursor.execute("DELETE FROM mk_ind_rating_hist WHERE rating = {0}".format(first_new_rating_id))
-            cursor.execute("UPDATE player SET mk_ind_rating = {0} WHERE \
-player_id = {1}".format(second_previous_rating_id, second_player_id))
-            cursor.execute("DELETE FROM mk_ind_rating_hist WHERE rating = {0}".format(second_new_rating_id))
-            if third_player_id:
-                cursor.execute("UPDATE player SET mk_ind_rating = {0} WHERE \
-player_id = {1}".format(third_previous_rating_id, third_player_id))
-                cursor.execute("DELETE FROM mk_ind_rating_hist WHERE rating = {0}".format(third_new_rating_id))
-            if fourth_player_id:
-                cursor.execute("UPDATE player SET mk_ind_rating = {0} WHERE \
-player_id = {1}".format(fourth_previous_rating_id, fourth_player_id))
-                cursor.execute("DELETE FROM mk_ind_rating_hist WHERE rating = {0}".format(fourth_new_rating_id))
-
-            # delete result from mk_result
-            cursor.execute("DELETE FROM mk_ind_result WHERE result_id = {0}".format(result_id))
-            self._db_conn.commit()
+            cursor.execute("SELECT COUNT(result_id) FROM fb_result")
+            count = cursor.fetchone()[0]
 
         except MySQLdb.OperationalError:
             self._logger.error("MySQL operational error occured")
@@ -2194,119 +1816,28 @@ player_id = {1}".format(fourth_previous_rating_id, fourth_player_id))
             raise exceptions.DBSyntaxError("MySQL syntax error")
 
         else:
-            pass
+            return count
 
-    def delete_last_ssresult(self,):
-        """Method to delete last ss result from database
+    @_cached_leaderboard('mk', 'result_total')
+    def get_total_mkresults(self):
+        """Method to get mk result count from database
+
+        Returns:
+            total number of results
 
         Raises:
-            DBValueError:       invalid db entry
             DBConnectionError:  database connection issues
             DBSyntaxError:      invalid database programming statement
 
         """
 
-        self._logger.debug("Deleting last ss result from database")
+        self._logger.debug("Getting mk results count")
+
         try:
             self.check_if_db_connected()
             cursor = self._db_conn.cursor()
-            cursor.execute("SELECT result_id, ss_ind_first, ss_ind_second, ss_ind_third, \
-ss_ind_fourth, ss_ind_fifth, ss_ind_sixth, ss_ind_seventh, ss_ind_eighth FROM ss_ind_result ORDER BY time \
-DESC LIMIT 1")
-            results = cursor.fetchall()
-            result_id = results[0][0]
-            first_player_id = results[0][1]
-            second_player_id = results[0][2]
-            third_player_id = results[0][3]
-            fourth_player_id = results[0][4]
-            fifth_player_id = results[0][5]
-            sixth_player_id = results[0][6]
-            seventh_player_id = results[0][7]
-            eighth_player_id = results[0][8]
-
-            # revert from ss_ind_rating_hist
-            cursor.execute("SELECT rating FROM ss_ind_rating_hist WHERE player = {0} ORDER \
-BY time DESC LIMIT 2".format(first_player_id))
-            results = cursor.fetchall()
-            first_new_rating_id = results[0][0]
-            first_previous_rating_id = results[1][0]
-            cursor.execute("SELECT rating FROM ss_ind_rating_hist WHERE player = {0} ORDER \
-BY time DESC LIMIT 2".format(second_player_id))
-            results = cursor.fetchall()
-            second_new_rating_id = results[0][0]
-            second_previous_rating_id = results[1][0]
-            if third_player_id:
-                cursor.execute("SELECT rating FROM ss_ind_rating_hist WHERE player = {0} ORDER \
-BY time DESC LIMIT 2".format(third_player_id))
-                results = cursor.fetchall()
-                third_new_rating_id = results[0][0]
-                third_previous_rating_id = results[1][0]
-            if fourth_player_id:
-                cursor.execute("SELECT rating FROM ss_ind_rating_hist WHERE player = {0} ORDER \
-BY time DESC LIMIT 2".format(fourth_player_id))
-                results = cursor.fetchall()
-                fourth_new_rating_id = results[0][0]
-                fourth_previous_rating_id = results[1][0]
-            if fifth_player_id:
-                cursor.execute("SELECT rating FROM ss_ind_rating_hist WHERE player = {0} ORDER \
-BY time DESC LIMIT 2".format(fifth_player_id))
-                results = cursor.fetchall()
-                fifth_new_rating_id = results[0][0]
-                fifth_previous_rating_id = results[1][0]
-            if sixth_player_id:
-                cursor.execute("SELECT rating FROM ss_ind_rating_hist WHERE player = {0} ORDER \
-BY time DESC LIMIT 2".format(sixth_player_id))
-                results = cursor.fetchall()
-                sixth_new_rating_id = results[0][0]
-                sixth_previous_rating_id = results[1][0]
-            if seventh_player_id:
-                cursor.execute("SELECT rating FROM ss_ind_rating_hist WHERE player = {0} ORDER \
-BY time DESC LIMIT 2".format(seventh_player_id))
-                results = cursor.fetchall()
-                seventh_new_rating_id = results[0][0]
-                seventh_previous_rating_id = results[1][0]
-            if eighth_player_id:
-                cursor.execute("SELECT rating FROM ss_ind_rating_hist WHERE player = {0} ORDER \
-BY time DESC LIMIT 2".format(eighth_player_id))
-                results = cursor.fetchall()
-                eighth_new_rating_id = results[0][0]
-                eighth_previous_rating_id = results[1][0]
-
-            # update player ratings in player
-            cursor.execute("UPDATE player SET ss_ind_rating = {0} WHERE \
-player_id = {1}".format(first_previous_rating_id, first_player_id))
-            cursor.execute("DELETE FROM ss_ind_rating_hist WHERE rating = {0}".format(first_new_rating_id))
-            cursor.execute("UPDATE player SET ss_ind_rating = {0} WHERE \
-player_id = {1}".format(second_previous_rating_id, second_player_id))
-            cursor.execute("DELETE FROM ss_ind_rating_hist WHERE rating = {0}".format(second_new_rating_id))
-            if third_player_id:
-                cursor.execute("UPDATE player SET ss_ind_rating = {0} WHERE \
-player_id = {1}".format(third_previous_rating_id, third_player_id))
-                cursor.execute("DELETE FROM ss_ind_rating_hist WHERE rating = {0}".format(third_new_rating_id))
-            if fourth_player_id:
-                cursor.execute("UPDATE player SET ss_ind_rating = {0} WHERE \
-player_id = {1}".format(fourth_previous_rating_id, fourth_player_id))
-                cursor.execute("DELETE FROM ss_ind_rating_hist WHERE rating = {0}".format(fourth_new_rating_id))
-            if fifth_player_id:
-                cursor.execute("UPDATE player SET ss_ind_rating = {0} WHERE \
-player_id = {1}".format(fifth_previous_rating_id, fifth_player_id))
-                cursor.execute("DELETE FROM ss_ind_rating_hist WHERE rating = {0}".format(fifth_new_rating_id))
-            if sixth_player_id:
-                cursor.execute("UPDATE player SET ss_ind_rating = {0} WHERE \
-player_id = {1}".format(sixth_previous_rating_id, sixth_player_id))
-                cursor.execute("DELETE FROM ss_ind_rating_hist WHERE rating = {0}".format(sixth_new_rating_id))
-            if seventh_player_id:
-                cursor.execute("UPDATE player SET ss_ind_rating = {0} WHERE \
-player_id = {1}".format(seventh_previous_rating_id, seventh_player_id))
-                cursor.execute("DELETE FROM ss_ind_rating_hist WHERE rating = {0}".format(seventh_new_rating_id))
-            if eighth_player_id:
-                cursor.execute("UPDATE player SET ss_ind_rating = {0} WHERE \
-player_id = {1}".format(eighth_previous_rating_id, eighth_player_id))
-                cursor.execute("DELETE FROM ss_ind_rating_hist WHERE rating = {0}".format(eighth_new_rating_id))
-
-            # delete result from ss_result
-            cursor.execute("DELETE FROM ss_ind_result WHERE result_id = {0}".format(result_id))
-            self._db_conn.commit()
+            cursor.execute("SELECT COUNT(result_id) FROM mk_ind_result")
+            count = cursor.fetchone()[0]
 
         except MySQLdb.OperationalError:
             self._logger.error("MySQL operational error occured")
@@ -2319,13 +1850,14 @@ player_id = {1}".format(eighth_previous_rating_id, eighth_player_id))
             raise exceptions.DBSyntaxError("MySQL syntax error")
 
         else:
-            pass
+            return count
 
-    def get_all_ppresults(self):
-        """Method to get all pp results from database
+    @_cached_leaderboard('ss', 'result_total')
+    def get_total_ssresults(self):
+        """Method to get ss result count from database
 
         Returns:
-            all pp results
+            total number of results
 
         Raises:
             DBConnectionError:  database connection issues
@@ -2333,38 +1865,13 @@ player_id = {1}".format(eighth_previous_rating_id, eighth_player_id))
 
         """
 
-        all_results = ()
-        self._logger.debug("Getting all ping pong results")
+        self._logger.debug("Getting ss results count")
 
         try:
             self.check_if_db_connected()
             cursor = self._db_conn.cursor()
-            cursor.execute("SELECT result_id, pp_winner, pp_loser, time FROM pp_result ORDER BY time DESC")
-            results = cursor.fetchall()
-
-            for result_id, winner_id, loser_id, timestamp in results:
-                intermediate_results = ()
-
-                cursor.execute("SELECT first_name, last_name, nickname FROM \
-player WHERE player_id = {0}".format(winner_id))
-                winner = cursor.fetchall()
-                first_name_winner, last_name_winner, \
-                    nickname_winner = winner[0]
-
-                cursor.execute("SELECT first_name, last_name, nickname FROM \
-player WHERE player_id = {0}".format(loser_id))
-                loser = cursor.fetchall()
-                first_name_loser, last_name_loser, \
-                    nickname_loser = loser[0]
-
-                intermediate_results = intermediate_results + \
-                    (result_id, first_name_winner, last_name_winner,
-                     nickname_winner, first_name_loser,
-                     last_name_loser, nickname_loser,
-                     timestamp.strftime('%Y-%m-%d'))
-
-                all_results = all_results + (intermediate_results,)
-                del intermediate_results
+            cursor.execute("SELECT COUNT(result_id) FROM ss_ind_result")
+            count = cursor.fetchone()[0]
 
         except MySQLdb.OperationalError:
             self._logger.error("MySQL operational error occured")
@@ -2377,13 +1884,14 @@ player WHERE player_id = {0}".format(loser_id))
             raise exceptions.DBSyntaxError("MySQL syntax error")
 
         else:
-            return all_results
+            return count
 
-    def get_all_fbresults(self):
-        """Method to get all fb results from database
+    @_cached_leaderboard('pp', 'ind_rankings')
+    def get_pp_ind_rankings(self):
+        """Method to get ping pong individual rankings from database
 
         Returns:
-            all fb results
+            individual rank list
 
         Raises:
             DBConnectionError:  database connection issues
@@ -2391,50 +1899,16 @@ player WHERE player_id = {0}".format(loser_id))
 
         """
 
-        all_results = ()
-        self._logger.debug("Getting all foosball results")
+        ranks = []
+        self._logger.debug("Getting ping pong individual rankings")
 
         try:
             self.check_if_db_connected()
-            cursor = self._db_conn.cursor()
-            cursor.execute("SELECT result_id, offense_winner, defense_winner, offense_loser, \
-defense_loser, time FROM fb_result ORDER BY time DESC")
-            results = cursor.fetchall()
+            rows = self._get_standing_rows('pp', ('wins', 'losses'))
 
-            for result_id, offense_winner_id, defense_winner_id, offense_loser_id, defense_loser_id, timestamp in results:
-                intermediate_results = ()
-
-                cursor.execute("SELECT first_name, last_name, nickname FROM \
-player WHERE player_id = {0}".format(offense_winner_id))
-                offense_winner = cursor.fetchall()
-                first_name_offense_winner, last_name_offense_winner, \
-                    nickname_offense_winner = offense_winner[0]
-                cursor.execute("SELECT first_name, last_name, nickname FROM \
-player WHERE player_id = {0}".format(defense_winner_id))
-                defense_winner = cursor.fetchall()
-                first_name_defense_winner, last_name_defense_winner, \
-                    nickname_defense_winner = defense_winner[0]
-                cursor.execute("SELECT first_name, last_name, nickname FROM \
-player WHERE player_id = {0}".format(offense_loser_id))
-                offense_loser = cursor.fetchall()
-                first_name_offense_loser, last_name_offense_loser, \
-                    nickname_offense_loser = offense_loser[0]
-                cursor.execute("SELECT first_name, last_name, nickname FROM \
-player WHERE player_id = {0}".format(defense_loser_id))
-                defense_loser = cursor.fetchall()
-                first_name_defense_loser, last_name_defense_loser, \
-                    nickname_defense_loser = defense_loser[0]
-
-                intermediate_results = intermediate_results + \
-                    (result_id, first_name_offense_winner, last_name_offense_winner,
-                     nickname_offense_winner, first_name_defense_winner, last_name_defense_winner,
-                     nickname_defense_winner, first_name_offense_loser,
-                     last_name_offense_loser, nickname_offense_loser, first_name_defense_loser,
-                     last_name_defense_loser, nickname_defense_loser,
-                     timestamp.strftime('%Y-%m-%d'))
-
-                all_results = all_results + (intermediate_results,)
-                del intermediate_results
+            for first_name, last_name, nickname, score, win_count, loss_count in rows:
+                ranks.append((first_name, last_name, nickname, float(score),
+                              win_count, loss_count))
 
         except MySQLdb.OperationalError:
             self._logger.error("MySQL operational error occured")
@@ -2447,13 +1921,14 @@ player WHERE player_id = {0}".format(defense_loser_id))
             raise exceptions.DBSyntaxError("MySQL syntax error")
 
         else:
-            return all_results
+            return ranks
 
-    def get_all_mkresults(self):
-        """Method to get all mk results from database
+    @_cached_leaderboard('fb', 'ind_rankings')
+    def get_fb_ind_rankings(self):
+        """Method to get foosball individual rankings from database
 
         Returns:
-            all mk results
+            individual rank list
 
         Raises:
             DBConnectionError:  database connection issues
@@ -2461,60 +1936,17 @@ player WHERE player_id = {0}".format(defense_loser_id))
 
         """
 
-        all_results = ()
-        self._logger.debug("Getting all mk results")
+        ranks = []
+        self._logger.debug("Getting foosball individual rankings")
 
         try:
             self.check_if_db_connected()
-            cursor = self._db_conn.cursor()
-            cursor.execute("SELECT result_id, mk_ind_first, mk_ind_second, mk_ind_third, \
-mk_ind_fourth, course, time FROM mk_ind_result ORDER BY time DESC")
-            results = cursor.fetchall()
+            for game, position in (('fb_offense', 'Offense'), ('fb_defense', 'Defense')):
+                rows = self._get_standing_rows(game, ('wins', 'losses'))
 
-            for result_id, first_id, second_id, third_id, fourth_id, course, timestamp in results:
-                intermediate_results = ()
-
-                cursor.execute("SELECT first_name, last_name, nickname FROM \
-player WHERE player_id = {0}".format(first_id))
-                first = cursor.fetchall()
-                first_name_first, last_name_first, \
-                    nickname_first = first[0]
-                cursor.execute("SELECT first_name, last_name, nickname FROM \
-player WHERE player_id = {0}".format(second_id))
-                second = cursor.fetchall()
-                first_name_second, last_name_second, \
-                    nickname_second = second[0]
-                try:
-                    cursor.execute("SELECT first_name, last_name, nickname FROM \
-    player WHERE player_id = {0}".format(third_id))
-                    third = cursor.fetchall()
-                    first_name_third, last_name_third, \
-                        nickname_third = third[0]
-                except MySQLdb.OperationalError:
-                    first_name_third = ''
-                    last_name_third = ''
-                    nickname_third = ''
-                try:
-                    cursor.execute("SELECT first_name, last_name, nickname FROM \
-    player WHERE player_id = {0}".format(fourth_id))
-                    fourth = cursor.fetchall()
-                    first_name_fourth, last_name_fourth, \
-                        nickname_fourth = fourth[0]
-                except MySQLdb.OperationalError:
-                    first_name_fourth = ''
-                    last_name_fourth = ''
-                    nickname_fourth = ''
-
-                intermediate_results = intermediate_results + \
-                    (result_id, first_name_first, last_name_first,
-                     nickname_first, first_name_second, last_name_second,
-                     nickname_second, first_name_third,
-                     last_name_third, nickname_third, first_name_fourth,
-                     last_name_fourth, nickname_fourth, course,
-                     timestamp.strftime('%Y-%m-%d'))
-
-                all_results = all_results + (intermediate_results,)
-                del intermediate_results
+                for first_name, last_name, nickname, score, win_count, loss_count in rows:
+                    ranks.append((first_name, last_name, nickname, position,
+                                  float(score), win_count, loss_count))
 
         except MySQLdb.OperationalError:
             self._logger.error("MySQL operational error occured")
@@ -2527,13 +1959,14 @@ player WHERE player_id = {0}".format(second_id))
             raise exceptions.DBSyntaxError("MySQL syntax error")
 
         else:
-            return all_results
+            return ranks
 
-    def get_all_ssresults(self):
-        """Method to get all ss results from database
+    @_cached_leaderboard('mk', 'ind_rankings')
+    def get_mk_ind_rankings(self):
+        """Method to get mk individual rankings from database
 
         Returns:
-            all ss results
+            individual rank list
 
         Raises:
             DBConnectionError:  database connection issues
@@ -2541,111 +1974,18 @@ player WHERE player_id = {0}".format(second_id))
 
         """
 
-        all_results = ()
-        self._logger.debug("Getting all ss results")
+        ranks = []
+        self._logger.debug("Getting mk individual rankings")
 
         try:
             self.check_if_db_connected()
-            cursor = self._db_conn.cursor()
-            cursor.execute("SELECT result_id, ss_ind_first, ss_first_char, ss_ind_second, ss_second_char, ss_ind_third, \
-ss_third_char, ss_ind_fourth, ss_fourth_char, ss_ind_fifth, ss_fifth_char, ss_ind_sixth, ss_sixth_char, ss_ind_seventh, ss_seventh_char, \
-ss_ind_eighth, ss_eighth_char, time FROM ss_ind_result ORDER BY time DESC")
-            results = cursor.fetchall()
+            rows = self._get_standing_rows('mk', ('first_place', 'second_place',
+                                                   'third_place'))
 
-            for result_id, first_id, first_char, second_id, second_char, third_id, third_char, fourth_id, fourth_char, fifth_id, fifth_char, sixth_id, sixth_char, seventh_id, seventh_char, eighth_id, eighth_char, timestamp in results:
-                intermediate_results = ()
-
-                cursor.execute("SELECT first_name, last_name, nickname FROM \
-player WHERE player_id = {0}".format(first_id))
-                first = cursor.fetchall()
-                first_name_first, last_name_first, \
-                    nickname_first = first[0]
-                cursor.execute("SELECT first_name, last_name, nickname FROM \
-player WHERE player_id = {0}".format(second_id))
-                second = cursor.fetchall()
-                first_name_second, last_name_second, \
-                    nickname_second = second[0]
-                try:
-                    cursor.execute("SELECT first_name, last_name, nickname FROM \
-    player WHERE player_id = {0}".format(third_id))
-                    third = cursor.fetchall()
-                    first_name_third, last_name_third, \
-                        nickname_third = third[0]
-                except MySQLdb.OperationalError:
-                    first_name_third = ''
-                    last_name_third = ''
-                    nickname_third = ''
-                    third_char = ''
-                try:
-                    cursor.execute("SELECT first_name, last_name, nickname FROM \
-    player WHERE player_id = {0}".format(fourth_id))
-                    fourth = cursor.fetchall()
-                    first_name_fourth, last_name_fourth, \
-                        nickname_fourth = fourth[0]
-                except MySQLdb.OperationalError:
-                    first_name_fourth = ''
-                    last_name_fourth = ''
-                    nickname_fourth = ''
-                    fourth_char = ''
-                try:
-                    cursor.execute("SELECT first_name, last_name, nickname FROM \
-    player WHERE player_id = {0}".format(fifth_id))
-                    fifth = cursor.fetchall()
-                    first_name_fifth, last_name_fifth, \
-                        nickname_fifth = fifth[0]
-                except MySQLdb.OperationalError:
-                    first_name_fifth = ''
-                    last_name_fifth = ''
-                    nickname_fifth = ''
-                    fifth_char = ''
-                try:
-                    cursor.execute("SELECT first_name, last_name, nickname FROM \
-    player WHERE player_id = {0}".format(sixth_id))
-                    sixth = cursor.fetchall()
-                    first_name_sixth, last_name_sixth, \
-                        nickname_sixth = sixth[0]
-                except MySQLdb.OperationalError:
-                    first_name_sixth = ''
-                    last_name_sixth = ''
-                    nickname_sixth = ''
-                    sixth_char = ''
-                try:
-                    cursor.execute("SELECT first_name, last_name, nickname FROM \
-    player WHERE player_id = {0}".format(seventh_id))
-                    seventh = cursor.fetchall()
-                    first_name_seventh, last_name_seventh, \
-                        nickname_seventh = seventh[0]
-                except MySQLdb.OperationalError:
-                    first_name_seventh = ''
-                    last_name_seventh = ''
-                    nickname_seventh = ''
-                    seventh_char = ''
-                try:
-                    cursor.execute("SELECT first_name, last_name, nickname FROM \
-    player WHERE player_id = {0}".format(eighth_id))
-                    eighth = cursor.fetchall()
-                    first_name_eighth, last_name_eighth, \
-                        nickname_eighth = eighth[0]
-                except MySQLdb.OperationalError:
-                    first_name_eighth = ''
-                    last_name_eighth = ''
-                    nickname_eighth = ''
-                    eighth_char = ''
-
-                intermediate_results = intermediate_results + \
-                    (result_id, first_name_first, last_name_first,
-                     nickname_first, first_char, first_name_second, last_name_second,
-                     nickname_second, second_char, first_name_third,
-                     last_name_third, nickname_third, third_char, first_name_fourth,
-                     last_name_fourth, nickname_fourth, fourth_char, first_name_fifth,
-                     last_name_fifth, nickname_fifth, fifth_char, first_name_sixth,
-                     last_name_sixth, nickname_sixth, sixth_char, first_name_seventh,
-                     last_name_seventh, nickname_seventh, seventh_char, first_name_eighth,
-                     last_name_eighth, nickname_eighth, eighth_char,
-                     timestamp.strftime('%Y-%m-%d'))
-
-                all_results = all_results + (intermediate_results,)
-                del intermediate_results
+            for first_name, last_name, nickname, score, first_count, second_count, \
+                third_count in rows:
+                ranks.append((first_name, last_name, nickname, float(score),
+                              first_count, second_count, third_count))
 
         except MySQLdb.OperationalError:
             self._logger.error("MySQL operational error occured")
@@ -2658,13 +1998,14 @@ player WHERE player_id = {0}".format(second_id))
             raise exceptions.DBSyntaxError("MySQL syntax error")
 
         else:
-            return all_results
+            return ranks
 
-    def get_total_ppresults(self):
-        """Method to get pp result count from database
+    @_cached_leaderboard('ss', 'ind_rankings')
+    def get_ss_ind_rankings(self):
+        """Method to get ss individual rankings from database
 
         Returns:
-            total number of results
+            individual rank list
 
         Raises:
             DBConnectionError:  database connection issues
@@ -2672,13 +2013,18 @@ player WHERE player_id = {0}".format(second_id))
 
         """
 
-        self._logger.debug("Getting ping pong results count")
+        ranks = []
+        self._logger.debug("Getting ss individual rankings")
 
         try:
             self.check_if_db_connected()
-            cursor = self._db_conn.cursor()
-            cursor.execute("SELECT COUNT(result_id) FROM pp_result")
-            count = cursor.fetchone()[0]
+            rows = self._get_standing_rows('ss', ('first_place', 'second_place',
+                                                   'third_place'))
+
+            for first_name, last_name, nickname, score, first_count, second_count, \
+                third_count in rows:
+                ranks.append((first_name, last_name, nickname, float(score),
+                              first_count, second_count, third_count))
 
         except MySQLdb.OperationalError:
             self._logger.error("MySQL operational error occured")
@@ -2691,13 +2037,14 @@ player WHERE player_id = {0}".format(second_id))
             raise exceptions.DBSyntaxError("MySQL syntax error")
 
         else:
-            return count
+            return ranks
 
-    def get_total_fbresults(self):
-        """Method to get fb result count from database
+    @_cached_leaderboard('fb', 'team_rankings')
+    def get_fb_team_rankings(self):
+        """Method to get fb team rankings from database
 
         Returns:
-            total number of results
+            team rank list
 
         Raises:
             DBConnectionError:  database connection issues
@@ -2705,13 +2052,45 @@ player WHERE player_id = {0}".format(second_id))
 
         """
 
-        self._logger.debug("Getting foosball results count")
+        ranks = []
+        self._logger.debug("Getting foosball team rankings")
 
         try:
             self.check_if_db_connected()
             cursor = self._db_conn.cursor()
-            cursor.execute("SELECT COUNT(result_id) FROM fb_result")
-            count = cursor.fetchone()[0]
+            cursor.execute("SELECT team_id, team_name FROM team")
+            teams = cursor.fetchall()
+
+            for team_id, team_name in teams:
+                statements.execute(cursor, 'fb_team_rating', (team_id,))
+                mu, sigma = cursor.fetchone()
+
+                team_rank = float(mu) - (3 * float(sigma))
+
+                # get player_ids
+                statements.execute(cursor, 'players_of_team', (team_id,))
+                players = cursor.fetchall()
+                player_one = players[0]
+                player_two = players[1]
+
+                statements.execute(cursor, 'player_first_name', (player_one[0],))
+                player_one_name = cursor.fetchone()[0]
+
+                statements.execute(cursor, 'player_first_name', (player_two[0],))
+                player_two_name = cursor.fetchone()[0]
+
+                pair = (player_one[0], player_two[0], player_two[0], player_one[0])
+                statements.execute(cursor, 'fb_pair_wins', pair)
+                team_win_count = cursor.fetchone()[0]
+
+                statements.execute(cursor, 'fb_pair_losses', pair)
+                team_loss_count = cursor.fetchone()[0]
+
+                intermediate_rank = (team_name, round(team_rank, 4),
+                    team_win_count, team_loss_count, player_one_name,
+                    player_two_name)
+                ranks.append(intermediate_rank)
+                del intermediate_rank
 
         except MySQLdb.OperationalError:
             self._logger.error("MySQL operational error occured")
@@ -2724,27 +2103,42 @@ player WHERE player_id = {0}".format(second_id))
             raise exceptions.DBSyntaxError("MySQL syntax error")
 
         else:
-            return count
+            return ranks
 
-    def get_total_mkresults(self):
-        """Method to get mk result count from database
+    def get_pp_ind_rankings_hist(self, player):
+        """Method to get ping pong individual rankings history from database
+
+        Args:
+            player (int):   player_id, or name tuple
 
         Returns:
-            total number of results
+            history of ranks
 
         Raises:
+            DBValueError:       invalid db entry
             DBConnectionError:  database connection issues
             DBSyntaxError:      invalid database programming statement
 
         """
 
-        self._logger.debug("Getting mk results count")
+        if not _is_player(player):
+            raise exceptions.DBValueError("Player must be complete")
+
+        rank_hist = []
+        self._logger.debug("Getting ping pong individual ranking history for player")
 
         try:
             self.check_if_db_connected()
             cursor = self._db_conn.cursor()
-            cursor.execute("SELECT COUNT(result_id) FROM mk_ind_result")
-            count = cursor.fetchone()[0]
+            player_id, = self._get_player_ids(cursor, [player])
+            statements.execute(cursor, 'pp_ind_rating_hist_of_player', (player_id,))
+            results = cursor.fetchall()
+
+            for mu, sigma, timestamp in results:
+                rank = float(mu) - (3 * float(sigma))
+                intermediate_rank = (round(rank, 4), timestamp)
+                rank_hist.append(intermediate_rank)
+                del intermediate_rank
 
         except MySQLdb.OperationalError:
             self._logger.error("MySQL operational error occured")
@@ -2757,27 +2151,35 @@ player WHERE player_id = {0}".format(second_id))
             raise exceptions.DBSyntaxError("MySQL syntax error")
 
         else:
-            return count
+            return rank_hist
 
-    def get_total_ssresults(self):
-        """Method to get ss result count from database
+    def get_all_pp_ind_rankings_hist(self):
+        """Method to get ping pong individual rankings history from database
 
         Returns:
-            total number of results
+            total history of ranks
 
         Raises:
+            DBValueError:       invalid db entry
             DBConnectionError:  database connection issues
             DBSyntaxError:      invalid database programming statement
 
         """
 
-        self._logger.debug("Getting ss results count")
+        total_rank_hist = []
+        self._logger.debug("Getting ping pong total individual ranking history")
 
         try:
             self.check_if_db_connected()
             cursor = self._db_conn.cursor()
-            cursor.execute("SELECT COUNT(result_id) FROM ss_ind_result")
-            count = cursor.fetchone()[0]
+            cursor.execute("SELECT player_id, first_name, last_name, \
+nickname FROM player")
+            players = cursor.fetchall()
+
+            for player_id, first_name, last_name, nickname in players:
+                intermediate_hist = self.get_pp_ind_rankings_hist(player_id)
+                total_rank_hist.append(((first_name, last_name, nickname), intermediate_hist))
+                del intermediate_hist
 
         except MySQLdb.OperationalError:
             self._logger.error("MySQL operational error occured")
@@ -2790,51 +2192,63 @@ player WHERE player_id = {0}".format(second_id))
             raise exceptions.DBSyntaxError("MySQL syntax error")
 
         else:
-            return count
+            return total_rank_hist
 
-    def get_pp_ind_rankings(self):
-        """Method to get ping pong individual rankings from database
+    def edit_player(self, previous_player, new_player):
+        """Method to edit player in database
 
-        Returns:
-            individual rank list
+        Args:
+            previous_player (int):  existing player_id, or a dict of
+                                    previous_first_name, previous_last_name
+                                    and previous_nickname
+            new_player (dict):      replacement player for database
 
         Raises:
+            DBValueError:       invalid db entry
             DBConnectionError:  database connection issues
             DBSyntaxError:      invalid database programming statement
 
         """
 
-        ranks = []
-        self._logger.debug("Getting ping pong individual rankings")
+        # bool is an int, and False is what an empty player select posts
+        if isinstance(previous_player, bool) or \
+                (isinstance(previous_player, (int, long)) and previous_player <= 0):
+            raise exceptions.DBValueError("Player does not exist")
 
+        if len(new_player['first_name']) is 0:
+            raise exceptions.DBValueError("First name must be at \
+least one character")
+
+        if len(new_player['last_name']) is 0:
+            raise exceptions.DBValueError("Last name must be at \
+least one character")
+
+        if not self.check_if_player_exists(**new_player):
+            raise exceptions.DBValueError("Name you are trying to change to already \
+exists in database")
+
+        self._logger.debug("Editing player in database")
         try:
             self.check_if_db_connected()
             cursor = self._db_conn.cursor()
-            cursor.execute("SELECT player_id, first_name, last_name, \
-nickname FROM player")
-            players = cursor.fetchall()
+            if isinstance(previous_player, (int, long)):
+                sql_params = dict(new_player, player_id=previous_player)
+                statements.execute(cursor, 'rename_player_by_id', sql_params)
+            else:
+                sql_params = dict(previous_player.items() + new_player.items())
+                statements.execute(cursor, 'rename_player', sql_params)
+            # the new name is known to differ, so no match is the only way
+            # the rename changes no row
+            if cursor.rowcount == 0:
+                self._db_conn.rollback()
+                raise exceptions.DBValueError("Player does not exist")
+            self._bump_data_versions(cursor)
+            self._db_conn.commit()
 
-            for player_id, first_name, last_name, nickname in players:
-                cursor.execute("SELECT pp_ind_rating FROM \
-player WHERE player_id = {0}".format(player_id))
-                ind_rating = cursor.fetchall()[0][0]
-                cursor.execute("SELECT mu, sigma FROM rating WHERE rating_id \
-= {0}".format(ind_rating))
-                mu, sigma = cursor.fetchall()[0]
-
-                ind_rank = float(mu) - (3 * float(sigma))
-
-                cursor.execute("SELECT COUNT(result_id) FROM pp_result WHERE \
-pp_winner = {0}".format(player_id))
-                win_count = cursor.fetchone()[0]
-                cursor.execute("SELECT COUNT(result_id) FROM pp_result WHERE \
-pp_loser = {0}".format(player_id))
-                loss_count = cursor.fetchone()[0]
-
-                intermediate_rank = (first_name, last_name, nickname, round(ind_rank, 4),
-                                     win_count, loss_count)
-                ranks.append(intermediate_rank)
-                del intermediate_rank
+        except MySQLdb.IntegrityError:
+            self._db_conn.rollback()
+            raise exceptions.DBValueError("Name you are trying to change to already \
+exists in database")
 
         except MySQLdb.OperationalError:
             self._logger.error("MySQL operational error occured")
@@ -2847,72 +2261,44 @@ pp_loser = {0}".format(player_id))
             raise exceptions.DBSyntaxError("MySQL syntax error")
 
         else:
-            return ranks
+            pass
 
-    def get_fb_ind_rankings(self):
-        """Method to get foosball individual rankings from database
+    def edit_team(self, previous_team, new_team):
+        """Method to edit team name in database
 
-        Returns:
-            individual rank list
+        Args:
+            previous_team (str):    existing team in database
+            new_team (str):         replacement team for database
 
         Raises:
+            DBValueError:       invalid db entry
             DBConnectionError:  database connection issues
             DBSyntaxError:      invalid database programming statement
 
         """
 
-        ranks = []
-        self._logger.debug("Getting foosball individual rankings")
+        if len(new_team) is 0:
+            raise exceptions.DBValueError("Team name must be at \
+least one character")
 
+        if self.check_if_team_exists(new_team):
+            raise exceptions.DBValueError("Name you are trying to change to already \
+exists in database")
+
+        self._logger.debug("Editing team in database")
         try:
             self.check_if_db_connected()
             cursor = self._db_conn.cursor()
-            cursor.execute("SELECT player_id, first_name, last_name, \
-nickname FROM player")
-            players = cursor.fetchall()
-
-            for player_id, first_name, last_name, nickname in players:
-                cursor.execute("SELECT fb_offense_rating, fb_defense_rating FROM \
-player WHERE player_id = {0}".format(player_id))
-                offense_rating, defense_rating = cursor.fetchall()[0]
-
-                cursor.execute("SELECT mu, sigma FROM rating WHERE rating_id \
-= {0}".format(offense_rating))
-                mu, sigma = cursor.fetchall()[0]
-
-                offense_rank = float(mu) - (3 * float(sigma))
-                cursor.execute("SELECT mu, sigma FROM rating WHERE rating_id \
-= {0}".format(defense_rating))
-                mu, sigma = cursor.fetchall()[0]
-
-                defense_rank = float(mu) - (3 * float(sigma))
-
-                cursor.execute("SELECT COUNT(result_id) FROM fb_result WHERE \
-offense_winner = {0}".format(player_id))
-                offense_win_count = cursor.fetchone()[0]
-
-                cursor.execute("SELECT COUNT(result_id) FROM fb_result WHERE \
-defense_winner = {0}".format(player_id))
-                defense_win_count = cursor.fetchone()[0]
-
-                cursor.execute("SELECT COUNT(result_id) FROM fb_result WHERE \
-offense_loser = {0}".format(player_id))
-                offense_lose_count = cursor.fetchone()[0]
-
-                cursor.execute("SELECT COUNT(result_id) FROM fb_result WHERE \
-defense_loser = {0}".format(player_id))
-                defense_lose_count = cursor.fetchone()[0]
+            statements.execute(cursor, 'team_id_by_name', (previous_team,))
+            team_id = cursor.fetchall()[0][0]
+            statements.execute(cursor, 'rename_team', (new_team, team_id))
+            self._bump_data_versions(cursor, 'fb')
+            self._db_conn.commit()
 
-                intermediate_rank = (first_name, last_name, nickname,
-                    'Offense', round(offense_rank, 4), offense_win_count,
-                    offense_lose_count)
-                ranks.append(intermediate_rank)
-                del intermediate_rank
-                intermediate_rank = (first_name, last_name, nickname,
-                    'Defense', round(defense_rank, 4), defense_win_count,
-                    defense_lose_count)
-                ranks.append(intermediate_rank)
-                del intermediate_rank
+        except MySQLdb.IntegrityError:
+            self._db_conn.rollback()
+            raise exceptions.DBValueError("Name you are trying to change to already \
+exists in database")
 
         except MySQLdb.OperationalError:
             self._logger.error("MySQL operational error occured")
@@ -2925,13 +2311,16 @@ defense_loser = {0}".format(player_id))
             raise exceptions.DBSyntaxError("MySQL syntax error")
 
         else:
-            return ranks
+            pass
 
-    def get_mk_ind_rankings(self):
-        """Method to get mk individual rankings from database
+    def iter_fb_teams(self):
+        """Generator to stream all fb teams from database
 
-        Returns:
-            individual rank list
+        Team members are joined in the same query, so each team is yielded
+        as soon as its last member row has been read.
+
+        Yields:
+            team tuples, newest first
 
         Raises:
             DBConnectionError:  database connection issues
@@ -2939,40 +2328,32 @@ defense_loser = {0}".format(player_id))
 
         """
 
-        ranks = []
-        self._logger.debug("Getting mk individual rankings")
+        self._logger.debug("Streaming all fb teams from database")
+        cursor = None
 
         try:
             self.check_if_db_connected()
-            cursor = self._db_conn.cursor()
-            cursor.execute("SELECT player_id, first_name, last_name, \
-nickname FROM player")
-            players = cursor.fetchall()
-
-            for player_id, first_name, last_name, nickname in players:
-                cursor.execute("SELECT mk_ind_rating FROM \
-player WHERE player_id = {0}".format(player_id))
-                ind_rating = cursor.fetchall()[0][0]
-                cursor.execute("SELECT mu, sigma FROM rating WHERE rating_id \
-= {0}".format(ind_rating))
-                mu, sigma = cursor.fetchall()[0]
-
-                ind_rank = float(mu) - (3 * float(sigma))
-
-                cursor.execute("SELECT COUNT(result_id) FROM mk_ind_result WHERE \
-mk_ind_first = {0}".format(player_id))
-                first_count = cursor.fetchone()[0]
-                cursor.execute("SELECT COUNT(result_id) FROM mk_ind_result WHERE \
-mk_ind_second = {0}".format(player_id))
-                second_count = cursor.fetchone()[0]
-                cursor.execute("SELECT COUNT(result_id) FROM mk_ind_result WHERE \
-mk_ind_third = {0}".format(player_id))
-                third_count = cursor.fetchone()[0]
-
-                intermediate_rank = (first_name, last_name, nickname, round(ind_rank, 4),
-                                     first_count, second_count, third_count)
-                ranks.append(intermediate_rank)
-                del intermediate_rank
+            cursor = self._db_conn.cursor(connection_health.SSCursor)
+            cursor.execute("SELECT team.team_id, team.team_name, player.first_name, \
+player.last_name, player.nickname, team.time FROM team \
+LEFT JOIN player_team_xref ON player_team_xref.team = team.team_id \
+LEFT JOIN player ON player.player_id = player_team_xref.player \
+ORDER BY team.time DESC, team.team_id")
+
+            current_team_id = None
+            for team_id, name, first_name, last_name, nickname, timestamp in cursor:
+                if team_id != current_team_id:
+                    if current_team_id is not None:
+                        yield intermediate_teams + (team_date,)
+                    current_team_id = team_id
+                    intermediate_teams = (name,)
+                    team_date = timestamp.strftime('%Y-%m-%d')
+
+                if first_name is not None:
+                    intermediate_teams = intermediate_teams + (first_name, last_name, nickname)
+
+            if current_team_id is not None:
+                yield intermediate_teams + (team_date,)
 
         except MySQLdb.OperationalError:
             self._logger.error("MySQL operational error occured")
@@ -2984,14 +2365,15 @@ mk_ind_third = {0}".format(player_id))
             traceback.print_exc()
             raise exceptions.DBSyntaxError("MySQL syntax error")
 
-        else:
-            return ranks
+        finally:
+            if cursor is not None:
+                cursor.close()
 
-    def get_ss_ind_rankings(self):
-        """Method to get ss individual rankings from database
+    def get_all_fb_teams(self):
+        """Method to get all fb teams from database
 
         Returns:
-            individual rank list
+            tuple of team tuples
 
         Raises:
             DBConnectionError:  database connection issues
@@ -2999,40 +2381,27 @@ mk_ind_third = {0}".format(player_id))
 
         """
 
-        ranks = []
-        self._logger.debug("Getting ss individual rankings")
+        return tuple(self.iter_fb_teams())
+
+    @_cached_leaderboard('fb', 'team_total')
+    def get_total_fb_teams(self):
+        """Method to get total fb teams from database
+
+        Returns:
+            total number of teams
+
+        Raises:
+            DBConnectionError:  database connection issues
+            DBSyntaxError:      invalid database programming statement
+
+        """
 
+        self._logger.debug("Getting total fb teams from database")
         try:
             self.check_if_db_connected()
             cursor = self._db_conn.cursor()
-            cursor.execute("SELECT player_id, first_name, last_name, \
-nickname FROM player")
-            players = cursor.fetchall()
-
-            for player_id, first_name, last_name, nickname in players:
-                cursor.execute("SELECT ss_ind_rating FROM \
-player WHERE player_id = {0}".format(player_id))
-                ind_rating = cursor.fetchall()[0][0]
-                cursor.execute("SELECT mu, sigma FROM rating WHERE rating_id \
-= {0}".format(ind_rating))
-                mu, sigma = cursor.fetchall()[0]
-
-                ind_rank = float(mu) - (3 * float(sigma))
-
-                cursor.execute("SELECT COUNT(result_id) FROM ss_ind_result WHERE \
-ss_ind_first = {0}".format(player_id))
-                first_count = cursor.fetchone()[0]
-                cursor.execute("SELECT COUNT(result_id) FROM ss_ind_result WHERE \
-ss_ind_second = {0}".format(player_id))
-                second_count = cursor.fetchone()[0]
-                cursor.execute("SELECT COUNT(result_id) FROM ss_ind_result WHERE \
-ss_ind_third = {0}".format(player_id))
-                third_count = cursor.fetchone()[0]
-
-                intermediate_rank = (first_name, last_name, nickname, round(ind_rank, 4),
-                                     first_count, second_count, third_count)
-                ranks.append(intermediate_rank)
-                del intermediate_rank
+            cursor.execute("SELECT COUNT(team_id) FROM team")
+            count = cursor.fetchone()[0]
 
         except MySQLdb.OperationalError:
             self._logger.error("MySQL operational error occured")
@@ -3045,70 +2414,65 @@ ss_ind_third = {0}".format(player_id))
             raise exceptions.DBSyntaxError("MySQL syntax error")
 
         else:
-            return ranks
+            return count
 
-    def get_fb_team_rankings(self):
-        """Method to get fb team rankings from database
+    def add_fb_team(self, team_name, member_one, member_two):
+        """Method to add a fb team to database
+
+        Args:
+            team_name (str):    team name, None for "<first name> & <first name>"
+            member_one (int):   first member player_id, or name tuple
+            member_two (int):   second member player_id, or name tuple
 
         Returns:
-            team rank list
+            team_id of the new team
 
         Raises:
+            DBValueError:       invalid db entry
             DBConnectionError:  database connection issues
             DBSyntaxError:      invalid database programming statement
 
         """
 
-        ranks = []
-        self._logger.debug("Getting foosball team rankings")
-
-        try:
-            self.check_if_db_connected()
-            cursor = self._db_conn.cursor()
-            cursor.execute("SELECT team_id, team_name FROM team")
-            teams = cursor.fetchall()
-
-            for team_id, team_name in teams:
-                cursor.execute("SELECT fb_team_rating FROM \
-team WHERE team_id = {0}".format(team_id))
-                team_rating = cursor.fetchall()[0]
+        if not _is_player(member_one):
+            raise exceptions.DBValueError("First team member must\
+ be complete")
 
-                cursor.execute("SELECT mu, sigma FROM rating WHERE rating_id \
-= {0}".format(team_rating[0]))
-                mu, sigma = cursor.fetchall()[0]
+        if not _is_player(member_two):
+            raise exceptions.DBValueError("Second team member must\
+ be complete")
 
-                team_rank = float(mu) - (3 * float(sigma))
+        if team_name is None:
+            team_name = self._default_team_name(member_one, member_two)
 
-                # get player_ids
-                cursor.execute("SELECT player from player_team_xref \
-WHERE team = {0}".format(team_id))
-                players = cursor.fetchall()
-                player_one = players[0]
-                player_two = players[1]
+        if len(team_name) is 0:
+            raise exceptions.DBValueError("Team name must be at \
+least one character")
 
-                cursor.execute("SELECT first_name FROM player WHERE \
-player_id = {0}".format(player_one[0]))
-                player_one_name = cursor.fetchone()[0]
+        if member_one == member_two:
+            raise exceptions.DBValueError("Team members must be different players")
 
-                cursor.execute("SELECT first_name FROM player WHERE \
-player_id = {0}".format(player_two[0]))
-                player_two_name = cursor.fetchone()[0]
+        if self.check_if_team_exists(team_name=team_name):
+            raise exceptions.DBValueError("Team already exists")
 
-                cursor.execute("SELECT COUNT(result_id) FROM fb_result WHERE \
-(offense_winner = {0} AND defense_winner = {1}) OR (offense_winner = {1} \
-AND defense_winner = {0})".format(player_one[0], player_two[0]))
-                team_win_count = cursor.fetchone()[0]
+        if self.check_if_two_players_on_team(member_one, member_two):
+            raise exceptions.DBValueError("Players already on team together")
 
-                cursor.execute("SELECT COUNT(result_id) FROM fb_result WHERE \
-(offense_loser = {0} AND defense_loser = {1}) OR (offense_loser = {1} \
-AND defense_loser = {0})".format(player_one[0], player_two[0]))
-                team_loss_count = cursor.fetchone()[0]
+        self._logger.debug("Adding fb team to database")
+        try:
+            self.check_if_db_connected()
+            cursor = self._db_conn.cursor()
+            try:
+                team_id = self._insert_fb_team(cursor, team_name, (member_one, member_two))
+            except exceptions.DBValueError:
+                self._db_conn.rollback()
+                raise
+            self._bump_data_versions(cursor, 'fb')
+            self._db_conn.commit()
 
-                intermediate_rank = (team_name, round(team_rank, 4),
-                    team_win_count, team_loss_count, player_one_name,
-                    player_two_name)
-                ranks.append(intermediate_rank)
-                del intermediate_rank
+        except MySQLdb.IntegrityError:
+            self._db_conn.rollback()
+            raise exceptions.DBValueError("Team already exists")
 
         except MySQLdb.OperationalError:
             self._logger.error("MySQL operational error occured")
@@ -3121,49 +2485,83 @@ AND defense_loser = {0})".format(player_one[0], player_two[0]))
             raise exceptions.DBSyntaxError("MySQL syntax error")
 
         else:
-            return ranks
+            return team_id
 
-    def get_pp_ind_rankings_hist(self, player):
-        """Method to get ping pong individual rankings history from database
+    def _insert_fb_team(self, cursor, team_name, members):
+        """Writes a new fb team with default ratings, leaving it uncommitted
 
         Args:
-            player (str):   player
+            cursor (obj):       cursor of the open transaction
+            team_name (str):    team name
+            members (tup):      two member player_ids, or name tuples
 
         Returns:
-            history of ranks
+            team_id of the new team
+
+        Raises:
+            DBValueError:           invalid team
+            MySQLdb.IntegrityError: team name taken
+
+        """
+
+        player_ids = self._get_player_ids(cursor, members)
+        if player_ids[0] == player_ids[1]:
+            raise exceptions.DBValueError("Team members must be different players")
+
+        fb_rating_id = self.create_new_default_rating()
+        mk_rating_id = self.create_new_default_rating()
+        mp_rating_id = self.create_new_default_rating()
+        ss_rating_id = self.create_new_default_rating()
+        statements.execute(cursor, 'insert_team', (
+            team_name, fb_rating_id, mk_rating_id, mp_rating_id, ss_rating_id))
+
+        team_id = cursor.lastrowid
+
+        statements.execute(cursor, 'insert_fb_team_rating_hist', (fb_rating_id, team_id))
+        statements.execute(cursor, 'insert_mk_team_rating_hist', (mk_rating_id, team_id))
+        statements.execute(cursor, 'insert_mp_team_rating_hist', (mp_rating_id, team_id))
+        statements.execute(cursor, 'insert_ss_team_rating_hist', (ss_rating_id, team_id))
+
+        for player_id in player_ids:
+            statements.execute(cursor, 'insert_team_member', (player_id, team_id))
+
+        try:
+            statements.execute(cursor, 'insert_team_pair',
+                               (min(player_ids), max(player_ids), team_id))
+        except MySQLdb.IntegrityError:
+            # a concurrent add_fb_team paired the same players first
+            raise exceptions.DBValueError("Players already on team together")
+
+        return team_id
+
+    def _default_team_name(self, member_one, member_two):
+        """Names a team after the first names of its members
+
+        Args:
+            member_one (int):   first member player_id, or name tuple
+            member_two (int):   second member player_id, or name tuple
+
+        Returns:
+            "<first name> & <first name>"
 
         Raises:
-            DBValueError:       invalid db entry
+            DBValueError:       member not found
             DBConnectionError:  database connection issues
             DBSyntaxError:      invalid database programming statement
 
         """
 
-        if len(player) != 3:
-            raise exceptions.DBValueError("Player must be complete")
-
-        rank_hist = []
-        self._logger.debug("Getting ping pong individual ranking history for player")
+        members = (member_one, member_two)
+        if not any(isinstance(member, (int, long)) for member in members):
+            return "{0} & {1}".format(member_one[0], member_two[0])
 
         try:
             self.check_if_db_connected()
             cursor = self._db_conn.cursor()
-            cursor.execute("SELECT player_id FROM player WHERE \
-first_name = '{0}' AND last_name = '{1}' AND nickname = \
-'{2}'".format(player[0], player[1], player[2]))
-            player_id = cursor.fetchone()[0]
-            cursor.execute("SELECT rating, time FROM pp_ind_rating_hist \
-WHERE player = {0} ORDER BY time DESC".format(player_id))
-            results = cursor.fetchall()
-
-            for rating, timestamp in results:
-                cursor.execute("SELECT mu, sigma FROM rating WHERE rating_id \
-= {0}".format(rating))
-                mu, sigma = cursor.fetchall()[0]
-                rank = float(mu) - (3 * float(sigma))
-                intermediate_rank = (round(rank, 4), timestamp)
-                rank_hist.append(intermediate_rank)
-                del intermediate_rank
+            condition, params = _player_filter(members)
+            cursor.execute("SELECT player_id, first_name, last_name, nickname FROM player \
+WHERE " + condition, params)
+            rows = _match_players(members, cursor.fetchall())
 
         except MySQLdb.OperationalError:
             self._logger.error("MySQL operational error occured")
@@ -3176,13 +2574,42 @@ WHERE player = {0} ORDER BY time DESC".format(player_id))
             raise exceptions.DBSyntaxError("MySQL syntax error")
 
         else:
-            return rank_hist
+            return "{0} & {1}".format(rows[0][1], rows[1][1])
 
-    def get_all_pp_ind_rankings_hist(self):
-        """Method to get ping pong individual rankings history from database
+    def _get_standing_rows(self, game, counters):
+        """Gets the standings of one game, best conservative score first
+
+        Args:
+            game (str):         standing game, see STANDING_RATING_COLUMNS
+            counters (tup):     standing counter columns to select
 
         Returns:
-            total history of ranks
+            tuple of (first_name, last_name, nickname, score, counter, ...) rows
+
+        """
+
+        cursor = self._db_conn.cursor()
+        cursor.execute("SELECT player.first_name, player.last_name, player.nickname, \
+standing.score, {0} FROM standing \
+JOIN player ON player.player_id = standing.player_id \
+WHERE standing.game = %s ORDER BY standing.score DESC".format(
+    ", ".join("standing." + counter for counter in counters)), (game,))
+        return cursor.fetchall()
+
+    def _change_result(self, game, result_id, players=None, result_values=None):
+        """Deletes or amends a result and re-rates its dependency cone
+
+        Queued rating updates of the game are applied first, in the same
+        transaction, so the cone only holds rated results. Foosball teams
+        missing for the amended pairs are created in it too, so a failed
+        change leaves nothing behind.
+
+        Args:
+            game (str):             game of the result
+            result_id (int):        result to change, None for the newest
+            players (list):         amended player ids or name tuples, None to
+                                    delete
+            result_values (dict):   other result columns to amend
 
         Raises:
             DBValueError:       invalid db entry
@@ -3191,20 +2618,52 @@ WHERE player = {0} ORDER BY time DESC".format(player_id))
 
         """
 
-        total_rank_hist = []
-        self._logger.debug("Getting ping pong total individual ranking history")
-
         try:
             self.check_if_db_connected()
+            # end any read snapshot the request holds, so the jobs locked
+            # below and the results they rate are read from the same state
+            self._db_conn.rollback()
             cursor = self._db_conn.cursor()
-            cursor.execute("SELECT first_name, last_name, \
-nickname FROM player")
-            players = cursor.fetchall()
+            self._apply_locked_rating_jobs(cursor, game)
+            if result_id is None:
+                cursor.execute("SELECT result_id FROM {0} ORDER BY time DESC, result_id DESC \
+LIMIT 1".format(rating_replay.REPLAY_GAMES[game][1]))
+                row = cursor.fetchone()
+                if row is None:
+                    raise exceptions.DBValueError("No results to delete")
+                result_id = row[0]
+
+            player_ids = None
+            if players is not None:
+                player_ids = self._get_player_ids(cursor, players)
+                if len(set(player_ids)) != len(player_ids):
+                    raise exceptions.DBValueError("Duplicate players in result")
+                if game == 'fb':
+                    # team ratings need a team for both pairs, as in add_fbresult
+                    for pair in (player_ids[0:2], player_ids[2:4]):
+                        statements.execute(cursor, 'team_of_pair', (min(pair), max(pair)))
+                        if cursor.fetchone() is None:
+                            self._insert_fb_team(cursor, self._default_team_name(*pair), pair)
+
+            replay = rating_replay.ConeReplay(self._db_conn, game, self._logger,
+                                              self._config.getint('options',
+                                                                  'replay_batch_size'))
+            try:
+                replay.run(result_id, player_ids, result_values)
+            except KeyError:
+                raise exceptions.DBValueError("Result does not exist")
+
+            self._bump_data_versions(cursor, game)
+            self._db_conn.commit()
 
-            for first_name, last_name, nickname in players:
-                intermediate_hist = self.get_pp_ind_rankings_hist((first_name, last_name, nickname))
-                total_rank_hist.append((first_name, last_name, nickname), intermediate_hist)
-                del intermediate_hist
+        except exceptions.DBValueError:
+            self._db_conn.rollback()
+            raise
+
+        except MySQLdb.IntegrityError:
+            # the default name of a missing team is taken by another team
+            self._db_conn.rollback()
+            raise exceptions.DBValueError("Team already exists")
 
         except MySQLdb.OperationalError:
             self._logger.error("MySQL operational error occured")
@@ -3216,177 +2675,409 @@ nickname FROM player")
             traceback.print_exc()
             raise exceptions.DBSyntaxError("MySQL syntax error")
 
-        else:
-            return total_rank_hist
-
-    def edit_player(self, previous_player, new_player):
-        """Method to edit player in database
+    def _get_player_ids(self, cursor, players):
+        """Resolves and checks the ids of several players in one query
 
         Args:
-            previous_player (dict): existing player in database
-            new_player (dict):      replacement player for database
+            cursor (obj):   cursor to query with
+            players (list): player ids or (first_name, last_name, nickname)
+                            tuples
+
+        Returns:
+            list of player ids in the order of players
 
         Raises:
-            DBValueError:       invalid db entry
-            DBConnectionError:  database connection issues
-            DBSyntaxError:      invalid database programming statement
+            DBValueError:   player not found
 
         """
 
-        if len(new_player['first_name']) is 0:
-            raise exceptions.DBValueError("First name must be at \
-least one character")
+        condition, params = _player_filter(players)
+        cursor.execute("SELECT player_id, first_name, last_name, nickname FROM player \
+WHERE " + condition, params)
+        return [row[0] for row in _match_players(players, cursor.fetchall())]
 
-        if len(new_player['last_name']) is 0:
-            raise exceptions.DBValueError("Last name must be at \
-least one character")
+    def _add_placement_result(self, cursor, game, players, result_values):
+        """Records a free-for-all result, leaving it to be rated
 
-        if not self.check_if_player_exists(**new_player):
-            raise exceptions.DBValueError("Name you are trying to change to already \
-exists in database")
+        Args:
+            cursor (obj):           cursor of the open transaction
+            game (str):             game prefix, 'mk' or 'ss'
+            players (list):         player ids or name tuples in finishing order
+            result_values (dict):   result columns besides the players
 
-        self._logger.debug("Editing player in database")
-        try:
-            self.check_if_db_connected()
-            cursor = self._db_conn.cursor()
-            sql_params = dict(previous_player.items() + new_player.items())
-            sql = """UPDATE player
-                     SET first_name='{first_name}',
-                         last_name='{last_name}',
-                         nickname='{nickname}'
-                     WHERE first_name='{previous_first_name}' AND
-                           last_name='{previous_last_name}' AND
-                           nickname='{previous_nickname}';""".format(**sql_params)
-            cursor.execute(sql)
-            self._db_conn.commit()
+        Returns:
+            result_id of the new result
 
-        except MySQLdb.OperationalError:
-            self._logger.error("MySQL operational error occured")
-            traceback.print_exc()
-            raise exceptions.DBConnectionError("Cannot connect to MySQL server")
+        Raises:
+            DBValueError:       participant not found or placed twice
 
-        except MySQLdb.ProgrammingError:
-            self._logger.error("MySQL programming error")
-            traceback.print_exc()
-            raise exceptions.DBSyntaxError("MySQL syntax error")
+        """
 
-        else:
-            pass
+        player_ids = self._get_player_ids(cursor, players)
+        if len(set(player_ids)) != len(player_ids):
+            raise exceptions.DBValueError("Duplicate players in result")
 
-    def edit_team(self, previous_team, new_team):
-        """Method to edit team name in database
+        columns = ['{0}_ind_{1}'.format(game, place) for place in PLACES[:len(players)]]
+        values = list(player_ids)
+        for column, value in result_values.items():
+            columns.append(column)
+            values.append(value)
+        cursor.execute("INSERT INTO {0}_ind_result ({1}) VALUES ({2})".format(
+            game, ", ".join(columns), ", ".join(["%s"] * len(values))), values)
+        return cursor.lastrowid
+
+    def _queue_rating(self, cursor, game, result_id):
+        """Queues the rating update of a new result
+
+        Must run in the transaction that inserted the result, so the result
+        and its job commit or roll back together.
 
         Args:
-            previous_team (str):    existing team in database
-            new_team (str):         replacement team for database
+            cursor (obj):       cursor of the open transaction
+            game (str):         game of the result, see RATING_JOB_GAMES
+            result_id (int):    result to rate
 
-        Raises:
-            DBValueError:       invalid db entry
-            DBConnectionError:  database connection issues
-            DBSyntaxError:      invalid database programming statement
+        """
+
+        statements.execute(cursor, 'insert_rating_job', (game, result_id))
+
+    def _apply_locked_rating_jobs(self, cursor, game):
+        """Applies a game's queued rating updates in the caller's transaction
+
+        The game's jobs are locked before anything else is read, which also
+        holds off new jobs of the game until the caller commits. A cone
+        replay in the same transaction then finds every result rated
+        exactly once.
+
+        Args:
+            cursor (obj):   cursor of a fresh transaction
+            game (str):     game of the jobs, see RATING_JOB_GAMES
 
         """
 
-        if len(new_team) is 0:
-            raise exceptions.DBValueError("Team name must be at \
-least one character")
+        statements.execute(cursor, 'lock_rating_jobs', (game,))
+        for job_id, result_id in cursor.fetchall():
+            self._rate_result(cursor, game, result_id)
+            statements.execute(cursor, 'delete_rating_job', (job_id,))
 
-        if self.check_if_team_exists(new_team):
-            raise exceptions.DBValueError("Name you are trying to change to already \
-exists in database")
+    def _apply_queued_ratings(self):
+        """Applies every queued rating update from the rating worker thread"""
 
-        self._logger.debug("Editing team in database")
         try:
-            self.check_if_db_connected()
-            cursor = self._db_conn.cursor()
-            cursor.execute("SELECT team_id FROM team WHERE team_name = '{0}'".format(previous_team))
-            team_id = cursor.fetchall()[0][0]
-            cursor.execute("UPDATE team SET team_name = '{0}' WHERE team_id = {1}".format(new_team, team_id))
-            self._db_conn.commit()
+            self.apply_rating_jobs()
+        finally:
+            self.release_connection()
 
-        except MySQLdb.OperationalError:
-            self._logger.error("MySQL operational error occured")
-            traceback.print_exc()
-            raise exceptions.DBConnectionError("Cannot connect to MySQL server")
+    def _rate_result(self, cursor, game, result_id):
+        """Rates a stored result and updates the standings of its players
 
-        except MySQLdb.ProgrammingError:
-            self._logger.error("MySQL programming error")
-            traceback.print_exc()
-            raise exceptions.DBSyntaxError("MySQL syntax error")
+        Args:
+            cursor (obj):       cursor of the open transaction
+            game (str):         game of the result, see RATING_JOB_GAMES
+            result_id (int):    result to rate
 
-        else:
-            pass
+        Returns:
+            False if the result does not exist, True otherwise
 
-    def get_all_fb_teams(self):
-        """Method to get all fb teams from database
+        """
+
+        if game == 'pp':
+            return self._rate_ppresult(cursor, result_id)
+        if game == 'fb':
+            return self._rate_fbresult(cursor, result_id)
+        return self._rate_placement_result(cursor, game, result_id)
+
+    def _rate_ppresult(self, cursor, result_id):
+        """Rates a stored ping pong result, see _rate_result"""
+
+        statements.execute(cursor, 'pp_result_players', (result_id,))
+        row = cursor.fetchone()
+        if row is None:
+            return False
+
+        self._logger.debug("Updating pp ratings")
+        winner_player_id, loser_player_id = row
+        _, winner_rating = self._player_rating(cursor, 'pp_ind_rating', winner_player_id)
+        _, loser_rating = self._player_rating(cursor, 'pp_ind_rating', loser_player_id)
+
+        new_winner_rating, new_loser_rating = \
+        trueskill.rate_1vs1(winner_rating, loser_rating)
+
+        self._store_rating(cursor, 'player', 'pp_ind_rating',
+                           winner_player_id, new_winner_rating)
+        self._store_rating(cursor, 'player', 'pp_ind_rating',
+                           loser_player_id, new_loser_rating)
+
+        self._refresh_standing(cursor, winner_player_id, 'pp', 'wins')
+        self._refresh_standing(cursor, loser_player_id, 'pp', 'losses')
+        return True
+
+    def _rate_fbresult(self, cursor, result_id):
+        """Rates a stored foosball result and its two teams, see _rate_result"""
+
+        statements.execute(cursor, 'fb_result_players', (result_id,))
+        row = cursor.fetchone()
+        if row is None:
+            return False
+
+        self._logger.debug("Updating fb ratings")
+        offense_winner_player_id, defense_winner_player_id, offense_loser_player_id, \
+        defense_loser_player_id = row
+        _, offense_winner_rating = \
+        self._player_rating(cursor, 'fb_offense_rating', offense_winner_player_id)
+        _, defense_winner_rating = \
+        self._player_rating(cursor, 'fb_defense_rating', defense_winner_player_id)
+        _, offense_loser_rating = \
+        self._player_rating(cursor, 'fb_offense_rating', offense_loser_player_id)
+        _, defense_loser_rating = \
+        self._player_rating(cursor, 'fb_defense_rating', defense_loser_player_id)
+
+        (new_offense_winner_rating, new_defense_winner_rating), \
+        (new_offense_loser_rating, new_defense_loser_rating) = \
+        trueskill.rate([(offense_winner_rating, defense_winner_rating),
+            (offense_loser_rating, defense_loser_rating)], ranks=[0, 1])
+
+        self._store_rating(cursor, 'player', 'fb_offense_rating',
+                           offense_winner_player_id, new_offense_winner_rating)
+        self._store_rating(cursor, 'player', 'fb_defense_rating',
+                           defense_winner_player_id, new_defense_winner_rating)
+        self._store_rating(cursor, 'player', 'fb_offense_rating',
+                           offense_loser_player_id, new_offense_loser_rating)
+        self._store_rating(cursor, 'player', 'fb_defense_rating',
+                           defense_loser_player_id, new_defense_loser_rating)
+
+        self._refresh_standing(cursor, offense_winner_player_id, 'fb_offense', 'wins')
+        self._refresh_standing(cursor, defense_winner_player_id, 'fb_defense', 'wins')
+        self._refresh_standing(cursor, offense_loser_player_id, 'fb_offense', 'losses')
+        self._refresh_standing(cursor, defense_loser_player_id, 'fb_defense', 'losses')
+
+        self._logger.debug("Update foosball team ratings")
+        team_ratings = []
+        for member_one, member_two in ((offense_winner_player_id, defense_winner_player_id),
+                                       (offense_loser_player_id, defense_loser_player_id)):
+            # add_fbresult created the team before queueing the result
+            statements.execute(cursor, 'team_of_pair',
+                               (min(member_one, member_two), max(member_one, member_two)))
+            team = cursor.fetchone()[0]
+            statements.execute(cursor, 'fb_team_rating', (team,))
+            mu, sigma = cursor.fetchone()
+            team_ratings.append((team, trueskill.Rating(mu=float(mu), sigma=float(sigma))))
+
+        (winning_team, winning_team_rating), (losing_team, losing_team_rating) = team_ratings
+        new_winning_team_rating, new_losing_team_rating = \
+        trueskill.rate_1vs1(winning_team_rating, losing_team_rating)
+
+        self._store_rating(cursor, 'team', 'fb_team_rating', winning_team,
+                           new_winning_team_rating)
+        self._store_rating(cursor, 'team', 'fb_team_rating', losing_team,
+                           new_losing_team_rating)
+        return True
+
+    def _rate_placement_result(self, cursor, game, result_id):
+        """Rates a stored free-for-all result in a fixed number of statements
+
+        All participants are fetched and locked in one query, and the new
+        ratings, player pointers, rating history and standings are each
+        written with one set-based statement. The caller commits.
+
+        The new rating ids are derived from the multi-row insert's
+        LAST_INSERT_ID, see Connection.inserted_ids.
+
+        Args:
+            cursor (obj):       cursor of the open transaction
+            game (str):         game prefix, 'mk' or 'ss'
+            result_id (int):    result to rate
 
         Returns:
-            tuple of team tuples
+            False if the result does not exist, True otherwise
+
+        """
+
+        cursor.execute("SELECT {0} FROM {1}_ind_result WHERE result_id = %s".format(
+            ", ".join('{0}_ind_{1}'.format(game, place) for place in PLACEMENT_PLACES[game]),
+            game), (result_id,))
+        row = cursor.fetchone()
+        if row is None:
+            return False
+        players = [player_id for player_id in row if player_id is not None]
+
+        rating_column = '{0}_ind_rating'.format(game)
+        condition, params = _player_filter(players)
+        cursor.execute("SELECT player.player_id, player.first_name, player.last_name, \
+player.nickname, rating.mu, rating.sigma FROM player \
+JOIN rating ON rating.rating_id = player.{0} \
+WHERE {1} FOR UPDATE".format(rating_column, condition), params)
+        placed = [(row[0], row[4], row[5])
+                  for row in _match_players(players, cursor.fetchall())]
+        player_ids = [player_id for player_id, _, _ in placed]
+
+        self._logger.debug("Updating %s ratings", game)
+        ratings = [(trueskill.Rating(mu=float(mu), sigma=float(sigma)),)
+                   for _, mu, sigma in placed]
+        new_ratings = [rating for (rating,) in trueskill.rate(
+            ratings, ranks=list(range(len(players))))]
+
+        cursor.execute("INSERT INTO rating (mu, sigma) VALUES {0}".format(
+            ", ".join(["(%s, %s)"] * len(new_ratings))),
+                       [value for rating in new_ratings for value in (rating.mu, rating.sigma)])
+        rating_ids = self._db_conn.inserted_ids(cursor.lastrowid, len(new_ratings))
+
+        cursor.execute("UPDATE player SET {0} = CASE player_id {1} END \
+WHERE player_id IN ({2})".format(rating_column, " ".join(["WHEN %s THEN %s"] * len(player_ids)),
+                                ", ".join(["%s"] * len(player_ids))),
+                       [value for pair in zip(player_ids, rating_ids) for value in pair] +
+                       player_ids)
+
+        cursor.execute("INSERT INTO {0}_ind_rating_hist (rating, player) VALUES {1}".format(
+            game, ", ".join(["(%s, %s)"] * len(player_ids))),
+                       [value for pair in zip(rating_ids, player_ids) for value in pair])
+
+        self._refresh_placement_standings(cursor, game, player_ids)
+        return True
+
+    def _refresh_placement_standings(self, cursor, game, player_ids, step=1):
+        """Copies the current ratings of a result's players into standing
+
+        The top finishing places also have their placement counter adjusted.
+
+        Args:
+            cursor (obj):       cursor of the open transaction
+            game (str):         standing game, see STANDING_RATING_COLUMNS
+            player_ids (list):  player ids in finishing order
+            step (int):         amount added to the placement counters
+
+        """
+
+        counters = list(zip(PLACEMENT_COUNTERS, player_ids))
+        counter_updates = "".join(", standing.{0} = standing.{0} + %s * \
+(standing.player_id = %s)".format(counter) for counter, _ in counters)
+        cursor.execute("UPDATE standing \
+JOIN player ON player.player_id = standing.player_id \
+JOIN rating ON rating.rating_id = player.{0} \
+SET standing.mu = rating.mu, standing.sigma = rating.sigma, \
+standing.score = rating.mu - 3 * rating.sigma{1} \
+WHERE standing.game = %s AND standing.player_id IN ({2})".format(
+    STANDING_RATING_COLUMNS[game], counter_updates, ", ".join(["%s"] * len(player_ids))),
+                       [value for _, player_id in counters for value in (step, player_id)] +
+                       [game] + list(player_ids))
+
+    def _player_rating(self, cursor, column, player):
+        """Looks up a player and its current rating in one round trip
+
+        Args:
+            cursor (obj):   cursor of the open transaction
+            column (str):   player rating column, see statements.PLAYER_RATINGS
+            player (int):   player_id, or first name, last name and nickname
+
+        Returns:
+            player id and trueskill rating
 
         Raises:
-            DBConnectionError:  database connection issues
-            DBSyntaxError:      invalid database programming statement
+            DBValueError:   player does not exist
 
         """
 
-        all_teams = ()
-        self._logger.debug("Getting all fb teams from database")
-        try:
-            self.check_if_db_connected()
-            cursor = self._db_conn.cursor()
-            cursor.execute("SELECT team_id, team_name, time FROM team ORDER BY \
-time DESC")
-            teams = cursor.fetchall()
+        if isinstance(player, (int, long)):
+            statements.execute(cursor, 'player_' + column, (player,))
+        else:
+            statements.execute(cursor, 'player_{0}_by_name'.format(column), tuple(player))
+        row = cursor.fetchone()
+        if row is None:
+            raise exceptions.DBValueError("Player does not exist")
 
-            for team_id, name, timestamp in teams:
-                intermediate_teams = ()
-                intermediate_teams = intermediate_teams + (name,)
-                cursor.execute("SELECT player FROM player_team_xref WHERE \
-team = {0}".format(team_id))
-                players = cursor.fetchall()
-                for player in players:
-                    cursor.execute("SELECT first_name, last_name, nickname \
-FROM player WHERE player_id = {0}".format(player[0]))
-                    first_name, last_name, nickname = cursor.fetchall()[0]
+        player_id, mu, sigma = row
+        return player_id, trueskill.Rating(mu=float(mu), sigma=float(sigma))
 
-                    intermediate_teams = intermediate_teams + (first_name,
-                        last_name, nickname)
+    def _store_rating(self, cursor, owner, column, owner_id, rating):
+        """Stores a new rating and points the player or team at it
 
-                intermediate_teams = intermediate_teams + (timestamp.strftime('%Y-%m-%d'),)
-                all_teams = all_teams + (intermediate_teams,)
-                del intermediate_teams
+        Args:
+            cursor (obj):   cursor of the open transaction
+            owner (str):    'player' or 'team'
+            column (str):   rating column of the owner
+            owner_id (int): player or team id
+            rating (obj):   trueskill rating
 
-        except MySQLdb.OperationalError:
-            self._logger.error("MySQL operational error occured")
-            traceback.print_exc()
-            raise exceptions.DBConnectionError("Cannot connect to MySQL server")
+        """
 
-        except MySQLdb.ProgrammingError:
-            self._logger.error("MySQL programming error")
-            traceback.print_exc()
-            raise exceptions.DBSyntaxError("MySQL syntax error")
+        statements.execute(cursor, 'insert_rating', (rating.mu, rating.sigma))
+        rating_id = cursor.lastrowid
+        statements.execute(cursor, 'set_{0}_{1}'.format(owner, column),
+                           (rating_id, owner_id))
+        statements.execute(cursor, 'insert_{0}_hist'.format(column),
+                           (rating_id, owner_id))
 
-        else:
-            return all_teams
+    def _refresh_standing(self, cursor, player_id, game, counter=None, step=1):
+        """Copies a player's current rating into the standing table
 
-    def get_total_fb_teams(self):
-        """Method to get total fb teams from database
+        Must run on the cursor of the transaction that changed the rating,
+        after the player row points at the new rating, so the standing
+        commits or rolls back together with it.
 
-        Returns:
-            total number of teams
+        Args:
+            cursor (obj):       cursor of the open transaction
+            player_id (int):    player whose standing changed
+            game (str):         standing game, see STANDING_RATING_COLUMNS
+            counter (str):      counter column to adjust, if any
+            step (int):         amount added to the counter
 
-        Raises:
-            DBConnectionError:  database connection issues
-            DBSyntaxError:      invalid database programming statement
+        """
+
+        counter_update = ""
+        params = [game, player_id]
+        if counter:
+            counter_update = ", {0} = {0} + %s".format(counter)
+            params.append(step)
+
+        cursor.execute("INSERT INTO standing (player_id, game, mu, sigma, score) \
+SELECT player.player_id, %s, rating.mu, rating.sigma, rating.mu - 3 * rating.sigma \
+FROM player JOIN rating ON rating.rating_id = player.{0} \
+WHERE player.player_id = %s \
+ON DUPLICATE KEY UPDATE mu = VALUES(mu), sigma = VALUES(sigma), \
+score = VALUES(score){1}".format(STANDING_RATING_COLUMNS[game], counter_update), params)
+
+    def _iter_result_rows(self, statement):
+        """Streams result rows from a server side cursor
+
+        The trailing timestamp column of every row is formatted as a date.
+        The cursor is closed once the rows are exhausted or the consumer
+        stops iterating, which frees the connection for the next statement.
+
+        Args:
+            statement (str):    result listing statement to execute
+
+        Yields:
+            result tuples
+
+        """
+
+        self.check_if_db_connected()
+        cursor = self._db_conn.cursor(connection_health.SSCursor)
+        try:
+            cursor.execute(statement)
+            for result in cursor:
+                yield result[:-1] + (result[-1].strftime('%Y-%m-%d'),)
+        finally:
+            cursor.close()
+
+    def _iter_export(self, dataset, file_format):
+        """Streams the chunks of an export, see export
+
+        Args:
+            dataset (str):      dataset to export
+            file_format (str):  format to encode
+
+        Yields:
+            byte strings making up the file
 
         """
 
-        self._logger.debug("Getting total fb teams from database")
         try:
             self.check_if_db_connected()
-            cursor = self._db_conn.cursor()
-            cursor.execute("SELECT COUNT(team_id) FROM team")
-            count = cursor.fetchone()[0]
+            for chunk in result_export.iter_export(
+                    self._db_conn, dataset, file_format,
+                    self._config.getint('options', 'export_chunk_rows')):
+                yield chunk
 
         except MySQLdb.OperationalError:
             self._logger.error("MySQL operational error occured")
@@ -3398,92 +3089,158 @@ FROM player WHERE player_id = {0}".format(player[0]))
             traceback.print_exc()
             raise exceptions.DBSyntaxError("MySQL syntax error")
 
-        else:
-            return count
+    def _get_leaderboard(self, game, kind, load):
+        """Returns a cached leaderboard, loading it on a miss
 
-    def add_fb_team(self, team_name, member_one, member_two):
-        """Method to add a fb team to database
+        Cached values are tagged with the data version they were loaded at
+        and only served while it is current, so a write committed by any
+        process invalidates them. The version is read before the value is
+        loaded, so a value whose load overlapped a write carries the older
+        version and is never served again.
 
         Args:
-            team_name (str):    team name
-            member_one (tup):   first member names
-            member_two (tup):   second member names
+            game (str):         game the leaderboard belongs to
+            kind (str):         leaderboard type within the game
+            load (callable):    function querying the leaderboard
 
-        Raises:
-            DBValueError:       invalid db entry
-            DBConnectionError:  database connection issues
-            DBSyntaxError:      invalid database programming statement
+        Returns:
+            leaderboard value
 
         """
 
-        if len(team_name) is 0:
-            raise exceptions.DBValueError("Team name must be at \
-least one character")
+        key = (game, kind)
+        version = self.get_data_versions()[game][0]
+        with self._leaderboard_lock:
+            cached = self._leaderboards.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
 
-        if len(member_one) != 3:
-            raise exceptions.DBValueError("First team member must\
- be complete")
+        value = load()
 
-        if len(member_two) != 3:
-            raise exceptions.DBValueError("Second team member must\
- be complete")
+        with self._leaderboard_lock:
+            self._leaderboards[key] = (version, value)
+        return value
 
-        if member_one == member_two:
-            raise exceptions.DBValueError("Team members must be different players")
+    def _bump_data_versions(self, cursor, *games):
+        """Bumps the data versions of the given games, or of every game
 
-        if self.check_if_team_exists(team_name=team_name):
-            raise exceptions.DBValueError("Team already exists")
+        Every write method calls this in its transaction, right before
+        committing, so cached leaderboards and pages validated against the
+        versions stop matching in every process once the write is visible.
 
-        if self.check_if_two_players_on_team(member_one, member_two):
-            raise exceptions.DBValueError("Players already on team together")
+        Args:
+            cursor (Cursor):    cursor of the writing transaction
+            games (str):        games whose data changed, none for all games
+
+        """
+
+        data_versions.bump(cursor, games or data_versions.GAMES)
+        self._forget_data_versions()
+
+    def _forget_data_versions(self):
+        """Drops the data versions read by the current thread, see get_data_versions"""
+
+        self._local.data_versions = None
+
+    def _check_schema(self):
+        """Applies or reports pending migrations at startup
+
+        Only the schema version is read when the database is up to date, so
+        starting a worker runs no DDL. Pending migrations are applied when
+        auto_migrate is enabled and left to the migrate command otherwise.
+
+        """
 
-        self._logger.debug("Adding fb team to database")
         try:
-            self.check_if_db_connected()
-            cursor = self._db_conn.cursor()
-            fb_rating_id = self.create_new_default_rating()
-            mk_rating_id = self.create_new_default_rating()
-            mp_rating_id = self.create_new_default_rating()
-            ss_rating_id = self.create_new_default_rating()
-            cursor.execute("INSERT INTO team (team_name, fb_team_rating, mk_team_rating, \
-mp_team_rating, ss_team_rating) VALUES ('{0}', {1}, {2}, {3}, {4})".format(
-    team_name, fb_rating_id, mk_rating_id, mp_rating_id, ss_rating_id))
-
-            team_id = cursor.lastrowid
-
-            cursor.execute("INSERT INTO fb_team_rating_hist (rating, team) VALUES ({0}, {1}\
-)".format(fb_rating_id, team_id))
-            cursor.execute("INSERT INTO mk_team_rating_hist (rating, team) VALUES ({0}, {1}\
-)".format(mk_rating_id, team_id))
-            cursor.execute("INSERT INTO mp_team_rating_hist (rating, team) VALUES ({0}, {1}\
-)".format(mp_rating_id, team_id))
-            cursor.execute("INSERT INTO ss_team_rating_hist (rating, team) VALUES ({0}, {1}\
-)".format(ss_rating_id, team_id))
-
-            cursor.execute("INSERT INTO player_team_xref (player, team) \
-VALUES ((SELECT player_id FROM player WHERE first_name = '{0}' AND last_name \
-= '{1}' AND nickname = '{2}'), {3})".format(member_one[0], member_one[1],
-                member_one[2], team_id))
-
-            cursor.execute("INSERT INTO player_team_xref (player, team) \
-VALUES ((SELECT player_id FROM player WHERE first_name = '{0}' AND last_name \
-= '{1}' AND nickname = '{2}'), {3})".format(member_two[0], member_two[1],
-                member_two[2], team_id))
+            pending = migrations.get_pending_migrations(self._db_conn)
+            if not pending:
+                return
+            if self._config.getboolean('options', 'auto_migrate'):
+                self.migrate()
+            else:
+                self._logger.warning("%d schema migrations pending, run 'elo_frontend migrate'",
+                                     len(pending))
+        finally:
+            self.release_connection()
 
-            self._db_conn.commit()
+    def _wait_for_database(self):
+        """Blocks until the database accepts connections
 
-        except MySQLdb.OperationalError:
-            self._logger.error("MySQL operational error occured")
-            traceback.print_exc()
-            raise exceptions.DBConnectionError("Cannot connect to MySQL server")
+        Connection attempts are retried with exponential backoff until
+        db_ready_timeout seconds have passed, and no attempt outlasts the
+        deadline. Rejected credentials and unknown databases fail at once.
 
-        except MySQLdb.ProgrammingError:
-            self._logger.error("MySQL programming error")
-            traceback.print_exc()
-            raise exceptions.DBSyntaxError("MySQL syntax error")
+        Raises:
+            DBConnectionError:  database not ready before the deadline, or
+                                refused the connection
 
-        else:
-            return team_id
+        """
+
+        timeout = self._config.getfloat('options', 'db_ready_timeout')
+        delay = self._config.getfloat('options', 'db_ready_backoff')
+        start = time.time()
+        deadline = start + timeout
+
+        while True:
+            try:
+                self._connect(max(deadline - time.time(), 0)).close()
+            except MySQLdb.OperationalError as error:
+                if error.args[0] in DB_FATAL_ERRORS:
+                    self._logger.error("Database refused the connection: %s", error.args[-1])
+                    raise exceptions.DBConnectionError("Cannot connect to MySQL server")
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    self._logger.error("Database not ready after %.1f seconds", timeout)
+                    raise exceptions.DBConnectionError("Cannot connect to MySQL server")
+                self._logger.debug("Database not ready (%s), retrying in %.2f seconds",
+                                   error.args[-1], min(delay, remaining))
+                time.sleep(min(delay, remaining))
+                delay = min(delay * 2, DB_READY_MAX_BACKOFF)
+            else:
+                break
+
+        self._logger.info("Database ready after %.2f seconds", time.time() - start)
+
+    def _replace_connection(self, connection):
+        """Swaps a dropped connection for a fresh one from the pool
+
+        The fresh connection becomes the current thread's if the dropped
+        one was, and callers still holding the dropped one are forwarded.
+
+        Args:
+            connection (obj):   dropped connection
+
+        Returns:
+            fresh connection
+
+        Raises:
+            DBConnectionError:  no connection freed up before the pool timeout
+
+        """
+
+        self._logger.info("Database connection dropped, reconnecting...")
+        current = getattr(self._local, 'connection', None) is connection
+        self._pool.discard(connection)
+        if current:
+            self._local.connection = None
+        fresh = self._pool.acquire()
+        connection.replaced_by = fresh
+        if current:
+            self._local.connection = fresh
+        return fresh
+
+    def _connect(self, timeout=None):
+
+        # MySQLdb takes whole seconds, and 0 would mean no timeout at all
+        connect_timeout = self._config.getfloat('options', 'db_connect_timeout')
+        if timeout is not None:
+            connect_timeout = min(connect_timeout, timeout)
+        connection = connection_health.Connection(
+            user=self._db_user, passwd=self._db_pass, host=self._db_host,
+            port=int(self._db_port), db=self._db_name,
+            connect_timeout=max(int(math.ceil(connect_timeout)), 1))
+        connection.replace = functools.partial(self._replace_connection, connection)
+        return connection
 
     def _configure(self):
 
@@ -3512,7 +3269,7 @@ VALUES ((SELECT player_id FROM player WHERE first_name = '{0}' AND last_name \
             self._logger.addHandler(file_handle)
 
         # get log level from config file
-        self._config = ConfigParser.RawConfigParser()
+        self._config = ConfigParser.RawConfigParser(OPTION_DEFAULTS)
         self._config.read(self._config_file)
 
         if self._config.get('logger', 'level') == 'DEBUG':
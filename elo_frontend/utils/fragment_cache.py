@@ -0,0 +1,86 @@
+"""@package fragment_cache
+Fragment Cache
+
+This script caches rendered HTML fragments with least recently used eviction.
+
+@file fragment_cache.py
+
+@author Tyler Shake
+
+@par Notifications:
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The below copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+@copyright Copyright 2019 Tyler Shake
+"""
+
+import collections
+import threading
+
+class FragmentCache(object):
+    """A least recently used cache of rendered HTML fragments.
+
+    Once the cached fragments hold more than max_size characters, the
+    least recently used ones are evicted. Keys are expected to include the
+    data versions a fragment was rendered from, so fragments of outdated
+    versions are never hit again and age out.
+
+    Args:
+        max_size (int): cap on the total length of the cached fragments,
+                        in characters
+
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._fragments = collections.OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get_or_render(self, key, render):
+        """Returns the fragment cached under key, rendering it on a miss
+
+        A fragment larger than max_size is returned but not cached.
+
+        Args:
+            key (tup):      hashable fragment key
+            render (func):  renders the fragment, takes no arguments
+
+        Returns:
+            rendered fragment
+
+        """
+
+        with self._lock:
+            fragment = self._fragments.pop(key, None)
+            if fragment is not None:
+                # reinserted as the most recently used
+                self._fragments[key] = fragment
+                return fragment
+
+        fragment = render()
+
+        with self._lock:
+            if len(fragment) <= self.max_size and key not in self._fragments:
+                self._fragments[key] = fragment
+                self._size += len(fragment)
+                while self._size > self.max_size:
+                    _, evicted = self._fragments.popitem(last=False)
+                    self._size -= len(evicted)
+        return fragment
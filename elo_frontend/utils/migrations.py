@@ -0,0 +1,849 @@
+"""@package migrations
+Database schema migrations
+
+This script contains the ordered database schema migrations.
+
+@file migrations.py
+
+@author Tyler Shake
+
+@par Notifications:
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The below copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+@copyright Copyright 2019 Tyler Shake
+
+"""
+
+import MySQLdb
+
+import elo_frontend.utils.exceptions as exceptions
+
+# MySQL error raised when a table does not exist yet
+NO_SUCH_TABLE = 1146
+
+# advisory lock serializing concurrent migration runs
+MIGRATION_LOCK = 'elo_frontend_migrate'
+MIGRATION_LOCK_TIMEOUT = 60
+
+SCHEMA_VERSION_TABLE = "CREATE TABLE IF NOT EXISTS schema_version (\
+version INT NOT NULL,\
+description VARCHAR(255) NOT NULL,\
+time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\
+PRIMARY KEY (version))"
+
+# tables created before schema versioning existed; IF NOT EXISTS lets
+# databases created by older releases adopt this migration unchanged
+INITIAL_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS rating (\
+rating_id INT NOT NULL AUTO_INCREMENT,\
+mu DECIMAL(6,4) NOT NULL,\
+sigma DECIMAL(6,4) NOT NULL,\
+time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\
+PRIMARY KEY (rating_id),\
+UNIQUE INDEX rating_id_UNIQUE (rating_id ASC))",
+    "CREATE TABLE IF NOT EXISTS player (\
+player_id INT NOT NULL AUTO_INCREMENT,\
+first_name VARCHAR(45) NOT NULL,\
+last_name VARCHAR(45) NOT NULL,\
+nickname VARCHAR(45) NULL,\
+time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\
+fb_offense_rating INT NOT NULL,\
+fb_defense_rating INT NOT NULL,\
+mk_ind_rating INT NOT NULL,\
+mp_ind_rating INT NOT NULL,\
+ss_ind_rating INT NOT NULL,\
+pp_ind_rating INT NOT NULL,\
+PRIMARY KEY (player_id),\
+UNIQUE INDEX player_id_UNIQUE (player_id ASC),\
+INDEX fb_offense_rating_idx (fb_offense_rating ASC),\
+INDEX fb_defense_rating_idx (fb_defense_rating ASC),\
+INDEX mk_rating_ind_idx (mk_ind_rating ASC),\
+INDEX mp_rating_ind_idx (mp_ind_rating ASC),\
+INDEX ss_rating_ind_idx (ss_ind_rating ASC),\
+INDEX pp_rating_ind_idx (pp_ind_rating ASC),\
+CONSTRAINT fb_offense_rating \
+FOREIGN KEY (fb_offense_rating) \
+REFERENCES rating (rating_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION,\
+CONSTRAINT fb_defense_rating \
+FOREIGN KEY (fb_defense_rating) \
+REFERENCES rating (rating_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION,\
+CONSTRAINT mk_ind_rating \
+FOREIGN KEY (mk_ind_rating) \
+REFERENCES rating (rating_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION,\
+CONSTRAINT mp_ind_rating \
+FOREIGN KEY (mp_ind_rating) \
+REFERENCES rating (rating_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION,\
+CONSTRAINT ss_ind_rating \
+FOREIGN KEY (ss_ind_rating) \
+REFERENCES rating (rating_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION,\
+CONSTRAINT pp_ind_rating \
+FOREIGN KEY (pp_ind_rating) \
+REFERENCES rating (rating_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION)",
+    "CREATE TABLE IF NOT EXISTS team (\
+team_id INT NOT NULL AUTO_INCREMENT,\
+team_name VARCHAR(75) NOT NULL,\
+time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\
+fb_team_rating INT NOT NULL,\
+mk_team_rating INT NOT NULL,\
+mp_team_rating INT NOT NULL,\
+ss_team_rating INT NOT NULL,\
+PRIMARY KEY (team_id),\
+UNIQUE INDEX team_id_UNIQUE (team_id ASC),\
+UNIQUE INDEX team_name_UNIQUE (team_name ASC),\
+INDEX fb_team_rating_idx (fb_team_rating ASC),\
+INDEX mk_team_rating_idx (mk_team_rating ASC),\
+INDEX mp_team_rating_idx (mp_team_rating ASC),\
+INDEX ss_team_rating_idx (ss_team_rating ASC),\
+CONSTRAINT fb_team_rating \
+FOREIGN KEY (fb_team_rating) \
+REFERENCES rating (rating_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION, \
+CONSTRAINT mk_team_rating \
+FOREIGN KEY (mk_team_rating) \
+REFERENCES rating (rating_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION, \
+CONSTRAINT mp_team_rating \
+FOREIGN KEY (mp_team_rating) \
+REFERENCES rating (rating_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION, \
+CONSTRAINT ss_team_rating \
+FOREIGN KEY (ss_team_rating) \
+REFERENCES rating (rating_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION)",
+    "CREATE TABLE IF NOT EXISTS player_team_xref (\
+player INT NOT NULL,\
+team INT NOT NULL,\
+INDEX player_idx (player ASC),\
+INDEX team_idx (team ASC),\
+CONSTRAINT player \
+FOREIGN KEY (player) \
+REFERENCES player (player_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION,\
+CONSTRAINT team \
+FOREIGN KEY (team) \
+REFERENCES team (team_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION)",
+    "CREATE TABLE IF NOT EXISTS fb_result (\
+result_id INT NOT NULL AUTO_INCREMENT,\
+offense_winner INT NOT NULL,\
+defense_winner INT NOT NULL,\
+offense_loser INT NOT NULL,\
+defense_loser INT NOT NULL,\
+time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\
+PRIMARY KEY (result_id),\
+UNIQUE INDEX result_id_UNIQUE (result_id ASC),\
+INDEX offense_winner_idx (offense_winner ASC),\
+INDEX defense_winner_idx (defense_winner ASC),\
+INDEX offense_loser_idx (offense_loser ASC),\
+INDEX defense_loser_idx (defense_loser ASC),\
+CONSTRAINT offense_winner \
+FOREIGN KEY (offense_winner) \
+REFERENCES player (player_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION,\
+CONSTRAINT defense_winner \
+FOREIGN KEY (defense_winner) \
+REFERENCES player (player_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION,\
+CONSTRAINT offense_loser \
+FOREIGN KEY (offense_loser) \
+REFERENCES player (player_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION,\
+CONSTRAINT defense_loser \
+FOREIGN KEY (defense_loser) \
+REFERENCES player (player_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION)",
+    "CREATE TABLE IF NOT EXISTS mk_ind_result (\
+result_id INT NOT NULL AUTO_INCREMENT,\
+mk_ind_first INT NOT NULL,\
+mk_ind_second INT NOT NULL,\
+mk_ind_third INT NULL,\
+mk_ind_fourth INT NULL,\
+course VARCHAR(75) NOT NULL,\
+time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\
+PRIMARY KEY (result_id),\
+UNIQUE INDEX result_id_UNIQUE (result_id ASC),\
+INDEX mk_ind_first_idx (mk_ind_first ASC),\
+INDEX mk_ind_second_idx (mk_ind_second ASC),\
+INDEX mk_ind_third_idx (mk_ind_third ASC),\
+INDEX mk_ind_fourth_idx (mk_ind_fourth ASC),\
+CONSTRAINT mk_ind_first \
+FOREIGN KEY (mk_ind_first) \
+REFERENCES player (player_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION,\
+CONSTRAINT mk_ind_second \
+FOREIGN KEY (mk_ind_second) \
+REFERENCES player (player_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION,\
+CONSTRAINT mk_ind_third \
+FOREIGN KEY (mk_ind_third) \
+REFERENCES player (player_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION,\
+CONSTRAINT mk_ind_fourth \
+FOREIGN KEY (mk_ind_fourth) \
+REFERENCES player (player_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION)",
+    "CREATE TABLE IF NOT EXISTS mk_team_result (\
+result_id INT NOT NULL AUTO_INCREMENT,\
+mk_team_first INT NOT NULL,\
+mk_team_second INT NOT NULL,\
+time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\
+PRIMARY KEY (result_id),\
+UNIQUE INDEX result_id_UNIQUE (result_id ASC),\
+INDEX mk_team_first_idx (mk_team_first ASC),\
+INDEX mk_team_second_idx (mk_team_second ASC),\
+CONSTRAINT mk_team_first \
+FOREIGN KEY (mk_team_first) \
+REFERENCES team (team_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION,\
+CONSTRAINT mk_team_second \
+FOREIGN KEY (mk_team_second) \
+REFERENCES team (team_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION)",
+    "CREATE TABLE IF NOT EXISTS mp_ind_result (\
+result_id INT NOT NULL AUTO_INCREMENT,\
+mp_ind_first INT NOT NULL,\
+mp_first_char VARCHAR(75) NOT NULL,\
+mp_ind_second INT NOT NULL,\
+mp_second_char VARCHAR(75) NOT NULL,\
+mp_ind_third INT NULL,\
+mp_third_char VARCHAR(75) NOT NULL,\
+mp_ind_fourth INT NULL,\
+mp_fourth_char VARCHAR(75) NOT NULL,\
+board VARCHAR(75) NOT NULL,\
+time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\
+PRIMARY KEY (result_id),\
+UNIQUE INDEX result_id_UNIQUE (result_id ASC),\
+INDEX mp_ind_first_idx (mp_ind_first ASC),\
+INDEX mp_ind_second_idx (mp_ind_second ASC),\
+INDEX mp_ind_third_idx (mp_ind_third ASC),\
+INDEX mp_ind_fourth_idx (mp_ind_fourth ASC),\
+CONSTRAINT mp_ind_first \
+FOREIGN KEY (mp_ind_first) \
+REFERENCES player (player_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION,\
+CONSTRAINT mp_ind_second \
+FOREIGN KEY (mp_ind_second) \
+REFERENCES player (player_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION,\
+CONSTRAINT mp_ind_third \
+FOREIGN KEY (mp_ind_third) \
+REFERENCES player (player_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION,\
+CONSTRAINT mp_ind_fourth \
+FOREIGN KEY (mp_ind_fourth) \
+REFERENCES player (player_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION)",
+    "CREATE TABLE IF NOT EXISTS mp_team_result (\
+result_id INT NOT NULL AUTO_INCREMENT,\
+mp_team_first INT NOT NULL,\
+mp_team_second INT NOT NULL,\
+time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\
+PRIMARY KEY (result_id),\
+UNIQUE INDEX result_id_UNIQUE (result_id ASC),\
+INDEX mp_team_first_idx (mp_team_first ASC),\
+INDEX mp_team_second_idx (mp_team_second ASC),\
+CONSTRAINT mp_team_first \
+FOREIGN KEY (mp_team_first) \
+REFERENCES team (team_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION,\
+CONSTRAINT mp_team_second \
+FOREIGN KEY (mp_team_second) \
+REFERENCES team (team_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION)",
+    "CREATE TABLE IF NOT EXISTS ss_ind_result (\
+result_id INT NOT NULL AUTO_INCREMENT,\
+ss_ind_first INT NOT NULL,\
+ss_first_char VARCHAR(75) NOT NULL,\
+ss_ind_second INT NOT NULL,\
+ss_second_char VARCHAR(75) NOT NULL,\
+ss_ind_third INT NULL,\
+ss_third_char VARCHAR(75) NULL,\
+ss_ind_fourth INT NULL,\
+ss_fourth_char VARCHAR(75) NULL,\
+ss_ind_fifth INT NULL,\
+ss_fifth_char VARCHAR(75) NULL,\
+ss_ind_sixth INT NULL,\
+ss_sixth_char VARCHAR(75) NULL,\
+ss_ind_seventh INT NULL,\
+ss_seventh_char VARCHAR(75) NULL,\
+ss_ind_eighth INT NULL,\
+ss_eighth_char VARCHAR(75) NULL,\
+time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\
+PRIMARY KEY (result_id),\
+UNIQUE INDEX result_id_UNIQUE (result_id ASC),\
+INDEX ss_ind_first_idx (ss_ind_first ASC),\
+INDEX ss_ind_second_idx (ss_ind_second ASC),\
+INDEX ss_ind_third_idx (ss_ind_third ASC),\
+INDEX ss_ind_fourth_idx (ss_ind_fourth ASC),\
+INDEX ss_ind_fifth_idx (ss_ind_fifth ASC),\
+INDEX ss_ind_sixth_idx (ss_ind_sixth ASC),\
+INDEX ss_ind_seventh_idx (ss_ind_seventh ASC),\
+INDEX ss_ind_eighth_idx (ss_ind_eighth ASC),\
+CONSTRAINT ss_ind_first \
+FOREIGN KEY (ss_ind_first) \
+REFERENCES player (player_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION,\
+CONSTRAINT ss_ind_second \
+FOREIGN KEY (ss_ind_second) \
+REFERENCES player (player_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION,\
+CONSTRAINT ss_ind_third \
+FOREIGN KEY (ss_ind_third) \
+REFERENCES player (player_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION,\
+CONSTRAINT ss_ind_fourth \
+FOREIGN KEY (ss_ind_fourth) \
+REFERENCES player (player_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION, \
+CONSTRAINT ss_ind_fifth \
+FOREIGN KEY (ss_ind_fifth) \
+REFERENCES player (player_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION,\
+CONSTRAINT ss_ind_sixth \
+FOREIGN KEY (ss_ind_sixth) \
+REFERENCES player (player_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION,\
+CONSTRAINT ss_ind_seventh \
+FOREIGN KEY (ss_ind_seventh) \
+REFERENCES player (player_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION,\
+CONSTRAINT ss_ind_eighth \
+FOREIGN KEY (ss_ind_eighth) \
+REFERENCES player (player_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION)",
+    "CREATE TABLE IF NOT EXISTS ss_team_result (\
+result_id INT NOT NULL AUTO_INCREMENT,\
+ss_team_first INT NOT NULL,\
+ss_team_second INT NOT NULL,\
+ss_team_third INT NULL,\
+ss_team_fourth INT NULL,\
+time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\
+PRIMARY KEY (result_id),\
+UNIQUE INDEX result_id_UNIQUE (result_id ASC),\
+INDEX ss_team_first_idx (ss_team_first ASC),\
+INDEX ss_team_second_idx (ss_team_second ASC),\
+INDEX ss_team_third_idx (ss_team_third ASC),\
+INDEX ss_team_fourth_idx (ss_team_fourth ASC),\
+CONSTRAINT ss_team_first \
+FOREIGN KEY (ss_team_first) \
+REFERENCES team (team_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION,\
+CONSTRAINT ss_team_second \
+FOREIGN KEY (ss_team_second) \
+REFERENCES team (team_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION,\
+CONSTRAINT ss_team_third \
+FOREIGN KEY (ss_team_third) \
+REFERENCES team (team_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION,\
+CONSTRAINT ss_team_fourth \
+FOREIGN KEY (ss_team_fourth) \
+REFERENCES team (team_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION)",
+    "CREATE TABLE IF NOT EXISTS pp_result (\
+result_id INT NOT NULL AUTO_INCREMENT,\
+pp_winner INT NOT NULL,\
+pp_loser INT NOT NULL,\
+time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\
+PRIMARY KEY (result_id),\
+UNIQUE INDEX result_id_UNIQUE (result_id ASC),\
+INDEX pp_winner_idx (pp_winner ASC),\
+INDEX pp_loser_idx (pp_loser ASC),\
+CONSTRAINT pp_winner \
+FOREIGN KEY (pp_winner) \
+REFERENCES player (player_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION,\
+CONSTRAINT pp_loser \
+FOREIGN KEY (pp_loser) \
+REFERENCES player (player_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION)",
+    "CREATE TABLE IF NOT EXISTS fb_offense_rating_hist (\
+rating INT NOT NULL,\
+player INT NOT NULL,\
+time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\
+INDEX rating_idx (rating ASC),\
+INDEX player_idx (player ASC),\
+CONSTRAINT fb_offense_rating_hist \
+FOREIGN KEY (rating) \
+REFERENCES rating (rating_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION,\
+CONSTRAINT fb_offense_player_hist \
+FOREIGN KEY (player) \
+REFERENCES player (player_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION)",
+    "CREATE TABLE IF NOT EXISTS fb_defense_rating_hist (\
+rating INT NOT NULL,\
+player INT NOT NULL,\
+time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\
+INDEX rating_idx (rating ASC),\
+INDEX player_idx (player ASC),\
+CONSTRAINT fb_defense_rating_hist \
+FOREIGN KEY (rating) \
+REFERENCES rating (rating_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION,\
+CONSTRAINT fb_defense_player_hist \
+FOREIGN KEY (player) \
+REFERENCES player (player_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION)",
+    "CREATE TABLE IF NOT EXISTS fb_team_rating_hist (\
+rating INT NOT NULL,\
+team INT NOT NULL,\
+time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\
+INDEX rating_idx (rating ASC),\
+INDEX team_idx (team ASC),\
+CONSTRAINT fb_team_rating_hist \
+FOREIGN KEY (rating) \
+REFERENCES rating (rating_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION,\
+CONSTRAINT fb_team_player_hist \
+FOREIGN KEY (team) \
+REFERENCES team (team_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION)",
+    "CREATE TABLE IF NOT EXISTS mk_team_rating_hist (\
+rating INT NOT NULL,\
+team INT NOT NULL,\
+time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\
+INDEX rating_idx (rating ASC),\
+INDEX team_idx (team ASC),\
+CONSTRAINT mk_team_rating_hist \
+FOREIGN KEY (rating) \
+REFERENCES rating (rating_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION,\
+CONSTRAINT mk_team_player_hist \
+FOREIGN KEY (team) \
+REFERENCES team (team_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION)",
+    "CREATE TABLE IF NOT EXISTS mk_ind_rating_hist (\
+rating INT NOT NULL,\
+player INT NOT NULL,\
+time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\
+INDEX rating_idx (rating ASC),\
+INDEX player_idx (player ASC),\
+CONSTRAINT mk_ind_rating_hist \
+FOREIGN KEY (rating) \
+REFERENCES rating (rating_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION,\
+CONSTRAINT mk_ind_player_hist \
+FOREIGN KEY (player) \
+REFERENCES player (player_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION)",
+    "CREATE TABLE IF NOT EXISTS mp_team_rating_hist (\
+rating INT NOT NULL,\
+team INT NOT NULL,\
+time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\
+INDEX rating_idx (rating ASC),\
+INDEX team_idx (team ASC),\
+CONSTRAINT mp_team_rating_hist \
+FOREIGN KEY (rating) \
+REFERENCES rating (rating_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION,\
+CONSTRAINT mp_team_player_hist \
+FOREIGN KEY (team) \
+REFERENCES team (team_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION)",
+    "CREATE TABLE IF NOT EXISTS mp_ind_rating_hist (\
+rating INT NOT NULL,\
+player INT NOT NULL,\
+time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\
+INDEX rating_idx (rating ASC),\
+INDEX player_idx (player ASC),\
+CONSTRAINT mp_ind_rating_hist \
+FOREIGN KEY (rating) \
+REFERENCES rating (rating_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION,\
+CONSTRAINT mp_ind_player_hist \
+FOREIGN KEY (player) \
+REFERENCES player (player_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION)",
+    "CREATE TABLE IF NOT EXISTS ss_team_rating_hist (\
+rating INT NOT NULL,\
+team INT NOT NULL,\
+time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\
+INDEX rating_idx (rating ASC),\
+INDEX team_idx (team ASC),\
+CONSTRAINT ss_team_rating_hist \
+FOREIGN KEY (rating) \
+REFERENCES rating (rating_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION,\
+CONSTRAINT ss_team_player_hist \
+FOREIGN KEY (team) \
+REFERENCES team (team_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION)",
+    "CREATE TABLE IF NOT EXISTS ss_ind_rating_hist (\
+rating INT NOT NULL,\
+player INT NOT NULL,\
+time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\
+INDEX rating_idx (rating ASC),\
+INDEX player_idx (player ASC),\
+CONSTRAINT ss_ind_rating_hist \
+FOREIGN KEY (rating) \
+REFERENCES rating (rating_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION,\
+CONSTRAINT ss_ind_player_hist \
+FOREIGN KEY (player) \
+REFERENCES player (player_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION)",
+    "CREATE TABLE IF NOT EXISTS pp_ind_rating_hist (\
+rating INT NOT NULL,\
+player INT NOT NULL,\
+time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\
+INDEX rating_idx (rating ASC),\
+INDEX player_idx (player ASC),\
+CONSTRAINT pp_ind_rating_hist \
+FOREIGN KEY (rating) \
+REFERENCES rating (rating_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION,\
+CONSTRAINT pp_ind_player_hist \
+FOREIGN KEY (player) \
+REFERENCES player (player_id) \
+ON DELETE NO ACTION \
+ON UPDATE NO ACTION)",
+)
+
+# current rating and result counters per player and game, backfilled from
+# the ratings players point to and the results recorded so far
+STANDINGS = (
+    "CREATE TABLE IF NOT EXISTS standing (\
+player_id INT NOT NULL,\
+game VARCHAR(16) NOT NULL,\
+mu DECIMAL(6,4) NOT NULL,\
+sigma DECIMAL(6,4) NOT NULL,\
+score DECIMAL(7,4) NOT NULL,\
+wins INT NOT NULL DEFAULT 0,\
+losses INT NOT NULL DEFAULT 0,\
+first_place INT NOT NULL DEFAULT 0,\
+second_place INT NOT NULL DEFAULT 0,\
+third_place INT NOT NULL DEFAULT 0,\
+PRIMARY KEY (player_id, game),\
+INDEX standing_score_idx (game ASC, score ASC),\
+CONSTRAINT standing_player \
+FOREIGN KEY (player_id) \
+REFERENCES player (player_id) \
+ON DELETE CASCADE \
+ON UPDATE NO ACTION)",
+    "REPLACE INTO standing (player_id, game, mu, sigma, score, wins, losses) \
+SELECT player.player_id, 'pp', rating.mu, rating.sigma, rating.mu - 3 * rating.sigma, \
+(SELECT COUNT(*) FROM pp_result WHERE pp_result.pp_winner = player.player_id), \
+(SELECT COUNT(*) FROM pp_result WHERE pp_result.pp_loser = player.player_id) \
+FROM player JOIN rating ON rating.rating_id = player.pp_ind_rating",
+    "REPLACE INTO standing (player_id, game, mu, sigma, score, wins, losses) \
+SELECT player.player_id, 'fb_offense', rating.mu, rating.sigma, rating.mu - 3 * rating.sigma, \
+(SELECT COUNT(*) FROM fb_result WHERE fb_result.offense_winner = player.player_id), \
+(SELECT COUNT(*) FROM fb_result WHERE fb_result.offense_loser = player.player_id) \
+FROM player JOIN rating ON rating.rating_id = player.fb_offense_rating",
+    "REPLACE INTO standing (player_id, game, mu, sigma, score, wins, losses) \
+SELECT player.player_id, 'fb_defense', rating.mu, rating.sigma, rating.mu - 3 * rating.sigma, \
+(SELECT COUNT(*) FROM fb_result WHERE fb_result.defense_winner = player.player_id), \
+(SELECT COUNT(*) FROM fb_result WHERE fb_result.defense_loser = player.player_id) \
+FROM player JOIN rating ON rating.rating_id = player.fb_defense_rating",
+    "REPLACE INTO standing (player_id, game, mu, sigma, score, first_place, second_place, third_place) \
+SELECT player.player_id, 'mk', rating.mu, rating.sigma, rating.mu - 3 * rating.sigma, \
+(SELECT COUNT(*) FROM mk_ind_result WHERE mk_ind_result.mk_ind_first = player.player_id), \
+(SELECT COUNT(*) FROM mk_ind_result WHERE mk_ind_result.mk_ind_second = player.player_id), \
+(SELECT COUNT(*) FROM mk_ind_result WHERE mk_ind_result.mk_ind_third = player.player_id) \
+FROM player JOIN rating ON rating.rating_id = player.mk_ind_rating",
+    "REPLACE INTO standing (player_id, game, mu, sigma, score, first_place, second_place, third_place) \
+SELECT player.player_id, 'ss', rating.mu, rating.sigma, rating.mu - 3 * rating.sigma, \
+(SELECT COUNT(*) FROM ss_ind_result WHERE ss_ind_result.ss_ind_first = player.player_id), \
+(SELECT COUNT(*) FROM ss_ind_result WHERE ss_ind_result.ss_ind_second = player.player_id), \
+(SELECT COUNT(*) FROM ss_ind_result WHERE ss_ind_result.ss_ind_third = player.player_id) \
+FROM player JOIN rating ON rating.rating_id = player.ss_ind_rating",
+)
+
+def _add_index(table, index, columns, unique=False):
+    """Builds a migration statement adding an index unless it exists
+
+    Every ALTER TABLE commits on its own, so a migration that failed part
+    way leaves its first indexes behind. Skipping those lets it run again.
+
+    Args:
+        table (str):    table to index
+        index (str):    name of the index
+        columns (str):  parenthesized index columns
+        unique (bool):  create a unique index
+
+    Returns:
+        function taking the migration's cursor
+
+    """
+
+    def add_index(cursor):
+        cursor.execute("SELECT COUNT(*) FROM information_schema.statistics \
+WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s", (table, index))
+        if not cursor.fetchone()[0]:
+            cursor.execute("ALTER TABLE {0} ADD {1}INDEX {2} {3}".format(
+                table, "UNIQUE " if unique else "", index, columns))
+    return add_index
+
+# result listers and replays read results in (time, result_id) order
+RESULT_TIME_INDEXES = (
+    _add_index('pp_result', 'pp_result_time_idx', "(time ASC, result_id ASC)"),
+    _add_index('fb_result', 'fb_result_time_idx', "(time ASC, result_id ASC)"),
+    _add_index('mk_ind_result', 'mk_ind_result_time_idx', "(time ASC, result_id ASC)"),
+    _add_index('ss_ind_result', 'ss_ind_result_time_idx', "(time ASC, result_id ASC)"),
+)
+
+def _check_player_names(cursor):
+    """Refuses to index player names while two players share one
+
+    Names compare case insensitively and a missing nickname matches an
+    empty one, as they will under the unique index, so "john" and "John"
+    conflict. Nothing is changed when duplicates exist; they have to be
+    renamed before migrating again.
+
+    Args:
+        cursor (obj):   cursor of the migration
+
+    Raises:
+        DBValueError:   players with duplicate names, listed in the message
+
+    """
+
+    cursor.execute("SELECT GROUP_CONCAT(player_id ORDER BY player_id), MIN(first_name), \
+MIN(last_name), MIN(IFNULL(nickname, '')) FROM player \
+GROUP BY first_name, last_name, IFNULL(nickname, '') HAVING COUNT(*) > 1")
+    duplicates = cursor.fetchall()
+    if duplicates:
+        raise exceptions.DBValueError("Rename players with duplicate names before \
+migrating: {0}".format("; ".join('players {0} named "{1} {2}" nickname "{3}"'.format(*duplicate)
+                                 for duplicate in duplicates)))
+
+# name lookups kept for callers that identify players by name; a NULL
+# nickname would let duplicate names past the unique index
+PLAYER_NAME_INDEX = (
+    _check_player_names,
+    "UPDATE player SET nickname = '' WHERE nickname IS NULL",
+    "ALTER TABLE player MODIFY nickname VARCHAR(45) NOT NULL DEFAULT ''",
+    _add_index('player', 'player_name_UNIQUE', "(first_name ASC, last_name ASC, nickname ASC)",
+               unique=True),
+)
+
+# team of each pair of players, smallest player_id first, backfilled from
+# the two member teams recorded so far
+TEAM_PAIRS = (
+    "CREATE TABLE IF NOT EXISTS team_pair (\
+min_player_id INT NOT NULL,\
+max_player_id INT NOT NULL,\
+team_id INT NOT NULL,\
+PRIMARY KEY (min_player_id, max_player_id),\
+UNIQUE INDEX team_pair_team_UNIQUE (team_id ASC),\
+INDEX team_pair_max_player_idx (max_player_id ASC),\
+CONSTRAINT team_pair_min_player \
+FOREIGN KEY (min_player_id) \
+REFERENCES player (player_id) \
+ON DELETE CASCADE \
+ON UPDATE NO ACTION,\
+CONSTRAINT team_pair_max_player \
+FOREIGN KEY (max_player_id) \
+REFERENCES player (player_id) \
+ON DELETE CASCADE \
+ON UPDATE NO ACTION,\
+CONSTRAINT team_pair_team \
+FOREIGN KEY (team_id) \
+REFERENCES team (team_id) \
+ON DELETE CASCADE \
+ON UPDATE NO ACTION)",
+    "INSERT IGNORE INTO team_pair (min_player_id, max_player_id, team_id) \
+SELECT MIN(player), MAX(player), team FROM player_team_xref \
+GROUP BY team HAVING COUNT(player) = 2 ORDER BY team",
+)
+
+# results waiting for their rating update, applied in job_id order per game
+RATING_JOBS = (
+    "CREATE TABLE IF NOT EXISTS rating_job (\
+job_id INT NOT NULL AUTO_INCREMENT,\
+game VARCHAR(16) NOT NULL,\
+result_id INT NOT NULL,\
+time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\
+PRIMARY KEY (job_id),\
+INDEX rating_job_game_idx (game ASC, job_id ASC))",
+)
+
+# version of the data of each game, bumped by every write transaction so all
+# processes validate cached pages against the same counters; they start at
+# the creation time, so validators of a recreated database never match
+DATA_VERSIONS = (
+    "CREATE TABLE IF NOT EXISTS data_version (\
+game VARCHAR(16) NOT NULL,\
+version BIGINT NOT NULL DEFAULT 0,\
+time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\
+PRIMARY KEY (game))",
+    "INSERT IGNORE INTO data_version (game, version) \
+VALUES ('player', UNIX_TIMESTAMP()), ('pp', UNIX_TIMESTAMP()), ('fb', UNIX_TIMESTAMP()), \
+('mk', UNIX_TIMESTAMP()), ('ss', UNIX_TIMESTAMP())",
+)
+
+# ordered schema migrations as (version, description, statements), where a
+# statement is SQL or a function run with the migration's cursor; every
+# statement can run again after a partial failure, as DDL commits implicitly
+MIGRATIONS = (
+    (1, "Initial schema", INITIAL_SCHEMA),
+    (2, "Current standings", STANDINGS),
+    (3, "Result time indexes", RESULT_TIME_INDEXES),
+    (4, "Player name index", PLAYER_NAME_INDEX),
+    (5, "Team pairs", TEAM_PAIRS),
+    (6, "Rating jobs", RATING_JOBS),
+    (7, "Data versions", DATA_VERSIONS),
+)
+
+def get_schema_version(connection):
+    """Gets the latest migration applied to the database
+
+    Args:
+        connection (obj):   database connection
+
+    Returns:
+        schema version, 0 for an unversioned database
+
+    """
+
+    cursor = connection.cursor()
+    try:
+        cursor.execute("SELECT MAX(version) FROM schema_version")
+    except MySQLdb.ProgrammingError as error:
+        if error.args[0] == NO_SUCH_TABLE:
+            return 0
+        raise
+    version = cursor.fetchone()[0]
+    return version or 0
+
+def get_pending_migrations(connection):
+    """Gets the migrations not yet applied to the database
+
+    Args:
+        connection (obj):   database connection
+
+    Returns:
+        list of (version, description, statements) tuples in order
+
+    """
+
+    version = get_schema_version(connection)
+    return [migration for migration in MIGRATIONS if migration[0] > version]
+
+def apply_migrations(connection, logger):
+    """Applies all pending migrations in order
+
+    Concurrent runs are serialized with a MySQL advisory lock, so only one
+    process applies a given step. Each step is recorded in schema_version
+    as soon as its statements complete.
+
+    Args:
+        connection (obj):   database connection
+        logger (obj):       logger for progress messages
+
+    Returns:
+        list of versions applied
+
+    Raises:
+        DBConnectionError:  migration lock not acquired in time
+
+    """
+
+    cursor = connection.cursor()
+    cursor.execute("SELECT GET_LOCK(%s, %s)", (MIGRATION_LOCK, MIGRATION_LOCK_TIMEOUT))
+    if not cursor.fetchone()[0]:
+        raise exceptions.DBConnectionError("Timed out waiting for migration lock")
+
+    try:
+        cursor.execute(SCHEMA_VERSION_TABLE)
+        applied = []
+        for version, description, statements in get_pending_migrations(connection):
+            logger.info("Applying schema migration %d: %s", version, description)
+            for statement in statements:
+                if callable(statement):
+                    statement(cursor)
+                else:
+                    cursor.execute(statement)
+            cursor.execute("INSERT INTO schema_version (version, description) \
+VALUES (%s, %s)", (version, description))
+            connection.commit()
+            applied.append(version)
+        return applied
+
+    finally:
+        cursor.execute("SELECT RELEASE_LOCK(%s)", (MIGRATION_LOCK,))
@@ -0,0 +1,67 @@
+"""@package production_server
+Production server
+
+This script serves the frontend from pre-forked gunicorn workers.
+
+@file production_server.py
+
+@author Tyler Shake
+
+@par Notifications:
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The below copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+@copyright Copyright 2019 Tyler Shake
+"""
+
+import gunicorn.app.base
+
+class ProductionServer(gunicorn.app.base.BaseApplication):
+    """Runs a WSGI application under a gunicorn arbiter
+
+    The arbiter forks the workers, restarts them gracefully on SIGHUP and
+    keeps client connections alive between requests when threads are used.
+
+    Args:
+        application (obj):  WSGI application to serve
+        options (dict):     gunicorn settings such as bind, workers and threads
+        post_fork (func):   called with no arguments in every worker right
+                            after it is forked, before it serves requests
+
+    """
+
+    def __init__(self, application, options, post_fork=None):
+        self._application = application
+        self._options = options
+        self._post_fork = post_fork
+        super(ProductionServer, self).__init__()
+
+    def load_config(self):
+        """Applies the server options to gunicorn's settings"""
+
+        for key, value in self._options.items():
+            self.cfg.set(key, value)
+
+        if self._post_fork is not None:
+            self.cfg.set('post_fork', lambda server, worker: self._post_fork())
+
+    def load(self):
+        """Returns the application each worker serves"""
+
+        return self._application
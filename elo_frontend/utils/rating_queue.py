@@ -0,0 +1,82 @@
+"""@package rating_queue
+Rating Queue
+
+This script applies queued rating updates on a background thread.
+
+@file rating_queue.py
+
+@author Tyler Shake
+
+@par Notifications:
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The below copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+@copyright Copyright 2019 Tyler Shake
+"""
+
+import threading
+
+class RatingWorker(object):
+    """A background thread applying queued rating updates.
+
+    The thread wakes when a result is queued and at least every poll
+    interval, so updates queued by other processes, or left behind by a
+    process that exited, are applied as well. A failed pass is logged and
+    retried on the next wake up.
+
+    Args:
+        apply (func):           applies every queued update, takes no
+                                arguments
+        poll_interval (float):  longest wait between passes, in seconds
+        logger (obj):           logger for failed passes
+
+    """
+
+    def __init__(self, apply, poll_interval, logger):
+        self._apply = apply
+        self._poll_interval = poll_interval
+        self._logger = logger
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        """Starts the thread unless it is already running"""
+
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='rating-worker')
+                self._thread.daemon = True
+                self._thread.start()
+
+    def notify(self):
+        """Wakes the thread to apply newly queued updates"""
+
+        self._wake.set()
+
+    def _run(self):
+
+        while True:
+            self._wake.wait(self._poll_interval)
+            # cleared before the pass so a result queued during it wakes the next one
+            self._wake.clear()
+            try:
+                self._apply()
+            except Exception:
+                self._logger.exception("Applying queued ratings failed")
@@ -0,0 +1,524 @@
+"""@package rating_replay
+Rating replay
+
+This script rebuilds TrueSkill ratings from the recorded result history.
+
+@file rating_replay.py
+
+@author Tyler Shake
+
+@par Notifications:
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The below copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+@copyright Copyright 2019 Tyler Shake
+"""
+
+import time
+import numpy
+import trueskill
+
+import elo_frontend.utils.batch_rater as batch_rater
+import elo_frontend.utils.connection_health as connection_health
+import elo_frontend.utils.data_versions as data_versions
+
+# rating tracks as (entity table, entity key, rating column, hist table,
+# hist entity column)
+PP_IND = ('player', 'player_id', 'pp_ind_rating', 'pp_ind_rating_hist', 'player')
+FB_OFFENSE = ('player', 'player_id', 'fb_offense_rating', 'fb_offense_rating_hist', 'player')
+FB_DEFENSE = ('player', 'player_id', 'fb_defense_rating', 'fb_defense_rating_hist', 'player')
+FB_TEAM = ('team', 'team_id', 'fb_team_rating', 'fb_team_rating_hist', 'team')
+MK_IND = ('player', 'player_id', 'mk_ind_rating', 'mk_ind_rating_hist', 'player')
+SS_IND = ('player', 'player_id', 'ss_ind_rating', 'ss_ind_rating_hist', 'player')
+
+# per game: rating tracks, result table and player columns in result order
+REPLAY_GAMES = {
+    'pp': ((PP_IND,), 'pp_result', ('pp_winner', 'pp_loser')),
+    'fb': ((FB_OFFENSE, FB_DEFENSE, FB_TEAM), 'fb_result',
+           ('offense_winner', 'defense_winner', 'offense_loser', 'defense_loser')),
+    'mk': ((MK_IND,), 'mk_ind_result',
+           ('mk_ind_first', 'mk_ind_second', 'mk_ind_third', 'mk_ind_fourth')),
+    'ss': ((SS_IND,), 'ss_ind_result',
+           ('ss_ind_first', 'ss_ind_second', 'ss_ind_third', 'ss_ind_fourth', 'ss_ind_fifth',
+            'ss_ind_sixth', 'ss_ind_seventh', 'ss_ind_eighth')),
+}
+
+# standing game and counter of each player column of a result
+STANDING_COUNTERS = {
+    'pp': (('pp', 'wins'), ('pp', 'losses')),
+    'fb': (('fb_offense', 'wins'), ('fb_defense', 'wins'),
+           ('fb_offense', 'losses'), ('fb_defense', 'losses')),
+    'mk': (('mk', 'first_place'), ('mk', 'second_place'), ('mk', 'third_place'),
+           ('mk', None)),
+    'ss': (('ss', 'first_place'), ('ss', 'second_place'), ('ss', 'third_place')) +
+          (('ss', None),) * 5,
+}
+
+# standing game backed by each player rating track
+STANDING_TRACKS = {
+    PP_IND: 'pp',
+    FB_OFFENSE: 'fb_offense',
+    FB_DEFENSE: 'fb_defense',
+    MK_IND: 'mk',
+    SS_IND: 'ss',
+}
+
+class RatingReplay(object):
+    """Replays the result history of one game in memory.
+
+    Every rated entity starts from the default rating at its creation time,
+    and each result is rated in time order exactly as the add_*result
+    methods would, including rounding to the precision the rating table
+    stores. Results that share no entity are rated together by the NumPy
+    batch rater. The rebuilt history is then written back in bulk.
+
+    The game's queued rating jobs are locked before anything is read and
+    dropped once the replay has rated their results. New jobs of the game
+    wait for the replay to commit, so no result is rated twice. The game's
+    data version is bumped in the same transaction.
+
+    Args:
+        connection (obj):   database connection in a fresh transaction,
+                            left uncommitted
+        game (str):         game to replay, see REPLAY_GAMES
+        logger (obj):       logger for progress messages
+        batch_size (int):   rows per multi-row insert
+
+    """
+
+    def __init__(self, connection, game, logger, batch_size):
+        """Initializes rating replay class."""
+
+        self._connection = connection
+        self._game = game
+        self._logger = logger
+        self._batch_size = batch_size
+        self._tracks, self._result_table, self._player_columns = REPLAY_GAMES[game]
+        self._ratings = dict((track, {}) for track in self._tracks)
+        self._history = dict((track, []) for track in self._tracks)
+        self._teams = {}
+
+    def run(self):
+        """Method to replay the game and write the rebuilt ratings
+
+        Returns:
+            number of results replayed
+
+        """
+
+        start = time.time()
+        cursor = self._connection.cursor()
+        # locked before the first plain read, so the replay's snapshot holds
+        # the result of every job it drops
+        cursor.execute("SELECT job_id FROM rating_job WHERE game = %s FOR UPDATE",
+                       (self._game,))
+        for track in self._tracks:
+            entity_table, entity_key = track[0], track[1]
+            cursor.execute("SELECT {0}, time FROM {1} ORDER BY {0}".format(entity_key,
+                                                                           entity_table))
+            for entity_id, created in cursor.fetchall():
+                self._record(track, entity_id, trueskill.Rating(), created)
+        self._load_teams()
+
+        matches = []
+        result_count = 0
+        for result in self._stream_results():
+            matches.extend(self._matches(result[1:-1], result[-1]))
+            result_count += 1
+        self._rate_batched(matches)
+        self._logger.info("Replayed %d %s results in %.2f seconds", result_count,
+                          self._game, time.time() - start)
+
+        start = time.time()
+        for track in self._tracks:
+            # ratings replaced by the replay, deleted once nothing points at them
+            cursor.execute("DROP TEMPORARY TABLE IF EXISTS replay_obsolete_rating")
+            cursor.execute("CREATE TEMPORARY TABLE replay_obsolete_rating (\
+rating_id INT NOT NULL,\
+PRIMARY KEY (rating_id))")
+            cursor.execute("INSERT IGNORE INTO replay_obsolete_rating SELECT rating \
+FROM {0}".format(track[3]))
+            cursor.execute("INSERT IGNORE INTO replay_obsolete_rating SELECT {0} \
+FROM {1}".format(track[2], track[0]))
+            cursor.execute("DELETE FROM {0}".format(track[3]))
+
+            self._insert_history(track)
+            self._repoint(track)
+
+            cursor.execute("DELETE rating FROM rating JOIN replay_obsolete_rating \
+ON replay_obsolete_rating.rating_id = rating.rating_id")
+            cursor.execute("DROP TEMPORARY TABLE replay_obsolete_rating")
+
+        self._refresh_standings()
+        cursor.execute("DELETE FROM rating_job WHERE game = %s", (self._game,))
+        data_versions.bump(cursor, (self._game,))
+        self._logger.info("Wrote %d %s ratings in %.2f seconds",
+                          sum(len(entries) for entries in self._history.values()),
+                          self._game, time.time() - start)
+        return result_count
+
+    def _load_teams(self):
+
+        if FB_TEAM not in self._tracks:
+            return
+
+        cursor = self._connection.cursor()
+        cursor.execute("SELECT team_id, min_player_id, max_player_id FROM team_pair")
+        for team_id, member_one, member_two in cursor.fetchall():
+            self._teams[(member_one, member_two)] = team_id
+
+    def _stream_results(self, since=None):
+
+        statement = "SELECT result_id, {0}, time FROM {1}".format(
+            ", ".join(self._player_columns), self._result_table)
+        params = ()
+        if since is not None:
+            statement += " WHERE (time, result_id) >= (%s, %s)"
+            params = (since[0], since[1])
+        statement += " ORDER BY time, result_id"
+
+        cursor = self._connection.cursor(connection_health.SSCursor)
+        try:
+            cursor.execute(statement, params)
+            for result in cursor:
+                yield result
+        finally:
+            cursor.close()
+
+    def _entities(self, players):
+
+        if self._game != 'fb':
+            return [(self._tracks[0], player) for player in players if player is not None]
+
+        offense_winner, defense_winner, offense_loser, defense_loser = players
+        entities = [(FB_OFFENSE, offense_winner), (FB_DEFENSE, defense_winner),
+                    (FB_OFFENSE, offense_loser), (FB_DEFENSE, defense_loser)]
+        winning_team = self._team(offense_winner, defense_winner)
+        losing_team = self._team(offense_loser, defense_loser)
+        if winning_team is not None and losing_team is not None:
+            entities.extend([(FB_TEAM, winning_team), (FB_TEAM, losing_team)])
+        return entities
+
+    def _rate(self, players, played):
+
+        if self._game == 'fb':
+            self._rate_fb(players, played)
+        else:
+            self._rate_placements(self._tracks[0], players, played)
+
+    def _rate_placements(self, track, players, played):
+
+        players = [player for player in players if player is not None]
+        if len(players) == 2:
+            new_ratings = trueskill.rate_1vs1(*[self._rating(track, player)
+                                                for player in players])
+        else:
+            new_ratings = [rating for (rating,) in trueskill.rate(
+                [(self._rating(track, player),) for player in players],
+                ranks=list(range(len(players))))]
+
+        for player, rating in zip(players, new_ratings):
+            self._record(track, player, rating, played)
+
+    def _rate_fb(self, players, played):
+
+        offense_winner, defense_winner, offense_loser, defense_loser = players
+        (new_offense_winner, new_defense_winner), (new_offense_loser, new_defense_loser) = \
+            trueskill.rate([(self._rating(FB_OFFENSE, offense_winner),
+                             self._rating(FB_DEFENSE, defense_winner)),
+                            (self._rating(FB_OFFENSE, offense_loser),
+                             self._rating(FB_DEFENSE, defense_loser))], ranks=[0, 1])
+        self._record(FB_OFFENSE, offense_winner, new_offense_winner, played)
+        self._record(FB_DEFENSE, defense_winner, new_defense_winner, played)
+        self._record(FB_OFFENSE, offense_loser, new_offense_loser, played)
+        self._record(FB_DEFENSE, defense_loser, new_defense_loser, played)
+
+        winning_team = self._team(offense_winner, defense_winner)
+        losing_team = self._team(offense_loser, defense_loser)
+        if winning_team is None or losing_team is None:
+            self._logger.warning("Skipping team rating of fb result at %s, no team", played)
+            return
+
+        new_winning_team, new_losing_team = trueskill.rate_1vs1(
+            self._rating(FB_TEAM, winning_team), self._rating(FB_TEAM, losing_team))
+        self._record(FB_TEAM, winning_team, new_winning_team, played)
+        self._record(FB_TEAM, losing_team, new_losing_team, played)
+
+    def _matches(self, players, played):
+
+        if self._game != 'fb':
+            teams = [((self._tracks[0], player),) for player in players if player is not None]
+            return [(teams, played)]
+
+        offense_winner, defense_winner, offense_loser, defense_loser = players
+        matches = [([((FB_OFFENSE, offense_winner), (FB_DEFENSE, defense_winner)),
+                     ((FB_OFFENSE, offense_loser), (FB_DEFENSE, defense_loser))], played)]
+        winning_team = self._team(offense_winner, defense_winner)
+        losing_team = self._team(offense_loser, defense_loser)
+        if winning_team is None or losing_team is None:
+            self._logger.warning("Skipping team rating of fb result at %s, no team", played)
+        else:
+            matches.append(([((FB_TEAM, winning_team),), ((FB_TEAM, losing_team),)], played))
+        return matches
+
+    def _rate_batched(self, matches):
+
+        # every entity gets one slot, offense and defense of a player are separate
+        slots = {}
+        for track in self._tracks:
+            for entity_id in self._ratings[track]:
+                slots[(track, entity_id)] = len(slots)
+        for teams, _ in matches:
+            for team in teams:
+                for entity in team:
+                    slots.setdefault(entity, len(slots))
+
+        table = batch_rater.RatingTable(len(slots))
+        for (track, entity_id), slot in slots.items():
+            rating = self._rating(track, entity_id)
+            table.mu[slot], table.sigma[slot] = rating.mu, rating.sigma
+
+        rater = batch_rater.BatchRater()
+        for batch in batch_rater.schedule([teams for teams, _ in matches]):
+            slot_ids = numpy.array([[[slots[entity] for entity in team]
+                                     for team in matches[position][0]]
+                                    for position in batch])
+            new_mu, new_sigma = table.rate(rater, slot_ids)
+            for row, position in enumerate(batch):
+                teams, played = matches[position]
+                for team_index, team in enumerate(teams):
+                    for member, (track, entity_id) in enumerate(team):
+                        self._record(track, entity_id, trueskill.Rating(
+                            mu=float(new_mu[row, team_index, member]),
+                            sigma=float(new_sigma[row, team_index, member])), played)
+                        # later batches must start from the rounded rating
+                        rating = self._ratings[track][entity_id]
+                        slot = slot_ids[row, team_index, member]
+                        table.mu[slot], table.sigma[slot] = rating.mu, rating.sigma
+
+    def _team(self, member_one, member_two):
+
+        return self._teams.get((min(member_one, member_two), max(member_one, member_two)))
+
+    def _rating(self, track, entity_id):
+
+        rating = self._ratings[track].get(entity_id)
+        if rating is None:
+            rating = trueskill.Rating()
+        return rating
+
+    def _record(self, track, entity_id, rating, recorded):
+
+        # keep the precision of rating.mu and rating.sigma, DECIMAL(6,4)
+        rating = trueskill.Rating(mu=round(rating.mu, 4), sigma=round(rating.sigma, 4))
+        self._ratings[track][entity_id] = rating
+        self._history[track].append((entity_id, rating.mu, rating.sigma, recorded))
+
+    def _insert_history(self, track):
+
+        hist_table, hist_column = track[3], track[4]
+        entries = self._history[track]
+        cursor = self._connection.cursor()
+
+        # multi-row inserts get one block of ids starting at LAST_INSERT_ID
+        for start in range(0, len(entries), self._batch_size):
+            batch = entries[start:start + self._batch_size]
+            cursor.execute("INSERT INTO rating (mu, sigma, time) VALUES {0}".format(
+                ", ".join(["(%s, %s, %s)"] * len(batch))),
+                           [value for _, mu, sigma, recorded in batch
+                            for value in (mu, sigma, recorded)])
+            rows = zip(self._connection.inserted_ids(cursor.lastrowid, len(batch)), batch)
+            cursor.execute("INSERT INTO {0} (rating, {1}, time) VALUES {2}".format(
+                hist_table, hist_column, ", ".join(["(%s, %s, %s)"] * len(batch))),
+                           [value for rating_id, (entity_id, _, _, recorded) in rows
+                            for value in (rating_id, entity_id, recorded)])
+
+    def _repoint(self, track, entity_ids=None):
+
+        entity_table, entity_key, rating_column, hist_table, hist_column = track
+        where = ""
+        if entity_ids is not None:
+            where = " WHERE {0} IN ({1})".format(hist_column,
+                                                ", ".join(["%s"] * len(entity_ids)))
+
+        # history is written in time order, so the newest rating has the highest id
+        cursor = self._connection.cursor()
+        cursor.execute("UPDATE {0} JOIN (SELECT {1} AS entity_id, MAX(rating) AS rating_id \
+FROM {2}{5} GROUP BY {1}) AS latest ON latest.entity_id = {0}.{3} \
+SET {0}.{4} = latest.rating_id".format(entity_table, hist_column, hist_table, entity_key,
+                                       rating_column, where), list(entity_ids or ()))
+
+    def _refresh_standings(self, player_ids=None):
+
+        where = ""
+        if player_ids is not None:
+            where = " AND standing.player_id IN ({0})".format(
+                ", ".join(["%s"] * len(player_ids)))
+
+        cursor = self._connection.cursor()
+        for track in self._tracks:
+            if track not in STANDING_TRACKS:
+                continue
+            cursor.execute("UPDATE standing \
+JOIN player ON player.player_id = standing.player_id \
+JOIN rating ON rating.rating_id = player.{0} \
+SET standing.mu = rating.mu, standing.sigma = rating.sigma, \
+standing.score = rating.mu - 3 * rating.sigma \
+WHERE standing.game = %s{1}".format(track[2], where),
+                           [STANDING_TRACKS[track]] + list(player_ids or ()))
+
+class ConeReplay(RatingReplay):
+    """Re-rates only what depends on one changed result.
+
+    The dependency cone starts with the entities rated by the changed
+    result and grows with every later result that involves an entity
+    already in it. Each cone entity's newest history rows, one per cone
+    result it played, are replaced, and its rating before the cone is read
+    back from the history row that remains. Entities outside the cone keep
+    their history untouched.
+
+    History rows are matched to results by rating_id order, which follows
+    the order the ratings were written in.
+
+    Args:
+        connection (obj):   database connection, left uncommitted
+        game (str):         game of the result, see REPLAY_GAMES
+        logger (obj):       logger for progress messages
+        batch_size (int):   rows per multi-row insert
+
+    """
+
+    def run(self, result_id, players=None, result_values=None):
+        """Method to delete or amend a result and re-rate its cone
+
+        Args:
+            result_id (int):        result to change
+            players (list):         amended player ids in result column order,
+                                    None to delete the result
+            result_values (dict):   other result columns to amend
+
+        Returns:
+            number of results re-rated
+
+        Raises:
+            KeyError:   result_id does not exist
+
+        """
+
+        start = time.time()
+        cursor = self._connection.cursor()
+        cursor.execute("SELECT result_id, {0}, time FROM {1} WHERE result_id = %s \
+FOR UPDATE".format(", ".join(self._player_columns), self._result_table), (result_id,))
+        changed = cursor.fetchone()
+        if changed is None:
+            raise KeyError(result_id)
+        self._load_teams()
+
+        # walk the results from the changed one on, growing the cone
+        cone = set(self._entities(changed[1:-1]))
+        if players is not None:
+            players = tuple(players) + (None,) * (len(self._player_columns) - len(players))
+            cone.update(self._entities(players))
+        replaced = dict((entity, 0) for entity in cone)
+        affected = []
+        for result in self._stream_results(since=(changed[-1], changed[0])):
+            entities = self._entities(result[1:-1])
+            if result[0] != changed[0] and cone.isdisjoint(entities):
+                continue
+            for entity in entities:
+                cone.add(entity)
+                replaced[entity] = replaced.get(entity, 0) + 1
+            affected.append(result)
+
+        self._apply_change(changed, players, result_values)
+
+        obsolete = self._load_cone_ratings(replaced)
+        for result in affected:
+            if result[0] == changed[0]:
+                if players is None:
+                    continue
+                result = (result[0],) + players + (result[-1],)
+            self._rate(result[1:-1], result[-1])
+
+        for track in self._tracks:
+            entity_ids = [entity_id for entity_track, entity_id in cone
+                          if entity_track == track]
+            if not entity_ids:
+                continue
+            self._insert_history(track)
+            self._repoint(track, entity_ids)
+        if obsolete:
+            cursor.execute("DELETE FROM rating WHERE rating_id IN ({0})".format(
+                ", ".join(["%s"] * len(obsolete))), obsolete)
+
+        self._adjust_counters(changed[1:-1], -1)
+        if players is not None:
+            self._adjust_counters(players, 1)
+        self._refresh_standings(sorted(set(entity_id for track, entity_id in cone
+                                           if track in STANDING_TRACKS)))
+
+        self._logger.info("Re-rated %d %s results for %d ratings in %.2f seconds",
+                          len(affected), self._game, len(cone), time.time() - start)
+        return len(affected)
+
+    def _apply_change(self, changed, players, result_values):
+
+        cursor = self._connection.cursor()
+        if players is None:
+            cursor.execute("DELETE FROM {0} WHERE result_id = %s".format(self._result_table),
+                           (changed[0],))
+            return
+
+        columns = list(self._player_columns)
+        values = list(players)
+        for column, value in (result_values or {}).items():
+            columns.append(column)
+            values.append(value)
+        cursor.execute("UPDATE {0} SET {1} WHERE result_id = %s".format(
+            self._result_table, ", ".join("{0} = %s".format(column) for column in columns)),
+                       values + [changed[0]])
+
+    def _load_cone_ratings(self, replaced):
+
+        obsolete = []
+        cursor = self._connection.cursor()
+        for (track, entity_id), count in sorted(replaced.items()):
+            cursor.execute("SELECT rating.rating_id, rating.mu, rating.sigma FROM {0} \
+JOIN rating ON rating.rating_id = {0}.rating WHERE {0}.{1} = %s \
+ORDER BY {0}.rating DESC LIMIT %s".format(track[3], track[4]), (entity_id, count + 1))
+            rows = cursor.fetchall()
+            obsolete.extend(rating_id for rating_id, _, _ in rows[:count])
+            if len(rows) > count:
+                _, mu, sigma = rows[count]
+                self._ratings[track][entity_id] = trueskill.Rating(mu=float(mu),
+                                                                   sigma=float(sigma))
+
+            if count:
+                cursor.execute("DELETE FROM {0} WHERE {1} = %s ORDER BY rating DESC \
+LIMIT %s".format(track[3], track[4]), (entity_id, count))
+        return obsolete
+
+    def _adjust_counters(self, players, step):
+
+        cursor = self._connection.cursor()
+        for player_id, (game, counter) in zip(players, STANDING_COUNTERS[self._game]):
+            if player_id is None or counter is None:
+                continue
+            cursor.execute("UPDATE standing SET {0} = {0} + %s WHERE player_id = %s \
+AND game = %s".format(counter), (step, player_id, game))
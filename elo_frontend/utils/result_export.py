@@ -0,0 +1,289 @@
+"""@package result_export
+Result export
+
+This script streams results, players, teams and rating history to files.
+
+@file result_export.py
+
+@author Tyler Shake
+
+@par Notifications:
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The below copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+@copyright Copyright 2019 Tyler Shake
+"""
+
+import calendar
+import csv
+import io
+import json
+import struct
+
+import elo_frontend.utils.connection_health as connection_health
+import elo_frontend.utils.rating_replay as rating_replay
+import elo_frontend.utils.result_import as result_import
+
+# supported file formats
+FORMATS = ('csv', 'jsonl', 'columnar')
+
+# first bytes of a columnar file
+COLUMNAR_MAGIC = b'ELOCOL1\n'
+
+# struct codes of fixed width columnar values, little endian
+COLUMNAR_CODES = {'int': 'q', 'float': 'd', 'time': 'q'}
+
+def _result_dataset(game):
+
+    tracks, result_table, player_columns = rating_replay.REPLAY_GAMES[game]
+    value_columns = [column for _, column, _ in result_import.IMPORT_FIELDS[game][1]]
+    columns = [('result_id', 'int')] + [(column, 'int') for column in player_columns] + \
+        [(column, 'str') for column in value_columns] + [('time', 'time')]
+    return tuple(columns), "SELECT {0} FROM {1} ORDER BY time, result_id".format(
+        ", ".join(name for name, _ in columns), result_table)
+
+def _history_dataset(track):
+
+    hist_table, hist_column = track[3], track[4]
+    columns = (('rating_id', 'int'), (hist_column + '_id', 'int'), ('mu', 'float'),
+               ('sigma', 'float'), ('time', 'time'))
+    return columns, "SELECT {0}.rating, {0}.{1}, rating.mu, rating.sigma, {0}.time \
+FROM {0} JOIN rating ON rating.rating_id = {0}.rating \
+ORDER BY {0}.rating".format(hist_table, hist_column)
+
+def _datasets():
+
+    datasets = {
+        'players': ((('player_id', 'int'), ('first_name', 'str'), ('last_name', 'str'),
+                     ('nickname', 'str'), ('time', 'time')),
+                    "SELECT player_id, first_name, last_name, nickname, time FROM player \
+ORDER BY player_id"),
+        'teams': ((('team_id', 'int'), ('team_name', 'str'), ('member_one', 'int'),
+                   ('member_two', 'int'), ('time', 'time')),
+                  "SELECT team.team_id, team.team_name, MIN(player_team_xref.player), \
+MAX(player_team_xref.player), team.time FROM team \
+LEFT JOIN player_team_xref ON player_team_xref.team = team.team_id \
+GROUP BY team.team_id ORDER BY team.team_id"),
+    }
+    for game, (tracks, _, _) in rating_replay.REPLAY_GAMES.items():
+        datasets[game + '_results'] = _result_dataset(game)
+        for track in tracks:
+            datasets[track[3]] = _history_dataset(track)
+    return datasets
+
+# exportable datasets as (columns as (name, type), statement)
+DATASETS = _datasets()
+
+def iter_export(connection, dataset, file_format, chunk_rows):
+    """Streams a dataset from a server side cursor as encoded chunks
+
+    At most chunk_rows rows are held in memory at a time, so the export
+    runs in constant memory however long the history is.
+
+    Args:
+        connection (obj):   database connection
+        dataset (str):      dataset to export, see DATASETS
+        file_format (str):  format to encode, see FORMATS
+        chunk_rows (int):   rows fetched and encoded per chunk
+
+    Yields:
+        byte strings that concatenate to the exported file
+
+    """
+
+    columns, statement = DATASETS[dataset]
+    encoder = ENCODERS[file_format](columns)
+    cursor = connection.cursor(connection_health.SSCursor)
+    try:
+        cursor.execute(statement)
+        yield encoder.header()
+        while True:
+            rows = cursor.fetchmany(chunk_rows)
+            if not rows:
+                break
+            yield encoder.encode(rows)
+        yield encoder.footer()
+    finally:
+        cursor.close()
+
+def _plain(value, column_type):
+
+    if value is None:
+        return None
+    if column_type == 'time':
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    if column_type == 'float':
+        return float(value)
+    return value
+
+class CSVEncoder(object):
+    """Encodes rows as CSV with a header row, NULL as an empty field.
+
+    Args:
+        columns (tuple):    (name, type) of every column
+
+    """
+
+    def __init__(self, columns):
+        """Initializes CSV encoder class."""
+
+        self._columns = columns
+
+    def header(self):
+        """Returns the header row"""
+
+        return self._write([[name for name, _ in self._columns]])
+
+    def encode(self, rows):
+        """Returns a chunk of rows"""
+
+        return self._write([[_plain(value, column_type) for value, (_, column_type)
+                             in zip(row, self._columns)] for row in rows])
+
+    def footer(self):
+        """Returns the end of the file"""
+
+        return b''
+
+    @staticmethod
+    def _write(rows):
+
+        buf = io.BytesIO()
+        csv.writer(buf).writerows(rows)
+        return buf.getvalue()
+
+class JSONLinesEncoder(CSVEncoder):
+    """Encodes rows as one JSON object per line, NULL as null.
+
+    Args:
+        columns (tuple):    (name, type) of every column
+
+    """
+
+    def header(self):
+        """Returns the header, empty for JSON lines"""
+
+        return b''
+
+    def encode(self, rows):
+        """Returns a chunk of rows"""
+
+        names = [name for name, _ in self._columns]
+        return b''.join(json.dumps(dict(zip(names, [
+            _plain(value, column_type) for value, (_, column_type)
+            in zip(row, self._columns)])), sort_keys=True) + b'\n' for row in rows)
+
+class ColumnarEncoder(CSVEncoder):
+    """Encodes rows as column blocks in a compact binary format.
+
+    The file starts with COLUMNAR_MAGIC and a uint32 length prefixed JSON
+    list of [name, type] columns. Each chunk is a row group: a uint32 row
+    count, then every column in order as one validity byte per row
+    followed by the values. int and float columns are int64 and float64,
+    time columns are int64 seconds since the epoch and str columns are
+    uint32 byte lengths followed by the UTF-8 bytes. NULL values are
+    written as 0 or the empty string. A row count of 0 ends the file. All
+    numbers are little endian. read_columnar decodes the format.
+
+    Args:
+        columns (tuple):    (name, type) of every column
+
+    """
+
+    def header(self):
+        """Returns the magic bytes and schema"""
+
+        schema = json.dumps([[name, column_type] for name, column_type in self._columns])
+        return COLUMNAR_MAGIC + struct.pack('<I', len(schema)) + schema
+
+    def encode(self, rows):
+        """Returns a row group"""
+
+        blocks = [struct.pack('<I', len(rows))]
+        for index, (_, column_type) in enumerate(self._columns):
+            values = [row[index] for row in rows]
+            blocks.append(struct.pack('<{0}B'.format(len(values)),
+                                      *[value is not None for value in values]))
+            if column_type == 'str':
+                encoded = [(value.encode('utf-8') if isinstance(value, unicode) else value)
+                           if value is not None else b'' for value in values]
+                blocks.append(struct.pack('<{0}I'.format(len(encoded)),
+                                          *[len(value) for value in encoded]))
+                blocks.extend(encoded)
+                continue
+            if column_type == 'time':
+                values = [calendar.timegm(value.timetuple()) if value is not None else 0
+                          for value in values]
+            else:
+                values = [value if value is not None else 0 for value in values]
+            if column_type == 'float':
+                values = [float(value) for value in values]
+            blocks.append(struct.pack('<{0}{1}'.format(len(values),
+                                                        COLUMNAR_CODES[column_type]),
+                                      *values))
+        return b''.join(blocks)
+
+    def footer(self):
+        """Returns the end of file marker"""
+
+        return struct.pack('<I', 0)
+
+# encoder class of each format
+ENCODERS = {
+    'csv': CSVEncoder,
+    'jsonl': JSONLinesEncoder,
+    'columnar': ColumnarEncoder,
+}
+
+def read_columnar(stream):
+    """Reads a columnar export one row group at a time
+
+    Args:
+        stream (obj):   file object positioned at the start of the export
+
+    Yields:
+        dictionaries of column name to list of values, None for NULL
+
+    Raises:
+        ValueError:     not a columnar export
+
+    """
+
+    if stream.read(len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+        raise ValueError("Not a columnar export")
+    (length,) = struct.unpack('<I', stream.read(4))
+    columns = json.loads(stream.read(length))
+
+    while True:
+        (count,) = struct.unpack('<I', stream.read(4))
+        if not count:
+            return
+        group = {}
+        for name, column_type in columns:
+            valid = struct.unpack('<{0}B'.format(count), stream.read(count))
+            if column_type == 'str':
+                lengths = struct.unpack('<{0}I'.format(count), stream.read(4 * count))
+                values = [stream.read(length).decode('utf-8') for length in lengths]
+            else:
+                code = COLUMNAR_CODES[column_type]
+                values = list(struct.unpack('<{0}{1}'.format(count, code),
+                                            stream.read(struct.calcsize(code) * count)))
+            group[name] = [value if is_valid else None
+                           for value, is_valid in zip(values, valid)]
+        yield group
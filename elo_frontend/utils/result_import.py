@@ -0,0 +1,315 @@
+"""@package result_import
+Result import
+
+This script loads results in bulk from CSV or JSON lines files.
+
+@file result_import.py
+
+@author Tyler Shake
+
+@par Notifications:
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The below copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+@copyright Copyright 2019 Tyler Shake
+"""
+
+import csv
+import datetime
+import json
+import time
+
+import elo_frontend.utils.data_versions as data_versions
+import elo_frontend.utils.exceptions as exceptions
+import elo_frontend.utils.rating_replay as rating_replay
+
+# supported file formats
+FORMATS = ('csv', 'jsonl')
+
+# layout of the time field, as written by result_export
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# range of the TIMESTAMP result columns, a day inside it for any time zone
+TIME_RANGE = (datetime.datetime(1970, 1, 2), datetime.datetime(2038, 1, 18))
+
+# per game: player fields in result column order, then other fields as
+# (field, result column, required)
+IMPORT_FIELDS = {
+    'pp': (('winner', 'loser'), ()),
+    'fb': (('offense_winner', 'defense_winner', 'offense_loser', 'defense_loser'), ()),
+    'mk': (('first', 'second', 'third', 'fourth'), (('course', 'course', True),)),
+    'ss': (('first', 'second', 'third', 'fourth', 'fifth', 'sixth', 'seventh', 'eighth'),
+           tuple(('char_' + place, 'ss_{0}_char'.format(place), index < 2) for index, place in
+                 enumerate(('first', 'second', 'third', 'fourth', 'fifth', 'sixth', 'seventh',
+                            'eighth')))),
+}
+
+def parse_player(value):
+    """Splits a player written as First "Nickname" Last into name parts
+
+    Args:
+        value (str):    player as shown in the result forms
+
+    Returns:
+        (first_name, last_name, nickname) tuple, None for an empty place
+
+    """
+
+    value = (value or "").strip()
+    if not value or value == "N/A":
+        return None
+
+    first_quote = value.find('"')
+    second_quote = value.find('"', first_quote + 1)
+    if first_quote < 1 or second_quote < 0:
+        raise exceptions.DBValueError("Malformed player " + value)
+    return (value[:first_quote - 1], value[second_quote + 2:],
+            value[first_quote + 1:second_quote])
+
+def read_rows(stream, file_format):
+    """Streams rows of a CSV or JSON lines file as dictionaries
+
+    CSV files need a header row naming the fields, JSON lines files hold
+    one object per line. Blank JSON lines are skipped.
+
+    Args:
+        stream (obj):       file object to read
+        file_format (str):  'csv' or 'jsonl'
+
+    Returns:
+        generator of dictionaries of str values
+
+    Raises:
+        DBValueError:   unknown format or malformed line
+
+    """
+
+    if file_format == 'csv':
+        reader = csv.DictReader(stream)
+        try:
+            for row in reader:
+                yield row
+        except csv.Error as error:
+            raise exceptions.DBValueError("Malformed CSV on line {0}: {1}".format(
+                reader.line_num, error))
+    elif file_format == 'jsonl':
+        for line_number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                raise exceptions.DBValueError("Malformed JSON on line {0}".format(line_number))
+            yield dict((key, value.encode('utf-8') if isinstance(value, unicode) else value)
+                       for key, value in row.items())
+    else:
+        raise exceptions.DBValueError("Unknown import format")
+
+class ResultImport(object):
+    """Loads results of one game in bulk and rebuilds its ratings.
+
+    Rows are parsed as they stream in, their players resolved against a
+    name to id map loaded once, and each batch is written with multi-row
+    inserts and committed. Rows without a time are stamped with the time
+    the import started. Once every row is stored, the game is replayed so
+    ratings are applied in time order, including any imported results
+    older than existing ones.
+
+    Args:
+        connection (obj):   database connection, committed per batch
+        game (str):         game to import, see IMPORT_FIELDS
+        logger (obj):       logger for per-batch throughput
+        batch_size (int):   rows per committed batch
+        create_team (func): called with two player name tuples to create a
+                            missing fb team, returns its team id
+
+    """
+
+    def __init__(self, connection, game, logger, batch_size, create_team=None):
+        """Initializes result import class."""
+
+        self._connection = connection
+        self._game = game
+        self._logger = logger
+        self._batch_size = batch_size
+        self._create_team = create_team
+        self._player_fields, self._value_fields = IMPORT_FIELDS[game]
+        self._result_table, self._player_columns = rating_replay.REPLAY_GAMES[game][1:]
+        self._started = time.strftime(TIME_FORMAT)
+        self._player_ids = {}
+        self._teams = set()
+
+    def run(self, rows):
+        """Method to import rows and rebuild the game's ratings
+
+        A bad row, or any other error, stops the import. Batches committed
+        before it are kept and rated, so the error can be fixed and the
+        rest imported again.
+
+        Args:
+            rows (iter):    dictionaries as produced by read_rows
+
+        Returns:
+            number of results imported
+
+        Raises:
+            DBValueError:   invalid row
+
+        """
+
+        self._load_players()
+        imported = 0
+        batch = []
+        complete = False
+        try:
+            for row_number, row in enumerate(rows, 1):
+                batch.append(self._parse(row_number, row))
+                if len(batch) == self._batch_size:
+                    imported += self._write(batch)
+                    batch = []
+            if batch:
+                imported += self._write(batch)
+            complete = True
+        finally:
+            if not complete:
+                self._replay_committed(imported)
+        self._replay(imported)
+        return imported
+
+    def _replay_committed(self, imported):
+
+        # the import failed: drop its unfinished batch and rate the committed
+        # ones, without hiding the error that stopped it
+        try:
+            self._connection.rollback()
+            self._replay(imported)
+        except Exception:
+            self._logger.exception("Could not rate the %d imported %s results, run "
+                                   "'elo_frontend replay -g %s'", imported, self._game, self._game)
+
+    def _replay(self, imported):
+
+        if not imported:
+            return
+        rating_replay.RatingReplay(self._connection, self._game, self._logger,
+                                   self._batch_size).run()
+        self._connection.commit()
+
+    def _load_players(self):
+
+        cursor = self._connection.cursor()
+        cursor.execute("SELECT player_id, first_name, last_name, nickname FROM player")
+        # names compare case insensitively in MySQL, so key them the same way
+        for player_id, first_name, last_name, nickname in cursor.fetchall():
+            self._player_ids[(first_name.lower(), last_name.lower(),
+                              (nickname or "").lower())] = player_id
+
+        if self._game == 'fb':
+            cursor.execute("SELECT min_player_id, max_player_id FROM team_pair")
+            self._teams = set(cursor.fetchall())
+
+    def _parse(self, row_number, row):
+
+        try:
+            players = [parse_player(row.get(field)) for field in self._player_fields]
+        except exceptions.DBValueError as error:
+            raise exceptions.DBValueError("Row {0}: {1}".format(row_number, error.msg))
+
+        placed = [player for player in players if player is not None]
+        if len(placed) < 2 or None in players[:len(placed)] or \
+                (self._game in ('pp', 'fb') and len(placed) != len(players)):
+            raise exceptions.DBValueError("Row {0}: Invalid result".format(row_number))
+        if len(set(placed)) != len(placed):
+            raise exceptions.DBValueError("Row {0}: Duplicate players in result".format(
+                row_number))
+
+        try:
+            player_ids = [self._player_ids[tuple(name.lower() for name in player)]
+                          for player in placed]
+        except KeyError:
+            raise exceptions.DBValueError("Row {0}: Player does not exist".format(row_number))
+        player_ids.extend([None] * (len(players) - len(placed)))
+
+        if self._game == 'fb':
+            for one, two in ((0, 1), (2, 3)):
+                self._ensure_team(players[one], players[two], player_ids[one], player_ids[two])
+
+        recorded = row.get('time') or self._started
+        try:
+            recorded = datetime.datetime.strptime(recorded, TIME_FORMAT)
+        except (TypeError, ValueError):
+            raise exceptions.DBValueError("Row {0}: Malformed time {1}".format(row_number,
+                                                                              recorded))
+        if not TIME_RANGE[0] <= recorded <= TIME_RANGE[1]:
+            raise exceptions.DBValueError("Row {0}: Time out of range".format(row_number))
+
+        values = []
+        for field, _, required in self._value_fields:
+            value = (row.get(field) or "").strip()
+            if not value or value == "N/A":
+                if required:
+                    raise exceptions.DBValueError("Row {0}: Missing {1}".format(row_number,
+                                                                               field))
+                value = None
+            values.append(value)
+        return player_ids + values + [recorded]
+
+    def _ensure_team(self, member_one, member_two, player_one, player_two):
+
+        # team ratings need a team for both pairs, as in add_fbresult
+        pair = (min(player_one, player_two), max(player_one, player_two))
+        if pair in self._teams or self._create_team is None:
+            return
+        self._create_team(member_one, member_two)
+        self._teams.add(pair)
+
+    def _write(self, batch):
+
+        start = time.time()
+        columns = list(self._player_columns) + \
+            [column for _, column, _ in self._value_fields] + ['time']
+        cursor = self._connection.cursor()
+        cursor.execute("INSERT INTO {0} ({1}) VALUES {2}".format(
+            self._result_table, ", ".join(columns),
+            ", ".join(["(" + ", ".join(["%s"] * len(columns)) + ")"] * len(batch))),
+                       [value for row in batch for value in row])
+
+        # standings counters, ratings follow in the replay
+        counts = {}
+        for row in batch:
+            for player_id, (game, counter) in zip(row,
+                                                  rating_replay.STANDING_COUNTERS[self._game]):
+                if player_id is not None and counter is not None:
+                    key = (game, counter)
+                    counts.setdefault(key, {})
+                    counts[key][player_id] = counts[key].get(player_id, 0) + 1
+        for (game, counter), players in sorted(counts.items()):
+            cursor.execute("UPDATE standing SET {0} = {0} + CASE player_id {1} END \
+WHERE game = %s AND player_id IN ({2})".format(counter, " ".join(["WHEN %s THEN %s"] *
+                                                                  len(players)),
+                                               ", ".join(["%s"] * len(players))),
+                           [value for pair in players.items() for value in pair] +
+                           [game] + list(players))
+
+        data_versions.bump(cursor, (self._game,))
+        self._connection.commit()
+        elapsed = time.time() - start
+        self._logger.info("Imported %d %s results in %.2f seconds (%.0f results/s)",
+                          len(batch), self._game, elapsed, len(batch) / max(elapsed, 1e-6))
+        return len(batch)
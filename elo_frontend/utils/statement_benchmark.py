@@ -0,0 +1,295 @@
+"""@package statement_benchmark
+Statement benchmark
+
+This script times bound and merged statements against the formatted SQL they replaced.
+
+@file statement_benchmark.py
+
+@author Tyler Shake
+
+@par Notifications:
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The below copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+@copyright Copyright 2019 Tyler Shake
+"""
+
+import time
+import MySQLdb
+
+import elo_frontend.utils.exceptions as exceptions
+import elo_frontend.utils.statements as statements
+
+# seconds the benchmark waits for its connection
+CONNECT_TIMEOUT = 10
+
+def _status_questions(cursor):
+
+    cursor.execute("SHOW SESSION STATUS LIKE 'Questions'")
+    return int(cursor.fetchone()[1])
+
+def _fixture(cursor):
+
+    cursor.execute("SELECT player_id, first_name, last_name, nickname FROM player \
+ORDER BY player_id LIMIT 2")
+    players = cursor.fetchall()
+    cursor.execute("SELECT team_id FROM team ORDER BY team_id LIMIT 1")
+    team = cursor.fetchone()
+    if len(players) < 2 or team is None:
+        return None
+    return {'players': [(row[0], tuple(row[1:])) for row in players], 'team': team[0]}
+
+def _formatted_pp_result(cursor, fixture):
+
+    # the string formatted statements add_ppresult used to run per player
+    for _, name in fixture['players']:
+        cursor.execute("SELECT player_id, pp_ind_rating FROM player \
+WHERE first_name = '{0}' AND last_name = '{1}' AND nickname = '{2}'".format(
+            name[0], name[1], name[2]))
+        player_id, rating = cursor.fetchall()[0]
+        cursor.execute("SELECT mu, sigma FROM rating WHERE rating_id \
+= {0}".format(rating))
+        mu, sigma = cursor.fetchall()[0]
+        cursor.execute("INSERT INTO rating (mu, sigma) VALUES ({0}, {1}\
+)".format(mu, sigma))
+        new_rating_id = cursor.lastrowid
+        cursor.execute("UPDATE player set pp_ind_rating = {0} where \
+player_id = {1}".format(new_rating_id, player_id))
+        cursor.execute("INSERT INTO pp_ind_rating_hist (rating, player) VALUES ({0}, {1}\
+)".format(new_rating_id, player_id))
+
+def _bound_pp_result(cursor, fixture):
+
+    for _, name in fixture['players']:
+        cursor.execute("SELECT player_id, pp_ind_rating FROM player \
+WHERE first_name = %s AND last_name = %s AND nickname = %s", name)
+        player_id, rating = cursor.fetchall()[0]
+        cursor.execute("SELECT mu, sigma FROM rating WHERE rating_id = %s", (rating,))
+        mu, sigma = cursor.fetchall()[0]
+        cursor.execute("INSERT INTO rating (mu, sigma) VALUES (%s, %s)", (mu, sigma))
+        new_rating_id = cursor.lastrowid
+        cursor.execute("UPDATE player set pp_ind_rating = %s where player_id = %s",
+                       (new_rating_id, player_id))
+        cursor.execute("INSERT INTO pp_ind_rating_hist (rating, player) VALUES (%s, %s)",
+                       (new_rating_id, player_id))
+
+def _merged_pp_result(cursor, fixture):
+
+    for _, name in fixture['players']:
+        statements.execute(cursor, 'player_pp_ind_rating_by_name', name)
+        player_id, mu, sigma = cursor.fetchone()
+        statements.execute(cursor, 'insert_rating', (mu, sigma))
+        new_rating_id = cursor.lastrowid
+        statements.execute(cursor, 'set_player_pp_ind_rating', (new_rating_id, player_id))
+        statements.execute(cursor, 'insert_pp_ind_rating_hist', (new_rating_id, player_id))
+
+def _formatted_fb_team_ranking(cursor, fixture):
+
+    team_id = fixture['team']
+    cursor.execute("SELECT fb_team_rating FROM \
+team WHERE team_id = {0}".format(team_id))
+    team_rating = cursor.fetchall()[0]
+    cursor.execute("SELECT mu, sigma FROM rating WHERE rating_id \
+= {0}".format(team_rating[0]))
+    cursor.fetchall()
+    cursor.execute("SELECT player from player_team_xref \
+WHERE team = {0}".format(team_id))
+    players = cursor.fetchall()
+    for player in players[:2]:
+        cursor.execute("SELECT first_name FROM player WHERE \
+player_id = {0}".format(player[0]))
+        cursor.fetchone()
+    cursor.execute("SELECT COUNT(result_id) FROM fb_result WHERE \
+(offense_winner = {0} AND defense_winner = {1}) OR (offense_winner = {1} \
+AND defense_winner = {0})".format(players[0][0], players[1][0]))
+    cursor.fetchone()
+    cursor.execute("SELECT COUNT(result_id) FROM fb_result WHERE \
+(offense_loser = {0} AND defense_loser = {1}) OR (offense_loser = {1} \
+AND defense_loser = {0})".format(players[0][0], players[1][0]))
+    cursor.fetchone()
+
+def _bound_fb_team_ranking(cursor, fixture):
+
+    team_id = fixture['team']
+    cursor.execute("SELECT fb_team_rating FROM team WHERE team_id = %s", (team_id,))
+    team_rating = cursor.fetchall()[0]
+    cursor.execute("SELECT mu, sigma FROM rating WHERE rating_id = %s", (team_rating[0],))
+    cursor.fetchall()
+    cursor.execute("SELECT player from player_team_xref WHERE team = %s", (team_id,))
+    players = cursor.fetchall()
+    for player in players[:2]:
+        cursor.execute("SELECT first_name FROM player WHERE player_id = %s", (player[0],))
+        cursor.fetchone()
+    pair = (players[0][0], players[1][0], players[1][0], players[0][0])
+    cursor.execute("SELECT COUNT(result_id) FROM fb_result WHERE \
+(offense_winner = %s AND defense_winner = %s) OR (offense_winner = %s \
+AND defense_winner = %s)", pair)
+    cursor.fetchone()
+    cursor.execute("SELECT COUNT(result_id) FROM fb_result WHERE \
+(offense_loser = %s AND defense_loser = %s) OR (offense_loser = %s \
+AND defense_loser = %s)", pair)
+    cursor.fetchone()
+
+def _merged_fb_team_ranking(cursor, fixture):
+
+    team_id = fixture['team']
+    statements.execute(cursor, 'fb_team_rating', (team_id,))
+    cursor.fetchone()
+    statements.execute(cursor, 'players_of_team', (team_id,))
+    players = cursor.fetchall()
+    for player in players[:2]:
+        statements.execute(cursor, 'player_first_name', (player[0],))
+        cursor.fetchone()
+    pair = (players[0][0], players[1][0], players[1][0], players[0][0])
+    statements.execute(cursor, 'fb_pair_wins', pair)
+    cursor.fetchone()
+    statements.execute(cursor, 'fb_pair_losses', pair)
+    cursor.fetchone()
+
+def _formatted_pp_history(cursor, fixture):
+
+    name = fixture['players'][0][1]
+    cursor.execute("SELECT player_id FROM player WHERE \
+first_name = '{0}' AND last_name = '{1}' AND nickname = \
+'{2}'".format(name[0], name[1], name[2]))
+    player_id = cursor.fetchone()[0]
+    cursor.execute("SELECT rating, time FROM pp_ind_rating_hist \
+WHERE player = {0} ORDER BY time DESC".format(player_id))
+    for rating, _ in cursor.fetchall():
+        cursor.execute("SELECT mu, sigma FROM rating WHERE rating_id \
+= {0}".format(rating))
+        cursor.fetchall()
+
+def _bound_pp_history(cursor, fixture):
+
+    cursor.execute("SELECT player_id FROM player WHERE \
+first_name = %s AND last_name = %s AND nickname = %s", fixture['players'][0][1])
+    player_id = cursor.fetchone()[0]
+    cursor.execute("SELECT rating, time FROM pp_ind_rating_hist \
+WHERE player = %s ORDER BY time DESC", (player_id,))
+    for rating, _ in cursor.fetchall():
+        cursor.execute("SELECT mu, sigma FROM rating WHERE rating_id = %s", (rating,))
+        cursor.fetchall()
+
+def _merged_pp_history(cursor, fixture):
+
+    statements.execute(cursor, 'player_id_by_name', fixture['players'][0][1])
+    player_id = cursor.fetchone()[0]
+    statements.execute(cursor, 'pp_ind_rating_hist_of_player', (player_id,))
+    cursor.fetchall()
+
+# scenario name, then paths running the same work three ways: the string
+# formatted statements, the very same statements with bound parameters, and
+# the registered statements that also merge queries
+SCENARIOS = (
+    ('add_ppresult ratings', _formatted_pp_result, _bound_pp_result, _merged_pp_result),
+    ('fb team ranking row', _formatted_fb_team_ranking, _bound_fb_team_ranking,
+     _merged_fb_team_ranking),
+    ('pp ranking history', _formatted_pp_history, _bound_pp_history, _merged_pp_history),
+)
+
+def _time(connection, path, fixture, iterations):
+
+    cursor = connection.cursor()
+    questions = _status_questions(cursor)
+    start = time.time()
+    for _ in range(iterations):
+        path(cursor, fixture)
+    elapsed = time.time() - start
+    # the status query itself counts as one question
+    statement_count = _status_questions(cursor) - questions - 1
+    connection.rollback()
+    return elapsed / iterations, float(statement_count) / iterations
+
+def run(connection, iterations):
+    """Times each scenario all three ways
+
+    Formatted and bound paths run identical statements, so their gap is
+    the cost of parameter binding alone; the merged path shows what
+    combining queries adds on top. Writes happen inside a transaction that
+    is rolled back after every timing, only auto increment counters move.
+    Needs at least two players and one team in the database.
+
+    Args:
+        connection (obj):   MySQLdb connection
+        iterations (int):   repetitions of each scenario
+
+    Returns:
+        list of (scenario, formatted seconds, bound seconds, merged
+        seconds, formatted and bound statements, merged statements), per
+        iteration
+
+    """
+
+    fixture = _fixture(connection.cursor())
+    if fixture is None:
+        return []
+
+    timings = []
+    for scenario in SCENARIOS:
+        # warm up every path so none pays for cold buffers
+        for path in scenario[1:]:
+            _time(connection, path, fixture, 1)
+        formatted, bound, merged = [_time(connection, path, fixture, iterations)
+                                    for path in scenario[1:]]
+        timings.append((scenario[0], formatted[0], bound[0], merged[0], formatted[1],
+                        merged[1]))
+    return timings
+
+def benchmark(config, db_user, db_pass, iterations):
+    """Runs the benchmark on a connection of its own
+
+    The connection is opened from the [options] of config and closed
+    afterwards, so no server or pool connection ever carries its writes.
+
+    Args:
+        config (obj):       ConfigParser object with the database options
+        db_user (str):      username for database access
+        db_pass (str):      password for database access
+        iterations (int):   repetitions of each scenario
+
+    Returns:
+        timings, see run
+
+    Raises:
+        DBValueError:       fewer than two players or no team to run on
+        DBConnectionError:  database connection issues
+        DBSyntaxError:      invalid database programming statement
+
+    """
+
+    try:
+        connection = MySQLdb.connect(
+            user=db_user, passwd=db_pass, host=config.get('options', 'db_host'),
+            port=config.getint('options', 'db_port'), db=config.get('options', 'db_name'),
+            connect_timeout=CONNECT_TIMEOUT)
+        try:
+            timings = run(connection, iterations)
+        finally:
+            connection.close()
+
+    except MySQLdb.OperationalError:
+        raise exceptions.DBConnectionError("Cannot connect to MySQL server")
+
+    except MySQLdb.ProgrammingError:
+        raise exceptions.DBSyntaxError("MySQL syntax error")
+
+    if not timings:
+        raise exceptions.DBValueError("Benchmark needs two players and a team")
+    return timings
@@ -0,0 +1,145 @@
+"""@package statements
+Statement registry
+
+This script names the fixed SQL statements run by the database manager.
+
+@file statements.py
+
+@author Tyler Shake
+
+@par Notifications:
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The below copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+@copyright Copyright 2019 Tyler Shake
+"""
+
+# player rating columns and the history table of each
+PLAYER_RATINGS = (
+    ('pp_ind_rating', 'pp_ind_rating_hist'),
+    ('ss_ind_rating', 'ss_ind_rating_hist'),
+    ('mp_ind_rating', 'mp_ind_rating_hist'),
+    ('mk_ind_rating', 'mk_ind_rating_hist'),
+    ('fb_defense_rating', 'fb_defense_rating_hist'),
+    ('fb_offense_rating', 'fb_offense_rating_hist'),
+)
+
+# team rating columns and the history table of each
+TEAM_RATINGS = (
+    ('fb_team_rating', 'fb_team_rating_hist'),
+    ('mk_team_rating', 'mk_team_rating_hist'),
+    ('mp_team_rating', 'mp_team_rating_hist'),
+    ('ss_team_rating', 'ss_team_rating_hist'),
+)
+
+def _statements():
+
+    registry = {
+        'insert_rating': "INSERT INTO rating (mu, sigma) VALUES (%s, %s)",
+        'insert_player': "INSERT INTO player (first_name, last_name, nickname, \
+fb_offense_rating, fb_defense_rating, mk_ind_rating, mp_ind_rating, ss_ind_rating, \
+pp_ind_rating) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)",
+        'rename_player': "UPDATE player SET first_name = %(first_name)s, \
+last_name = %(last_name)s, nickname = %(nickname)s \
+WHERE first_name = %(previous_first_name)s AND last_name = %(previous_last_name)s \
+AND nickname = %(previous_nickname)s",
+        'rename_player_by_id': "UPDATE player SET first_name = %(first_name)s, \
+last_name = %(last_name)s, nickname = %(nickname)s WHERE player_id = %(player_id)s",
+        'player_id_by_name': "SELECT player_id FROM player \
+WHERE first_name = %s AND last_name = %s AND nickname = %s",
+        'player_name_exists': "SELECT EXISTS(SELECT 1 FROM player \
+WHERE first_name = %s AND last_name = %s AND nickname = %s)",
+        'team_name_exists': "SELECT EXISTS(SELECT 1 FROM team WHERE team_name = %s)",
+        'player_first_name': "SELECT first_name FROM player WHERE player_id = %s",
+        'insert_pp_result': "INSERT INTO pp_result (pp_winner, pp_loser) VALUES (%s, %s)",
+        'insert_fb_result': "INSERT INTO fb_result (offense_winner, defense_winner, \
+offense_loser, defense_loser) VALUES (%s, %s, %s, %s)",
+        'insert_team': "INSERT INTO team (team_name, fb_team_rating, mk_team_rating, \
+mp_team_rating, ss_team_rating) VALUES (%s, %s, %s, %s, %s)",
+        'insert_team_member': "INSERT INTO player_team_xref (player, team) VALUES (%s, %s)",
+        'team_id_by_name': "SELECT team_id FROM team WHERE team_name = %s",
+        'rename_team': "UPDATE team SET team_name = %s WHERE team_id = %s",
+        'team_of_pair': "SELECT team_id FROM team_pair \
+WHERE min_player_id = %s AND max_player_id = %s",
+        'insert_team_pair': "INSERT INTO team_pair (min_player_id, max_player_id, team_id) \
+VALUES (%s, %s, %s)",
+        'players_of_team': "SELECT player FROM player_team_xref WHERE team = %s",
+        'fb_team_rating': "SELECT rating.mu, rating.sigma FROM team \
+JOIN rating ON rating.rating_id = team.fb_team_rating WHERE team.team_id = %s",
+        'fb_pair_wins': "SELECT COUNT(result_id) FROM fb_result \
+WHERE (offense_winner = %s AND defense_winner = %s) \
+OR (offense_winner = %s AND defense_winner = %s)",
+        'fb_pair_losses': "SELECT COUNT(result_id) FROM fb_result \
+WHERE (offense_loser = %s AND defense_loser = %s) \
+OR (offense_loser = %s AND defense_loser = %s)",
+        'pp_result_players': "SELECT pp_winner, pp_loser FROM pp_result WHERE result_id = %s",
+        'fb_result_players': "SELECT offense_winner, defense_winner, offense_loser, \
+defense_loser FROM fb_result WHERE result_id = %s",
+        'insert_rating_job': "INSERT INTO rating_job (game, result_id) VALUES (%s, %s)",
+        'next_rating_job': "SELECT job_id, result_id FROM rating_job WHERE game = %s \
+ORDER BY job_id LIMIT 1 FOR UPDATE",
+        'delete_rating_job': "DELETE FROM rating_job WHERE job_id = %s",
+        'lock_rating_jobs': "SELECT job_id, result_id FROM rating_job WHERE game = %s \
+ORDER BY job_id FOR UPDATE",
+        'rating_job_count': "SELECT COUNT(job_id) FROM rating_job WHERE game = %s",
+        'pp_ind_rating_hist_of_player': "SELECT rating.mu, rating.sigma, \
+pp_ind_rating_hist.time FROM pp_ind_rating_hist \
+JOIN rating ON rating.rating_id = pp_ind_rating_hist.rating \
+WHERE pp_ind_rating_hist.player = %s ORDER BY pp_ind_rating_hist.time DESC",
+    }
+
+    for column, hist_table in PLAYER_RATINGS:
+        # one round trip for the player and the rating it points at
+        registry['player_' + column] = "SELECT player.player_id, rating.mu, rating.sigma \
+FROM player JOIN rating ON rating.rating_id = player.{0} \
+WHERE player.player_id = %s".format(column)
+        registry['player_{0}_by_name'.format(column)] = "SELECT player.player_id, rating.mu, \
+rating.sigma FROM player JOIN rating ON rating.rating_id = player.{0} \
+WHERE player.first_name = %s AND player.last_name = %s AND player.nickname = %s".format(column)
+        registry['set_player_' + column] = "UPDATE player SET {0} = %s \
+WHERE player_id = %s".format(column)
+        registry['insert_' + hist_table] = "INSERT INTO {0} (rating, player) \
+VALUES (%s, %s)".format(hist_table)
+
+    for column, hist_table in TEAM_RATINGS:
+        registry['set_team_' + column] = "UPDATE team SET {0} = %s \
+WHERE team_id = %s".format(column)
+        registry['insert_' + hist_table] = "INSERT INTO {0} (rating, team) \
+VALUES (%s, %s)".format(hist_table)
+
+    return registry
+
+# fixed statements by name, every value bound by the driver as a parameter
+STATEMENTS = _statements()
+
+def execute(cursor, name, params=()):
+    """Runs a registered statement
+
+    Args:
+        cursor (obj):   cursor to run the statement on
+        name (str):     statement name, see STATEMENTS
+        params (tup):   values for the statement's placeholders, a dict for
+                        named placeholders
+
+    Returns:
+        number of affected rows
+
+    """
+
+    return cursor.execute(STATEMENTS[name], params)